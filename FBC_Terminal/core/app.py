@@ -1,6 +1,6 @@
 #Libraries
 #Terminal Working Right Here!
-import pygame,random,sys,subprocess,os
+import pygame,random,sys,subprocess,os,logging
 from ..settings import *
 from .scene import SceneManager
 from ..utils.gfx import make_scanlines, draw_text
@@ -10,9 +10,18 @@ from ..overlays.threshold import ThresholdOverlay
 from ..settings import THRESHOLD_MIN_DELAY, THRESHOLD_MAX_DELAY
 from ..scenes.splash import SplashScene
 from ..utils.audio import *
+from ..utils.workers import shutdown_workers
+from ..utils.sfx import sfx
+from ..utils.mixer import audio_engine
+
+log = logging.getLogger(__name__)
 
 class App:
     def __init__(self):
+        if AUDIO_DEBUG:
+            logging.basicConfig(level=logging.INFO)
+        self.audio = audio_engine()
+        self.audio.configure(AUDIO_PROFILE)  # before pygame.init(): mixer opens once, with the profile
         pygame.init(); pygame.font.init()
         flags = pygame.FULLSCREEN if FULLSCREEN else pygame.RESIZABLE
         self.screen = pygame.display.set_mode((0, 0), flags)
@@ -40,17 +49,9 @@ class App:
         self.init_sfx()
 
     def init_sfx(self):
-        # Robust mixer init
-        try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.pre_init(44100, -16, 2, 512)
-                pygame.mixer.init()
-            try:
-                pygame.mixer.set_num_channels(16)
-            except Exception:
-                pass
-        except Exception:
-            return  
+        # Mixer + channel classes (see utils/mixer.py)
+        if not self.audio.start():
+            return
 
         self._last_keyclick_ms = 0
         self.key_sound = None
@@ -65,6 +66,9 @@ class App:
         except Exception:
             self.key_sound = None
 
+        # UI beeps: synthesised once here so the first beep_ok() doesn't pay for it
+        sfx().warm()
+
 
     def play_key_click(self):
         """Global key click"""
@@ -76,23 +80,15 @@ class App:
             return
         self._last_keyclick_ms = now
 
-        try:
-            # Mixer if closed
-            if not pygame.mixer.get_init():
-                self.init_sfx()
-            ch = pygame.mixer.find_channel(True)  # force=True
-            ch.play(self.key_sound)
-        except Exception:
-            pass
+        # UI class: never steals the music/ambience channels
+        self.audio.play("ui", self.key_sound)
 
 
     def beep_ok(self): 
-        try: make_beep_sequence(count=1, freq=980, beep_ms=100, volume=0.22).play()
-        except Exception: pass
+        sfx().play("ok")
 
     def beep_err(self):
-        try: make_beep_sequence(count=2, freq=320, beep_ms=50, pause_ms=70, volume=0.22).play()
-        except Exception: pass
+        sfx().play("err")
 
     def push_info(self, msg, seconds=2.5):
         self.info = msg
@@ -132,6 +128,9 @@ class App:
                 self.active_overlay.update(dt)
             else:
                 self.scenes.scene.update(dt)
+            audio_msg = self.audio.update(dt)
+            if audio_msg and AUDIO_DEBUG:
+                self.push_info(audio_msg)
 
             # Threshold
                 #if self._next_threshold is not None:
@@ -179,4 +178,8 @@ class App:
             self.screen.blit(self.scanlines, (0, 0))
             pygame.display.flip()
 
+        if AUDIO_DEBUG:
+            log.info(self.audio.report())
+        shutdown_workers()
+        shutdown_ffmpeg()
         pygame.quit()
@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import os, random, math, pygame
-from ..settings import FG, ACCENT, MUTED, BORDER, BG, AHTI_IMAGE, AHTI_SONG, AHTI_CHANNEL_ID
-from ..utils.audio import transcode_to_temp_wav
+from ..settings import FG, ACCENT, MUTED, BORDER, BG, AHTI_IMAGE, AHTI_SONG
+from ..utils.audio import wav_job
 
 class AhtiOverlay:
     """
@@ -47,23 +47,18 @@ class AhtiOverlay:
         random.shuffle(self.quotes)
         self._show_n = min(4, len(self.quotes))
 
-        # music on dedicated channel
+        # music-class channel of the audio engine (ducked under voice)
         self._chan = None
         self._snd  = None
-        self._tmp  = None
+        self._job  = None  # ffmpeg -> WAV when the MP3 can't be opened directly (see update)
         try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.pre_init(44100, -16, 2, 1024)
-                pygame.mixer.init()
+            self.app.audio.start()
             try:
                 self._snd = pygame.mixer.Sound(AHTI_SONG)
             except Exception:
-                wav = transcode_to_temp_wav(AHTI_SONG)
-                if wav: self._tmp = wav; self._snd = pygame.mixer.Sound(wav)
+                self._job = wav_job(AHTI_SONG)
             if self._snd:
-                self._chan = pygame.mixer.Channel(AHTI_CHANNEL_ID)
-                self._chan.set_volume(0.55)
-                self._chan.play(self._snd, loops=-1)
+                self._chan = self.app.audio.play("music", self._snd, loops=-1, volume=0.55)
         except Exception:
             pass
 
@@ -81,6 +76,15 @@ class AhtiOverlay:
     def _ease_out(self, x): return 1 - (1 - x) ** 3
 
     def update(self, dt):
+        if self._job and self._job.done():
+            try:
+                if self._job.result and not self._closing:
+                    self._snd = pygame.mixer.Sound(self._job.result)  # fully in memory
+                    self._chan = self.app.audio.play("music", self._snd, loops=-1, volume=0.55)
+            except Exception:
+                pass
+            self._job.release()  # temp WAV no longer needed
+            self._job = None
         self._blink_t += dt
         if self._opening and not self._closing:
             self._t = min(1.0, self._t + dt * 2.2)
@@ -156,20 +160,17 @@ class AhtiOverlay:
         try:
             if self._chan: self._chan.stop()
         except Exception: pass
-        try:
-            if self._tmp and os.path.exists(self._tmp): os.remove(self._tmp)
-        except Exception: pass
-        self._tmp = None
+        if self._job:
+            self._job.release()  # cancels a running transcode
+            self._job = None
     def _stop_song(self, fade_ms=0):
         try:
             if self._chan:
                 self._chan.stop()
         except Exception: pass
-        try:
-            if self._tmp and os.path.exists(self._tmp):
-                os.remove(self._tmp)
-        except Exception: pass
-        self._tmp = None
+        if self._job:
+            self._job.release()
+            self._job = None
 
     def close(self):
         # müziği hemen kes
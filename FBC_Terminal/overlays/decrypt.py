@@ -1,7 +1,7 @@
 # -*- coding: utf-8 -*-
 import random, math, pygame
 from ..settings import FG, ACCENT, MUTED, BORDER, LOGO_PATH
-from ..utils.audio import make_beep_sequence
+from ..utils.sfx import sfx
 
 class DecryptOverlay:
     """Kısa süreli 'Decrypting…' animasyonu; bitince on_done() çağırır."""
@@ -32,8 +32,7 @@ class DecryptOverlay:
         self.rows    = max(10, h // 18)
         self.drops   = [random.randint(-self.rows, 0) for _ in range(self.columns)]
 
-        try: make_beep_sequence(count=3, beep_ms=60, pause_ms=60, freq=820, volume=0.20).play()
-        except Exception: pass
+        sfx().play("decrypt_start")
 
     def update(self, dt):
         self.t += dt
@@ -47,8 +46,7 @@ class DecryptOverlay:
                 self.drops[i] = random.randint(-self.rows//2, 0)
 
         if self.t >= self.duration:
-            try: make_beep_sequence(count=1, beep_ms=100, pause_ms=0, freq=980, volume=0.22).play()
-            except Exception: pass
+            sfx().play("decrypt_done")
             if self.on_done:
                 cb = self.on_done; self.on_done = None; cb()
             self.app.active_overlay = None
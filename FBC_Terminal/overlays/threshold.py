@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import random, pygame
 from ..settings import FG, ACCENT, MUTED, BORDER, BG, TITLE_TEXT
-from ..utils.audio import make_beep_sequence
+from ..utils.sfx import sfx
+from ..utils.gfx import draw_decal, mono_font
 
 SECTORS = [
     "Executive", "Maintenance", "Research", "Containment",
@@ -10,6 +11,11 @@ SECTORS = [
 
 ICONS = ["▲","■","●","◆","✦","✹","✱","✖"]
 
+LEVEL_TINTS = {
+    "LOW": (80, 220, 80), "MEDIUM": (220, 200, 60),
+    "HIGH": (230, 140, 40), "CRITICAL": (220, 40, 40),
+}
+
 class ThresholdOverlay:
     """
     Kısa uyarı kartı; ekranda rastgele konumda 1.8–3.0 sn görünür, kendi kendine kapanır.
@@ -34,13 +40,18 @@ class ThresholdOverlay:
             x, y = pos
         self.rect = pygame.Rect(x, y, panel_w, panel_h)
 
-        try: make_beep_sequence(count=3, beep_ms=70, pause_ms=70, freq=920, volume=0.22).play()
-        except Exception: pass
+        sfx().play("threshold")
 
         # sahte detaylar
         self.sector = random.choice(SECTORS)
         self.level  = random.choice(["LOW","MEDIUM","HIGH","CRITICAL"])
 
+        # başlık/renk/mesaj; başlık decal cache'ten gelir, veil ekran boyutu başına bir kez
+        self.title = self.text
+        self.tint = LEVEL_TINTS[self.level]
+        self.message = f"{self.icon} SECTOR: {self.sector.upper()} • LEVEL: {self.level}"
+        self._veil = None
+
     def update(self, dt):
         self.t += dt
         if self.t >= self.duration:
@@ -48,15 +59,13 @@ class ThresholdOverlay:
     
     def draw(self, s):
         w,h = s.get_size()
-        veil = pygame.Surface((w,h), pygame.SRCALPHA)
-        # varyant rengi seç: RED/GREEN/YELLOW vs.
-        r,g,b = self.tint  # örn (220,40,40) veya (80,220,80) gibi
-        veil.fill((r//4, g//4, b//4, 180))  # yarı saydam
-        s.blit(veil, (0,0))
+        r,g,b = self.tint
+        if self._veil is None or self._veil.get_size() != (w, h):
+            self._veil = pygame.Surface((w,h), pygame.SRCALPHA)
+            self._veil.fill((r//4, g//4, b//4, 180))  # yarı saydam
+        s.blit(self._veil, (0,0))
         # büyük başlık
-        title_font = pygame.font.SysFont("consolas,monospace", 64, bold=True)
-        s.blit(title_font.render(self.title, True, (r,g,b)), title_font.render(self.title, True, (r,g,b)).get_rect(center=(w//2, h//2 - 40)))
+        draw_decal(s, self.title, 64, (r,g,b), center=(w//2, h//2 - 40), shadow=None)
         # alt açıklama
-        info_font = pygame.font.SysFont("consolas,monospace", 22)
-        msg = info_font.render(self.message, True, ACCENT)
+        msg = mono_font(22).render(self.message, True, ACCENT)
         s.blit(msg, msg.get_rect(center=(w//2, h//2 + 20)))
@@ -1,109 +1,353 @@
 # -*- coding: utf-8 -*-
-import os, pygame
+import os, threading, pygame
 
 from ..settings import (
     BG, FG, ACCENT, MUTED, BORDER,
-    TITLE_TEXT, LOGO_PATH, AUDIOS_DIR
+    TITLE_TEXT, LOGO_PATH, AUDIOS_DIR, AUDIO_PLAYALL_LOOP
 )
 from ..core.scene import Scene
 from ..utils.gfx import draw_text, draw_header_with_right_logo
-from ..utils.audio import transcode_to_temp_wav  # utils/audio.py
+from ..utils.text import text_layout, cache_layout, TextLayout
+from ..utils.transcript import load_transcript
+from ..utils.files import list_audio_logs
+from ..utils.catalog import audio_catalog
+from ..utils.search import transcript_index
+from ..utils.waveform import load_or_build_peaks
+from ..utils.workers import submit
+from ..utils.playlist import Playlist
+from ..utils.audio import wav_job, music_clock  # utils/audio.py
 
 # ---------- Helpers ----------
-def _list_audio_pairs():
-    """
-    audios/ klasöründe aynı ada sahip .mp3 (veya .MP3) ile .txt (veya .TXT) dosyalarını eşler.
-    return: [(base_name, mp3_path, txt_path), ...] (alfabetik)
-    """
-    if not os.path.isdir(AUDIOS_DIR):
-        return []
-
-    mp3s = {}
-    for n in os.listdir(AUDIOS_DIR):
-        if n.lower().endswith(".mp3"):
-            base = os.path.splitext(n)[0]
-            mp3s[base] = os.path.join(AUDIOS_DIR, n)
-
-    pairs = []
-    for n in os.listdir(AUDIOS_DIR):
-        if n.lower().endswith(".txt"):
-            base = os.path.splitext(n)[0]
-            if base in mp3s:
-                pairs.append((base, mp3s[base], os.path.join(AUDIOS_DIR, n)))
-    pairs.sort(key=lambda x: x[0].lower())
-    return pairs
+BODY_FONT = "consolas,menlo,dejavusansmono,monospace"
+
+class _PreparedLog:
+    """Next play-all entry, prepared on a worker: transcript, layout, peaks and (if needed) WAV."""
+    def __init__(self, entry):
+        self.base, self.mp3, self.txt = entry
+        self.text = ""
+        self.timed = None
+        self.layout = None
+        self.peaks = None
+        self.wav_job = None   # ffmpeg transcode, handed to whoever ends up playing it
+        self.ready = False
+        self.cancelled = False
+        self.queued = False   # handed to mixer.music.queue
+        self._lock = threading.Lock()
+
+    @property
+    def audio(self):
+        return (self.wav_job.result if self.wav_job else None) or self.mp3
+
+    def dispose(self):
+        """Drop it; a worker still preparing it releases what it starts afterwards."""
+        with self._lock:
+            self.cancelled = True
+            if self.wav_job:
+                self.wav_job.release()
+                self.wav_job = None
+
+def _fmt_dur(sec):
+    sec = int(sec or 0)
+    return f"{sec // 60:02d}:{sec % 60:02d}"
+
+# sort fields: (label, key(meta) -> comparable); missing metadata sorts last
+SORTS = (
+    ("name",     None),
+    ("duration", lambda m: m.get("duration", 0.0)),
+    ("date",     lambda m: m.get("date") or ""),
+    ("modified", lambda m: m.get("mtime", 0.0)),
+    ("bitrate",  lambda m: m.get("bitrate", 0)),
+)
 
 
 # ---------- List ----------
 class AudioLogsList(Scene):
+    """
+    Liste: metadata (süre, bitrate, ID3) arka planda mutagen ile okunur ve cache'lenir.
+    TAB: sıralama alanı, Shift+TAB: ters sıra, /: filtre (ad, başlık, sanatçı, albüm, tür, tarih).
+    F: tüm transcript'lerde arama (inverted index); Enter ile log eşleşen satırda açılır.
+    """
+    RESEARCH_MS = 400  # while indexing, re-run an unchanged query at most this often
+
     def enter(self):
-        self.items = _list_audio_pairs()
+        self.items = list_audio_logs()
         self.sel = 0
         self.line_h = pygame.font.SysFont("consolas,monospace", 24).get_height() + 6
+        self.catalog = audio_catalog()
+        self.catalog.refresh([mp3 for _, mp3, _ in self.items])
+        self.sort_i = 0
+        self.reverse = False
+        self.filter = ""
+        self.filter_edit = False
+        self.view = []
+        self._view_key = None
+        self._hay = {}  # (mp3, file signature) -> lowercase search text
+        self._rebuild()
+        # transcript search: index opened + refreshed on a worker (it can be large)
+        self.index = None
+        self._index_job = submit(self._open_index, [txt for _, _, txt in self.items])
+        self._snips = {}  # (path, para, query) -> snippet, for rows on screen
+        self.by_txt = {txt: (base, mp3, txt) for base, mp3, txt in self.items}
+        self.searching = False
+        self.query = ""
+        self.hits = []
+        self.hit_sel = 0
+        self._hits_key = None
+        self._hits_t = 0
+
+    def _meta(self, mp3):
+        e = self.catalog.get(mp3)
+        return e if e and not e.get("error") else {}
+
+    def _haystack(self, base, mp3):
+        meta = self._meta(mp3)
+        key = (mp3, str(meta.get("sig")))
+        h = self._hay.get(key)
+        if h is None:
+            h = self._hay[key] = " ".join([base] + [str(meta.get(k, "")) for k in
+                                                    ("title", "artist", "album", "genre", "date")]).lower()
+        return h
+
+    def _rebuild(self):
+        """Filter + sort into self.view (indexes into items); only when inputs changed."""
+        key = (self.sort_i, self.reverse, self.filter, self.catalog.version, len(self.items))
+        if key == self._view_key:
+            return
+        cur = self.items[self.view[self.sel]][1] if self.view else None
+        terms = self.filter.lower().split()
+        idx = [i for i, (base, mp3, _) in enumerate(self.items)
+               if all(t in self._haystack(base, mp3) for t in terms)]
+        label, fn = SORTS[self.sort_i]
+        if fn is None:
+            idx.sort(key=lambda i: self.items[i][0].lower(), reverse=self.reverse)
+        else:
+            have = [i for i in idx if self._meta(self.items[i][1])]
+            missing = [i for i in idx if not self._meta(self.items[i][1])]
+            have.sort(key=lambda i: (fn(self._meta(self.items[i][1])), self.items[i][0].lower()),
+                      reverse=self.reverse)
+            idx = have + missing
+        self.view = idx
+        self._view_key = key
+        # keep the selected log selected
+        self.sel = 0
+        if cur is not None:
+            for n, i in enumerate(idx):
+                if self.items[i][1] == cur:
+                    self.sel = n
+                    break
+
+    @staticmethod
+    def _open_index(files):
+        index = transcript_index()
+        index.refresh(files)
+        return index
+
+    def _run_search(self):
+        if self.index is None:
+            if not self._index_job.done():
+                return
+            try: self.index = self._index_job.result()
+            except Exception: return
+        key = (self.query, self.index.version)
+        if key == self._hits_key:
+            return
+        now = pygame.time.get_ticks()
+        if self._hits_key and key[0] == self._hits_key[0] and now - self._hits_t < self.RESEARCH_MS:
+            return  # only the index moved (one more transcript read): pick it up shortly
+        self._hits_key, self._hits_t = key, now
+        self.hits = [h for h in self.index.search(self.query) if h["path"] in self.by_txt]
+        self.hit_sel = min(self.hit_sel, max(0, len(self.hits) - 1))
+
+    def _snippet(self, h):
+        key = (h["path"], h["para"], self.query)
+        snip = self._snips.get(key)
+        if snip is None:
+            if len(self._snips) > 256:
+                self._snips.clear()
+            snip = self._snips[key] = self.index.snippet(h, self.query)
+        return snip
+
+    def _handle_search(self, e):
+        if e.key == pygame.K_ESCAPE:
+            self.searching = False
+        elif e.key == pygame.K_UP:
+            self.hit_sel = max(0, self.hit_sel - 1)
+        elif e.key == pygame.K_DOWN:
+            self.hit_sel = min(max(0, len(self.hits) - 1), self.hit_sel + 1)
+        elif e.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            if self.hits:
+                h = self.hits[self.hit_sel]
+                base, mp3, txt = self.by_txt[h["path"]]
+                jump = (h["para"], h["time"])
+                self.app.scenes.switch(lambda app: AudioLogScene(app, base, mp3, txt, jump=jump))
+        elif e.key == pygame.K_BACKSPACE:
+            self.query = self.query[:-1]
+        elif e.unicode and e.unicode.isprintable() and len(self.query) < 60:
+            self.query += e.unicode
+        self._run_search()
 
     def handle(self, e):
         if e.type == pygame.KEYDOWN:
+            if self.searching:
+                self._handle_search(e)
+                return
+            if self.filter_edit:
+                if e.key == pygame.K_ESCAPE:
+                    self.filter, self.filter_edit = "", False
+                elif e.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+                    self.filter_edit = False
+                elif e.key == pygame.K_BACKSPACE:
+                    self.filter = self.filter[:-1]
+                elif e.unicode and e.unicode.isprintable() and len(self.filter) < 40:
+                    self.filter += e.unicode
+                self._rebuild()
+                return
             if e.key in (pygame.K_ESCAPE, pygame.K_q):
+                if self.filter:
+                    self.filter = ""
+                    self._rebuild()
+                    return
                 from .menu import MenuScene
                 self.app.scenes.switch(MenuScene)
-            elif self.items:
+            elif e.key == pygame.K_SLASH:
+                self.filter_edit = True
+            elif e.key == pygame.K_f:
+                self.searching = True
+                self._run_search()
+            elif e.key == pygame.K_TAB:
+                if e.mod & pygame.KMOD_SHIFT:
+                    self.reverse = not self.reverse
+                else:
+                    self.sort_i = (self.sort_i + 1) % len(SORTS)
+                self._rebuild()
+            elif self.view:
                 if e.key in (pygame.K_UP, pygame.K_w):
                     self.sel = max(0, self.sel - 1)
                 elif e.key in (pygame.K_DOWN, pygame.K_s):
-                    self.sel = min(len(self.items) - 1, self.sel + 1)
+                    self.sel = min(len(self.view) - 1, self.sel + 1)
+                elif e.key == pygame.K_PAGEUP:
+                    self.sel = max(0, self.sel - 10)
+                elif e.key == pygame.K_PAGEDOWN:
+                    self.sel = min(len(self.view) - 1, self.sel + 10)
                 elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
-                    base, mp3, txt = self.items[self.sel]
+                    base, mp3, txt = self.items[self.view[self.sel]]
                     self.app.scenes.switch(lambda app: AudioLogScene(app, base, mp3, txt))
+                elif e.key == pygame.K_p:
+                    # play all, in the order currently shown
+                    queue = Playlist([self.items[i] for i in self.view], self.sel, AUDIO_PLAYALL_LOOP)
+                    base, mp3, txt = queue.current
+                    self.app.scenes.switch(lambda app: AudioLogScene(app, base, mp3, txt, queue))
                 elif e.key == pygame.K_F11:
                     self.app.toggle_fullscreen()
 
+    def update(self, dt):
+        self._rebuild()  # picks up metadata as the background pass fills it in
+        if self.searching:
+            self._run_search()  # results grow while transcripts are still being indexed
+
+    def _draw_search(self, s, content):
+        label = "Transcript search"
+        if self.index is None:
+            label += "  (loading index…)"
+        elif self.index.pending:
+            label += f"  (indexing… {self.index.pending} left)"
+        draw_text(s, label, 22, FG, topleft=(content.left, content.top - 8))
+        draw_text(s, f"Find: {self.query}_   •   ↑/↓ select • Enter: open at line • ESC: back to list",
+                  18, MUTED, topleft=(content.left, content.top + 20))
+        if not self.query.strip():
+            return
+        if not self.hits:
+            draw_text(s, f'No transcript mentions "{self.query}"', 22, ACCENT,
+                      topleft=(content.left, content.top + 60))
+            return
+        y = content.top + 48
+        row_h = self.line_h + 18
+        max_lines = max(1, (content.bottom - y) // row_h)
+        start = max(0, min(self.hit_sel - max_lines // 2, len(self.hits) - max_lines))
+        for n in range(start, min(len(self.hits), start + max_lines)):
+            h = self.hits[n]
+            base = self.by_txt[h["path"]][0]
+            where = _fmt_dur(h["time"]) if h["time"] is not None else f"¶{h['para'] + 1}"
+            if n == self.hit_sel:
+                pygame.draw.rect(s, (0, 255, 0, 70), (content.left - 8, y - 2, content.width + 8, row_h - 2), 0)
+                draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y))
+            draw_text(s, f"{base}  [{where}]", 22, FG if n == self.hit_sel else ACCENT,
+                      topleft=(content.left + 18, y))
+            draw_text(s, self._snippet(h), 16, MUTED, topleft=(content.left + 18, y + self.line_h - 4))
+            y += row_h
+
     def draw(self, s):
         s.fill(BG)
         content = draw_header_with_right_logo(
             s, TITLE_TEXT, logo_path=LOGO_PATH, logo_scale_h=0.52, top_pad=36, side_pad=40
         )
-        draw_text(s, "Audio Logs", 22, FG, topleft=(content.left, content.top - 8))
-        draw_text(s, "Enter: open • SPACE: play/pause • ←/→: seek • ESC: back",
+        if self.searching:
+            self._draw_search(s, content)
+            return
+        label = "Audio Logs"
+        if self.catalog.pending:
+            label += f"  (indexing… {self.catalog.pending} left)"
+        draw_text(s, label, 22, FG, topleft=(content.left, content.top - 8))
+        sort = SORTS[self.sort_i][0] + (" desc" if self.reverse else "")
+        flt = self.filter + ("_" if self.filter_edit else "")
+        draw_text(s, f"Enter: open • P: play all • F: search transcripts • TAB: sort [{sort}] • /: filter [{flt}] • ESC: back",
                   18, MUTED, topleft=(content.left, content.top + 20))
 
         if not self.items:
-            draw_text(s, f'Place matching pairs (mp3 + txt) in "{AUDIOS_DIR}"', 22, ACCENT,
+            draw_text(s, f'Place matching pairs (mp3 + txt/srt/vtt) in "{AUDIOS_DIR}"', 22, ACCENT,
+                      topleft=(content.left, content.top + 60))
+            return
+        if not self.view:
+            draw_text(s, f'No logs match "{self.filter}"', 22, ACCENT,
                       topleft=(content.left, content.top + 60))
             return
-
-        import math
-        t = pygame.time.get_ticks() / 1000.0
-        pulse = 60 + int(60 * (0.5 + 0.5 * math.sin(t * 6)))
 
         y = content.top + 48
         area_h = content.bottom - y
         max_lines = max(1, area_h // self.line_h)
-        start = max(0, self.sel - max_lines // 2)
-        end   = min(len(self.items), start + max_lines)
+        start = max(0, min(self.sel - max_lines // 2, len(self.view) - max_lines))
+        end   = min(len(self.view), start + max_lines)
 
-        for i in range(start, end):
-            base = self.items[i][0]
-            label = f"{base}"
-            if i == self.sel:
+        for n in range(start, end):
+            base, mp3, _ = self.items[self.view[n]]
+            meta = self._meta(mp3)
+            if n == self.sel:
                 rect = pygame.Rect(content.left - 8, y - 2, content.width + 8, self.line_h)
                 pygame.draw.rect(s, (0, 255, 0, 70), rect, 0)  # hafif highlight
                 draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y))
                 color = FG
             else:
                 color = ACCENT
-            draw_text(s, label, 24, color, topleft=(content.left + 18, y))
+            draw_text(s, base, 24, color, topleft=(content.left + 18, y))
+            if meta:
+                who = " — ".join(v for v in (meta.get("artist"), meta.get("title")) if v)
+                info = f"{_fmt_dur(meta.get('duration'))}"
+                if meta.get("bitrate"):
+                    info += f"  {meta['bitrate']} kbps"
+                if who:
+                    info += f"  {who}"
+                draw_text(s, info, 18, MUTED, topleft=(content.left + int(content.width * 0.45), y + 4))
             y += self.line_h
 
 
 # ---------- AudioPlayer ----------
 class AudioLogScene(Scene):
     """
-    Sol: transcript (wrap + scroll, küçük font)
+    Sol: transcript (wrap + scroll, küçük font; layout bir kez hesaplanır, sadece görünen satırlar çizilir)
     Sağ: kontroller/meta
     MP3 direkt yüklenemezse ffmpeg ile temp WAV'a çevrilir.
+    .srt/.vtt transcript: aktif satır vurgulanır + otomatik kaydırılır, kelimeye tıklayınca oraya atlar.
+    Play all (queue): sıradaki log arka planda hazırlanır, mixer.music.queue ile boşluksuz başlar.
     """
-    def __init__(self, app, base_name, mp3_path, txt_path):
+    FOLLOW_PAUSE = 4.0  # manual scroll suspends auto-follow for this many seconds
+    WAVE_H       = 56   # waveform strip height
+
+    def __init__(self, app, base_name, mp3_path, txt_path, queue=None, jump=None):
         super().__init__(app)
+        self.jump = jump         # (paragraph, time or None) from transcript search
+        self.queue = queue       # Playlist of (base, mp3, txt) in play-all mode
+        self._next = None        # _PreparedLog for the following entry
+        self._text_w = None      # transcript width from the last draw (for prefetched layouts)
         self.base_name = base_name
         self.mp3_path  = mp3_path
         self.txt_path  = txt_path
@@ -115,160 +359,256 @@ class AudioLogScene(Scene):
         self.par_gap    = 8
 
         # fonts
-        self.font_body  = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", 18)
-        self.font_small = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", 14)
+        self.font_body  = pygame.font.SysFont(BODY_FONT, 18)
+        self.font_small = pygame.font.SysFont(BODY_FONT, 14)
+        # twin of font_body used only by the prefetch worker (fonts are not shared across threads)
+        self._font_bg   = pygame.font.SysFont(BODY_FONT, 18) if queue else None
 
         # content
         self.transcript_text = "Loading transcript…"
+        self.timed = None        # TimedTranscript for .srt/.vtt
+        self.active_cue = -1
+        self.active_word = -1
+        self._follow_hold = 0.0  # auto-follow paused while > 0
+        self._follow_to = None   # cue to scroll to on the next draw
+        self._flash = (-1, 0.0)  # (paragraph, seconds left): search hit highlight
+        self._text_view = None   # (screen rect of the transcript viewport, layout)
+        self.clock = music_clock()  # shared mixer.music position
+        self.peaks = None        # Peaks (waveform + meter), built in the background
+        self._peaks_job = None
+        self.level = 0.0         # meter, smoothed
+        self.level_peak = 0.0    # peak hold
+        self._wave_rect = None   # screen rect of the waveform strip (click to seek)
+        self._played_tint = None
         self._audio_loaded = False
-        self._tmp_audio = None  # temp WAV
+        self._wav_job = None    # ffmpeg -> temp WAV when this pygame can't open the MP3
 
     def enter(self):
         # transcript
         try:
-            with open(self.txt_path, "r", encoding="utf-8", errors="replace") as f:
-                self.transcript_text = f.read().strip() or "(empty transcript)"
+            self.transcript_text, self.timed = load_transcript(self.txt_path)
         except Exception as e:
             self.transcript_text = f"Transcript not found.\n{self.txt_path}\n{e}"
             self.app.push_info("Transcript could not be loaded.")
 
-        # audio
-        try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.pre_init(44100, -16, 2, 1024)
-                pygame.mixer.init()
-        except Exception:
-            pass
+        if self.jump:
+            para, _ = self.jump
+            self._follow_to = para
+            self._flash = (para, 3.0)
 
-        # 1) TRY MP3
-        try:
-            pygame.mixer.music.load(self.mp3_path)
+        # audio: 1) MP3 directly  2) ffmpeg -> temp WAV on the job queue (see update)
+        if self.clock.load(self.mp3_path):
             self._audio_loaded = True
-        except Exception:
-            # 2) ffmpeg -> temp wav
-            wav_path = transcode_to_temp_wav(self.mp3_path)
-            if wav_path:
-                try:
-                    pygame.mixer.music.load(wav_path)
-                    self._tmp_audio = wav_path
-                    self._audio_loaded = True
-                except Exception:
-                    self._audio_loaded = False
-            else:
-                self._audio_loaded = False
-
-        if not self._audio_loaded:
-            self.app.push_info("Audio could not be loaded (try installing ffmpeg).")
+            self._start_playback()
         else:
-            try:
-                pygame.mixer.music.set_volume(0.9)
-                pygame.mixer.music.play()
-            except Exception:
-                pass
+            self._wav_job = wav_job(self.mp3_path)
+            if self._wav_job is None:
+                self.app.push_info("Audio could not be loaded (try installing ffmpeg).")
+
+    def _start_playback(self):
+        self.clock.set_volume(0.9)
+        self.clock.play()
+        self._peaks_job = submit(load_or_build_peaks, self.mp3_path)
+        if self.jump and self.jump[1] is not None:
+            self.clock.seek(self.jump[1])
+
+    def _poll_transcode(self):
+        job = self._wav_job
+        if self._audio_loaded or job is None or not job.done():
+            return
+        if job.result:
+            self._audio_loaded = self.clock.load(job.result, duration_from=self.mp3_path)
+        if self._audio_loaded:
+            self._start_playback()
+        else:
+            self.app.push_info("Audio could not be loaded (transcode failed).")
+            job.release()
+            self._wav_job = None
 
     def cleanup(self):
-        # temp wav delete
-        if self._tmp_audio and os.path.exists(self._tmp_audio):
-            try: os.remove(self._tmp_audio)
-            except Exception: pass
-            self._tmp_audio = None
+        self.clock.unload()  # release the file before deleting it
+        if self._next:
+            self._next.dispose()
+            self._next = None
+        # cancels a running transcode, deletes the temp WAV
+        if self._wav_job:
+            self._wav_job.release()
+            self._wav_job = None
 
     def exit(self):
         self.cleanup()
 
-    # --- wrap + scroll ---
-    def _draw_text_wrapped(self, surface, rect, text, font, color, line_gap=4, par_gap=8):
-        x, y, w, h = rect
-        max_y = y + h
-        cur_y = y
-        paragraphs = [p.strip() for p in text.replace("\r\n","\n").split("\n\n")]
-
-        for para in paragraphs:
-            words = para.split()
-            line_h = font.get_height()
-
-            if not words:
-                cur_y += line_h + par_gap
-                if cur_y > max_y: break
-                continue
-
-            line_words = []
-            for word in words:
-                test = (" ".join(line_words + [word])) if line_words else word
-                if font.size(test)[0] <= w:
-                    line_words.append(word)
-                else:
-                    ln = " ".join(line_words)
-                    surface.blit(font.render(ln, True, color), (x, cur_y))
-                    cur_y += line_h + line_gap
-                    if cur_y > max_y: break
-                    line_words = [word]
-            if cur_y > max_y: break
-            if line_words:
-                ln = " ".join(line_words)
-                surface.blit(font.render(ln, True, color), (x, cur_y))
-                cur_y += line_h + par_gap
-            if cur_y > max_y: break
-
-        if cur_y > max_y:
-            ell = font.render("...", True, color)
-            surface.blit(ell, (x, max_y - font.get_height()))
-        return cur_y - y
+    # --- play-all queue ---
+    def _prepare(self, prep, need_wav, width):
+        """
+        Worker thread: everything the next log needs, so the switch is just a swap.
+        A WAV transcode is only queued here; _update_queue polls it.
+        """
+        try:
+            if need_wav:
+                job = wav_job(prep.mp3)
+                with prep._lock:
+                    if prep.cancelled:
+                        if job:
+                            job.release()
+                        return
+                    prep.wav_job = job
+            try:
+                prep.text, prep.timed = load_transcript(prep.txt)
+            except Exception as e:
+                prep.text = f"Transcript not found.\n{prep.txt}\n{e}"
+            if width and not prep.cancelled:
+                prep.layout = TextLayout(prep.text, self._font_bg, width, self.line_gap, self.par_gap)
+            if not prep.cancelled:
+                prep.peaks = load_or_build_peaks(prep.mp3)
+        except Exception:
+            pass  # whatever is missing is rebuilt after the switch
+        finally:
+            prep.ready = True
+
+    def _update_queue(self):
+        if self._next is None:
+            entry = self.queue.peek_next()
+            if entry is None or not self._text_w:
+                return
+            # this pygame build could not open the current MP3 -> the next one needs a WAV too
+            self._next = _PreparedLog(entry)
+            submit(self._prepare, self._next, self._wav_job is not None, self._text_w)
+            return
+        nxt = self._next
+        if not nxt.ready or (nxt.wav_job and not nxt.wav_job.done()):
+            return
+        if not nxt.queued and self._audio_loaded and self.clock.playing:
+            nxt.queued = self.clock.queue(nxt.audio, duration_from=nxt.mp3)
+        if self.clock.poll():
+            self._take_next(started=True)       # mixer already switched: gapless
+        elif self.clock.finished:
+            self._take_next(started=False)      # queue unavailable: start it ourselves
+
+    def _take_next(self, started):
+        nxt, self._next = self._next, None
+        old_job = self._wav_job
+        self.queue.advance()
+        self.base_name, self.mp3_path, self.txt_path = nxt.base, nxt.mp3, nxt.txt
+        self.transcript_text, self.timed = nxt.text, nxt.timed
+        if nxt.layout:
+            cache_layout(nxt.layout, nxt.text, self.font_body, self.line_gap, self.par_gap)
+        self._wav_job, nxt.wav_job = nxt.wav_job, None
+        self.peaks, self._peaks_job = nxt.peaks, None
+        if self.peaks is None:  # the worker failed on it: build it like a first visit
+            self._peaks_job = submit(load_or_build_peaks, self.mp3_path)
+        self.scroll_y = 0
+        self.active_cue = self.active_word = -1
+        self._follow_hold, self._follow_to = 0.0, None
+        if not started:
+            self._audio_loaded = self.clock.load(nxt.audio, duration_from=nxt.mp3) and self.clock.play()
+        # the previous file is closed once the mixer has moved on
+        if old_job:
+            old_job.release()
+
+    def _skip_next(self):
+        if self._next is not None and self._next.ready:
+            self.clock.stop()  # also drops the mixer's queue
+            self._take_next(started=False)
+
+    # --- playback position ---
+    def _position(self):
+        return self.clock.position
+
+    def _seek_to(self, t):
+        if not self._audio_loaded:
+            return
+        self.clock.seek(t)
+        self._follow_hold = 0.0
+
+    def _scroll_manual(self, dy):
+        self.scroll_y = max(0, self.scroll_y + dy)
+        self._follow_hold = self.FOLLOW_PAUSE
 
     # --- input ---
     def handle(self, e):
         if e.type == pygame.KEYDOWN:
             if e.key in (pygame.K_ESCAPE, pygame.K_q):
-                try: pygame.mixer.music.stop()
-                except Exception: pass
+                self.clock.stop()
                 from .audios import AudioLogsList
                 self.app.scenes.switch(AudioLogsList)
 
             # scroll
             elif e.key in (pygame.K_PAGEUP,):
-                self.scroll_y = max(0, self.scroll_y - self.scroll_v * 4)
+                self._scroll_manual(-self.scroll_v * 4)
             elif e.key in (pygame.K_PAGEDOWN,):
-                self.scroll_y += self.scroll_v * 4
+                self._scroll_manual(self.scroll_v * 4)
             elif e.key == pygame.K_UP:
-                self.scroll_y = max(0, self.scroll_y - self.scroll_v)
+                self._scroll_manual(-self.scroll_v)
             elif e.key == pygame.K_DOWN:
-                self.scroll_y += self.scroll_v
+                self._scroll_manual(self.scroll_v)
 
             # audio controls
             elif e.key == pygame.K_SPACE and self._audio_loaded:
-                try:
-                    if pygame.mixer.music.get_busy():
-                        pygame.mixer.music.pause()
-                    else:
-                        pygame.mixer.music.unpause()
-                except Exception:
-                    pass
+                self.clock.toggle()
             elif e.key == pygame.K_s and self._audio_loaded:
-                try: pygame.mixer.music.stop()
-                except Exception: pass
+                self.clock.stop()
             elif e.key == pygame.K_r and self._audio_loaded:
-                try:
-                    pygame.mixer.music.stop()
-                    pygame.mixer.music.play()
-                except Exception:
-                    pass
+                self.clock.play(0.0)
             elif e.key == pygame.K_LEFT and self._audio_loaded:
-                try:
-                    pos = max(0.0, pygame.mixer.music.get_pos()/1000.0 - 5.0)
-                    pygame.mixer.music.play(start=pos)
-                except Exception:
-                    pass
+                self._seek_to(self._position() - 5.0)
             elif e.key == pygame.K_RIGHT and self._audio_loaded:
-                try:
-                    pos = max(0.0, pygame.mixer.music.get_pos()/1000.0 + 5.0)
-                    pygame.mixer.music.play(start=pos)
-                except Exception:
-                    pass
+                self._seek_to(self._position() + 5.0)
+            elif e.key == pygame.K_n and self.queue:
+                self._skip_next()
 
         elif e.type == pygame.MOUSEWHEEL:
-            self.scroll_y = max(0, self.scroll_y - e.y*self.scroll_v)
-
-    def update(self, dt): pass
+            self._scroll_manual(-e.y * self.scroll_v)
+
+        elif (e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and self.peaks
+              and self._wave_rect and self._wave_rect.collidepoint(e.pos)):
+            r = self._wave_rect
+            self._seek_to(self.peaks.duration * (e.pos[0] - r.x) / float(r.width))
+
+        elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1 and self.timed and self._text_view:
+            # click a word -> seek to its cue (or the word itself with per-word timing)
+            rect, layout = self._text_view
+            if rect.collidepoint(e.pos):
+                hit = layout.hit(e.pos[0] - rect.x, e.pos[1] - rect.y + self.scroll_y)
+                if hit and hit[0] < len(self.timed.cues):
+                    self._seek_to(self.timed.time_of(*hit))
+
+    def update(self, dt):
+        if self._follow_hold > 0:
+            self._follow_hold -= dt
+        if self._flash[1] > 0:
+            self._flash = (self._flash[0], self._flash[1] - dt)
+        self._poll_transcode()
+        if self.queue:
+            self._update_queue()
+        if self._peaks_job is not None and self._peaks_job.done():
+            try: self.peaks = self._peaks_job.result()
+            except Exception: self.peaks = None
+            self._peaks_job = None
+
+        # level meter: read straight from the peaks table, fast attack / slow release
+        peak, rms = self.peaks.at(self._position()) if (self.peaks and self.clock.playing) else (0.0, 0.0)
+        self.level = rms if rms > self.level else max(0.0, self.level - dt * 1.2)
+        self.level_peak = peak if peak > self.level_peak else max(0.0, self.level_peak - dt * 0.5)
+
+        if not self.timed:
+            return
+        t = self._position()
+        cue = self.timed.active(t)
+        self.active_word = self.timed.active_word(cue, t)
+        if cue != self.active_cue:
+            self.active_cue = cue
+            if cue >= 0 and self._follow_hold <= 0:
+                self._follow_to = cue
+
+    def _draw_band(self, panel, layout, text_rect, para, color):
+        """Translucent band behind every wrapped line of paragraph `para`."""
+        first, end = layout.para_lines[para] if 0 <= para < len(layout.para_lines) else (0, 0)
+        if first < end:
+            y0 = layout.lines[first][0] - self.scroll_y + text_rect.top
+            y1 = layout.lines[end - 1][0] + layout.line_h - self.scroll_y + text_rect.top
+            band = pygame.Rect(text_rect.left - 4, y0 - 2, text_rect.width + 8, y1 - y0 + 4)
+            pygame.draw.rect(panel, color, band.clip(text_rect.inflate(8, 0)), 0)
 
     def draw(self, s):
         s.fill(BG)
@@ -302,23 +642,35 @@ class AudioLogScene(Scene):
                                 left_rect.width - inner_pad*2,
                                 left_rect.height - inner_pad*2)
 
-        # viewport
-        view = pygame.Surface((text_rect.width, text_rect.height), pygame.SRCALPHA)
-        big_h = max(text_rect.height * 3, 5000)
-        canvas = pygame.Surface((text_rect.width, big_h), pygame.SRCALPHA)
-
-        used_h = self._draw_text_wrapped(
-            canvas, (0, 0, text_rect.width, big_h),
-            self.transcript_text, self.font_body, FG,
-            line_gap=self.line_gap, par_gap=self.par_gap
-        )
-        max_scroll = max(0, used_h - text_rect.height)
+        # viewport: layout is cached per (text, font, width); only visible lines are rendered
+        layout = text_layout(self.transcript_text, self.font_body, text_rect.width,
+                             self.line_gap, self.par_gap)
+        if self._follow_to is not None:
+            top = layout.para_top(self._follow_to)
+            if top is not None:
+                self.scroll_y = max(0, top - text_rect.height // 3)
+            self._follow_to = None
+        max_scroll = max(0, layout.height - text_rect.height)
         if self.scroll_y > max_scroll:
             self.scroll_y = max_scroll
 
-        src_rect = pygame.Rect(0, self.scroll_y, text_rect.width, text_rect.height)
-        view.blit(canvas, (0, 0), src_rect)
-        panelL.blit(view, (text_rect.left, text_rect.top))
+        flash = self._flash[0] if self._flash[1] > 0 else -1
+        if flash >= 0:
+            self._draw_band(panelL, layout, text_rect, flash, (0, 255, 0, 70))
+        if self.timed:
+            # active cue: highlight band + brighter text, active word boxed
+            cue = self.active_cue
+            self._draw_band(panelL, layout, text_rect, cue, (0, 255, 0, 40))
+            if self.active_word >= 0:
+                wr = layout.word_rect(cue, self.active_word)
+                if wr:
+                    wr = wr.move(text_rect.left, text_rect.top - self.scroll_y).inflate(4, 2)
+                    pygame.draw.rect(panelL, (0, 255, 0, 90), wr.clip(text_rect), 0)
+            layout.draw(panelL, text_rect, self.scroll_y, MUTED, {cue: ACCENT})
+        else:
+            layout.draw(panelL, text_rect, self.scroll_y, FG, {flash: ACCENT} if flash >= 0 else None)
+        self._text_view = (text_rect.move(left_rect.topleft), layout)
+        self._text_w = text_rect.width
         s.blit(panelL, left_rect.topleft)
         draw_text(s, "Audio Log — Transcript", 18, ACCENT, topleft=(left_rect.left, left_rect.top - 22))
 
@@ -332,6 +684,10 @@ class AudioLogScene(Scene):
         panelR.blit(self.font_small.render("SPACE: play/pause", True, MUTED), (tx, ty)); ty += 18
         panelR.blit(self.font_small.render("S: stop  •  R: restart", True, MUTED), (tx, ty)); ty += 18
         panelR.blit(self.font_small.render("←/→: seek ±5s", True, MUTED), (tx, ty)); ty += 18
+        if self.timed:
+            panelR.blit(self.font_small.render("Click a word: seek there", True, MUTED), (tx, ty)); ty += 18
+        if self.queue:
+            panelR.blit(self.font_small.render("N: next log", True, MUTED), (tx, ty)); ty += 18
 
         pygame.draw.line(panelR, BORDER, (10, ty+8), (right_rect.width-10, ty+8), 1)
         ty += 16
@@ -340,17 +696,61 @@ class AudioLogScene(Scene):
         try:
             nm = os.path.basename(self.mp3_path)
             panelR.blit(self.font_small.render(f"File: {nm}", True, MUTED), (tx, ty)); ty += 18
+            if self.queue:
+                nxt = self.queue.peek_next()
+                q = f"Queue: {self.queue.pos + 1}/{len(self.queue.files)}"
+                if nxt:
+                    q += f"  •  next: {nxt[0]}" + ("" if self._next and self._next.ready else " (loading)")
+                panelR.blit(self.font_small.render(q, True, MUTED), (tx, ty)); ty += 18
             from datetime import datetime
             mtime = datetime.fromtimestamp(os.path.getmtime(self.mp3_path)).strftime("%Y-%m-%d %H:%M")
             panelR.blit(self.font_small.render(f"Modified: {mtime}", True, MUTED), (tx, ty)); ty += 18
+            if self._audio_loaded:
+                pos, dur = int(self.clock.position), int(self.clock.duration or 0)
+                tm = f"{pos // 60:02d}:{pos % 60:02d}" + (f" / {dur // 60:02d}:{dur % 60:02d}" if dur else "")
+                panelR.blit(self.font_small.render(f"Time: {tm}", True, MUTED), (tx, ty)); ty += 18
+            elif self._wav_job:
+                tc = f"Transcoding… {int(self._wav_job.progress * 100)}%"
+                panelR.blit(self.font_small.render(tc, True, MUTED), (tx, ty)); ty += 18
         except Exception:
             pass
 
+        # level meter
+        if self.peaks:
+            ty += 8
+            panelR.blit(self.font_small.render("Level", True, FG), (tx, ty)); ty += 20
+            mw = right_rect.width - tx * 2
+            meter = pygame.Rect(tx, ty, mw, 10)
+            pygame.draw.rect(panelR, BORDER, meter, 1)
+            pygame.draw.rect(panelR, FG, (meter.x + 1, meter.y + 1, int((mw - 2) * min(1.0, self.level * 2.0)), 8))
+            hx = meter.x + 1 + int((mw - 3) * self.level_peak)
+            pygame.draw.line(panelR, ACCENT, (hx, meter.y + 1), (hx, meter.bottom - 2), 2)
+            ty += 18
+
         s.blit(panelR, right_rect.topleft)
 
+        # waveform strip + playhead (pre-rendered once per size; click to seek)
+        y = max(left_rect.bottom, right_rect.bottom) + 8
+        self._wave_rect = None
+        if self.peaks and len(self.peaks):
+            wave = pygame.Rect(left_rect.left, y, right_rect.right - left_rect.left, self.WAVE_H)
+            s.blit(self.peaks.strip(wave.width, wave.height, MUTED), wave.topleft)
+            pygame.draw.rect(s, BORDER, wave, 1)
+            px = wave.x + int(wave.width * min(1.0, self._position() / max(0.001, self.peaks.duration)))
+            if self._played_tint is None or self._played_tint.get_size() != wave.size:
+                self._played_tint = pygame.Surface(wave.size, pygame.SRCALPHA)
+                self._played_tint.fill((0, 255, 0, 40))
+            s.blit(self._played_tint, wave.topleft, pygame.Rect(0, 0, px - wave.x, wave.height))
+            pygame.draw.line(s, ACCENT, (px, wave.top), (px, wave.bottom - 1), 2)
+            self._wave_rect = wave
+            y = wave.bottom + 8
+        elif self._peaks_job is not None:
+            draw_text(s, "Building waveform…", 16, MUTED, topleft=(left_rect.left, y))
+            y += 24
+
         draw_text(
             s,
-            "Scroll: MouseWheel / PgUp/PgDn / ↑↓   •   ESC: back",
+            "Scroll: MouseWheel / PgUp/PgDn / ↑↓   •   Click waveform: seek   •   ESC: back",
             18, MUTED,
-            topleft=(content.left, max(left_rect.bottom, right_rect.bottom) + 8)
+            topleft=(content.left, y)
         )
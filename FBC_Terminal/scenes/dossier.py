@@ -0,0 +1,385 @@
+# -*- coding: utf-8 -*-
+import os, math, pygame
+from collections import OrderedDict
+from ..settings import (
+    BG, FG, ACCENT, MUTED, BORDER,
+    TITLE_TEXT, LOGO_PATH
+)
+from ..core.scene import Scene
+from ..utils.gfx import draw_text, draw_decal, draw_header_with_right_logo, draw_pulsing_highlight
+from ..utils.text import TextLayout
+from ..utils.archive import archive_index
+from ..utils.derivatives import derivatives
+from ..utils.workers import submit
+
+def draw_stamp(surface, text="CLASSIFIED", color=(220,40,40), scale=1.0, angle=-18):
+    # gölgeli, döndürülmüş damga; decal cache'ten (bir kez render edilir)
+    center = (surface.get_width()//2, int(surface.get_height()*0.22))
+    return draw_decal(surface, text, int(52*scale), color, angle, center=center)
+
+def load_text(path, default="(not available)"):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            t = f.read().strip()
+            return t if t else default
+    except Exception:
+        return default
+
+# ---------- page: everything static, built once per (dossier, screen size) ----------
+class DossierPage:
+    """
+    Header, panels and the image (from its display-size derivative) baked into one background surface;
+    the text sections are TextLayouts placed in the left panel. Per frame: one
+    background blit plus the text lines inside the scroll window.
+    """
+    def __init__(self, size, label, sections, img_path, fonts):
+        font_head, font_body, font_small = fonts
+        w, h = size
+        self.bg = pygame.Surface(size).convert()
+        s = self.bg
+        s.fill(BG)
+        content = draw_header_with_right_logo(
+            s, TITLE_TEXT, logo_path=LOGO_PATH, logo_scale_h=0.55, top_pad=36, side_pad=40
+        )
+        draw_text(s, label, 20, FG, topleft=(content.left, content.top - 8))
+        draw_text(s, "PgUp/PgDn/↑↓ scroll • ESC back", 18, MUTED,
+                  topleft=(content.left, content.top + 20))
+
+        EXTRA_DOWN = 48   # listede 32, detayda 48-56 iyi olur
+        content.move_ip(0, EXTRA_DOWN)
+        content.height = max(50, content.height - EXTRA_DOWN)
+        # layout inside content: left text, right image
+        margin = 16
+        left_w  = int(content.width * 0.64)
+        right_w = int(content.width * 0.34)
+        left_rect  = pygame.Rect(content.left - 10, content.top + 8, left_w, int(h * 0.72))
+        right_rect = pygame.Rect(content.right - right_w, content.top + 8, right_w, int(h * 0.72))
+        bottom_guard = h - 200
+        left_rect.height  = max(40, min(left_rect.height,  bottom_guard - left_rect.top - margin))
+        right_rect.height = max(40, min(right_rect.height, bottom_guard - right_rect.top - margin))
+
+        # left panel (dates + info): chrome only, text is drawn per frame
+        panelL = pygame.Surface(left_rect.size, pygame.SRCALPHA)
+        panelL.fill((0, 30, 0, 120)); pygame.draw.rect(panelL, BORDER, panelL.get_rect(), 1)
+        s.blit(panelL, left_rect.topleft)
+        self.text_rect = pygame.Rect(left_rect.left + 12, left_rect.top + 12,
+                                     left_rect.width - 24, left_rect.height - 24)
+
+        # right panel (image), scaled once from the smallest derivative that covers it
+        panelR = pygame.Surface(right_rect.size, pygame.SRCALPHA)
+        panelR.fill((0, 30, 0, 120)); pygame.draw.rect(panelR, BORDER, panelR.get_rect(), 1)
+        tx, ty = 10, 10
+        panelR.blit(font_small.render("Image", True, FG), (tx, ty)); ty += 20
+        max_w, max_h = right_rect.width-20, right_rect.height-40
+        img = derivatives().load(img_path, (max_w, max_h), alpha=True) if img_path else None
+        if img:
+            iw, ih = img.get_width(), img.get_height()
+            scale = min(max_w/iw, max_h/ih, 1.0)
+            surf = pygame.transform.smoothscale(img, (max(1, int(iw*scale)), max(1, int(ih*scale))))
+            r = surf.get_rect(center=(right_rect.width//2, right_rect.height//2 + 10))
+            panelR.blit(surf, r)
+        else:
+            panelR.blit(font_small.render("(no image)", True, MUTED), (tx, ty))
+        s.blit(panelR, right_rect.topleft)
+
+        # text blocks: (y, heading Surface | TextLayout, color)
+        self.blocks = []
+        y = 0
+        for i, (heading, text, color) in enumerate(sections):
+            if i:
+                y += 12
+            self.blocks.append((y, font_head.render(heading, True, FG), None))
+            y += font_head.get_height() + 6
+            lay = TextLayout(text, font_body, self.text_rect.width, 4, 10)
+            self.blocks.append((y, lay, color))
+            y += lay.height
+        self.height = y
+
+    @property
+    def max_scroll(self):
+        return max(0, self.height - self.text_rect.height)
+
+    def draw(self, s, scroll_y):
+        s.blit(self.bg, (0, 0))
+        r = self.text_rect
+        old_clip = s.get_clip()
+        s.set_clip(r.clip(old_clip))
+        for by, block, color in self.blocks:
+            top = by - scroll_y
+            if color is None:
+                if -block.get_height() < top < r.height:
+                    s.blit(block, (r.x, r.y + top))
+            elif top < r.height and top + block.height > 0:
+                block.draw(s, r, scroll_y - by, color)
+        s.set_clip(old_clip)
+
+_pages = OrderedDict()  # (label, folder, file sigs, size) -> DossierPage
+
+# ---------- detail scene ----------
+class DossierDetail(Scene):
+    """
+    Shared detail page for folder-based archives (info.txt, dates.txt, image.png).
+    Subclasses set LABEL and LIST_SCENE (where ESC returns); SECTIONS lists (heading, file, color).
+    """
+    CATEGORY = None
+    LIST_SCENE = None
+    LABEL = "Dossier"
+    STAMP = "TOP SECRET"
+    SECTIONS = (("Dates / Incidents", "dates.txt", ACCENT), ("Details", "info.txt", FG))
+    IMAGE = "image.png"
+
+    def __init__(self, app, folder_name, folder_path):
+        super().__init__(app)
+        self.folder_name = folder_name
+        self.folder_path = folder_path
+        self.scroll_y = 0
+        self.scroll_v = 28
+
+        self.font_head  = pygame.font.SysFont("consolas,monospace", 22, bold=True)
+        self.font_body  = pygame.font.SysFont("consolas,monospace", 18)
+        self.font_small = pygame.font.SysFont("consolas,monospace", 14)
+
+        self.texts = {}
+        self._sig = None
+
+    def back(self):
+        if self.LIST_SCENE is not None:
+            self.app.scenes.switch(self.LIST_SCENE)
+        else:
+            from .menu import MenuScene
+            self.app.scenes.switch(MenuScene)
+
+    def _file_sig(self, name):
+        try:
+            st = os.stat(os.path.join(self.folder_path, name))
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    def enter(self):
+        # texts + signature from the archive index (its scan notices edits); stat the
+        # files only for a dossier that hasn't been indexed yet
+        texts, sig = archive_index().texts(self.folder_path)
+        if texts is not None:
+            self.texts = {fn: texts.get(fn) or "(not available)" for _, fn, _ in self.SECTIONS}
+            self._sig = tuple(tuple(x) if x else None for x in sig)
+        else:
+            names = [fn for _, fn, _ in self.SECTIONS] + [self.IMAGE]
+            self._sig = tuple(self._file_sig(n) for n in names)  # edits to the files rebuild the page
+
+    def _load(self):
+        for _, fn, _ in self.SECTIONS:
+            if fn not in self.texts:
+                self.texts[fn] = load_text(os.path.join(self.folder_path, fn))
+
+    def _page(self, size):
+        key = (self.LABEL, self.folder_path, self._sig, size)
+        page = _pages.get(key)
+        if page is None:
+            self._load()  # only when the page isn't cached from an earlier visit
+            sections = [(head, self.texts[fn], color) for head, fn, color in self.SECTIONS]
+            img_path = os.path.join(self.folder_path, self.IMAGE) if self._sig[-1] else None  # optional
+            page = _pages[key] = DossierPage(size, f"[{self.LABEL}] {self.folder_name}", sections, img_path,
+                                             (self.font_head, self.font_body, self.font_small))
+            if len(_pages) > 4:
+                _pages.popitem(last=False)
+        else:
+            _pages.move_to_end(key)
+        return page
+
+    def handle(self, e):
+        if e.type == pygame.KEYDOWN:
+            if e.key in (pygame.K_ESCAPE, pygame.K_q):
+                self.back()
+            elif e.key in (pygame.K_PAGEUP,):
+                self.scroll_y = max(0, self.scroll_y - self.scroll_v*4)
+            elif e.key in (pygame.K_PAGEDOWN,):
+                self.scroll_y += self.scroll_v*4
+            elif e.key == pygame.K_UP:
+                self.scroll_y = max(0, self.scroll_y - self.scroll_v)
+            elif e.key == pygame.K_DOWN:
+                self.scroll_y += self.scroll_v
+            elif e.key == pygame.K_f:
+                self.app.toggle_fullscreen()
+        elif e.type == pygame.MOUSEWHEEL:
+            self.scroll_y = max(0, self.scroll_y - e.y*self.scroll_v)
+
+    def update(self, dt): pass
+
+    def draw(self, s):
+        page = self._page(s.get_size())
+        self.scroll_y = min(self.scroll_y, page.max_scroll)
+        page.draw(s, self.scroll_y)
+        draw_stamp(s, self.STAMP, color=(220,40,40), scale=1.0, angle=-18)
+
+def detail_scene(category):
+    """DossierDetail subclass for an archive category (see settings.ARCHIVE_DIRS)."""
+    from . import altered_items, oop  # noqa: F401 — defines the category scenes (they import this module)
+    for cls in DossierDetail.__subclasses__():
+        if cls.CATEGORY == category:
+            return cls
+    return None
+
+# ---------- list scene ----------
+class DossierList(Scene):
+    """
+    Dossiers of one archive category, straight from the archive index: opening the
+    list reads no folders, a background scan picks up added/edited dossiers.
+    F: search every archive at once (codes + texts); Enter opens the hit.
+    """
+    CATEGORY = None
+    TITLE = "Dossiers"
+    ROOT = None
+    STAMP = "CLASSIFIED"
+
+    def enter(self):
+        self.index = archive_index()
+        submit(self.index.scan)
+        self.items = self.index.dossiers(self.CATEGORY)
+        self.sel = 0
+        self.line_h = pygame.font.SysFont("consolas,monospace", 24).get_height() + 6
+        self._told_empty = False
+        self.searching = False
+        self.query = ""
+        self.hits, self.hit_sel = [], 0
+        self._hits_key = None
+        self._snips = {}
+
+    def open(self, category, name, path):
+        cls = detail_scene(category)
+        if cls is not None:
+            self.app.scenes.switch(lambda app: cls(app, name, path))
+
+    # --- search ---
+    def _run_search(self):
+        key = (self.query, self.index.version)
+        if key == self._hits_key:
+            return
+        self._hits_key = key
+        self.hits = self.index.search(self.query)
+        self.hit_sel = min(self.hit_sel, max(0, len(self.hits) - 1))
+
+    def _snippet(self, h):
+        key = (h["path"], h["section"], self.query)
+        snip = self._snips.get(key)
+        if snip is None:
+            if len(self._snips) > 256:
+                self._snips.clear()
+            snip = self._snips[key] = self.index.snippet(h, self.query)
+        return snip
+
+    def _handle_search(self, e):
+        if e.key == pygame.K_ESCAPE:
+            self.searching = False
+        elif e.key == pygame.K_UP:
+            self.hit_sel = max(0, self.hit_sel - 1)
+        elif e.key == pygame.K_DOWN:
+            self.hit_sel = min(max(0, len(self.hits) - 1), self.hit_sel + 1)
+        elif e.key in (pygame.K_RETURN, pygame.K_KP_ENTER):
+            if self.hits:
+                h = self.hits[self.hit_sel]
+                self.open(h["category"], h["code"], h["path"])
+        elif e.key == pygame.K_BACKSPACE:
+            self.query = self.query[:-1]
+        elif e.unicode and e.unicode.isprintable() and len(self.query) < 60:
+            self.query += e.unicode
+        self._run_search()
+
+    def handle(self, e):
+        if e.type == pygame.KEYDOWN:
+            if self.searching:
+                self._handle_search(e)
+                return
+            if e.key in (pygame.K_ESCAPE, pygame.K_q):
+                from .menu import MenuScene
+                self.app.scenes.switch(MenuScene)
+            elif e.key == pygame.K_f:
+                self.searching = True
+                self._run_search()
+            elif self.items:
+                if e.key in (pygame.K_UP, pygame.K_w):
+                    self.sel = (self.sel - 1) % len(self.items)
+                elif e.key in (pygame.K_DOWN, pygame.K_s):
+                    self.sel = (self.sel + 1) % len(self.items)
+                elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
+                    name, path = self.items[self.sel]
+                    self.open(self.CATEGORY, name, path)
+                elif e.key == pygame.K_F11:
+                    self.app.toggle_fullscreen()
+
+    def update(self, dt):
+        self.items = self.index.dossiers(self.CATEGORY)  # same list object until the index changes
+        self.sel = min(self.sel, max(0, len(self.items) - 1))
+        if not self.items and self.index.scanned and not self.index.pending and not self._told_empty:
+            self._told_empty = True
+            self.app.push_info(f'Put item folders under "{self.ROOT}"')
+        if self.searching:
+            self._run_search()  # results grow while the scan is still indexing
+
+    # --- drawing ---
+    def _draw_search(self, s, content):
+        label = "Archive search"
+        if self.index.pending:
+            label += f"  (indexing… {self.index.pending} left)"
+        draw_text(s, label, 22, FG, topleft=(content.left, content.top - 8))
+        draw_text(s, f"Find: {self.query}_   •   ↑/↓ select • Enter: open • ESC: back to list",
+                  18, MUTED, topleft=(content.left, content.top + 20))
+        if not self.query.strip():
+            return
+        if not self.hits:
+            draw_text(s, f'No dossier mentions "{self.query}"', 22, ACCENT,
+                      topleft=(content.left, content.top + 60))
+            return
+        y = content.top + 48
+        row_h = self.line_h + 18
+        max_lines = max(1, (content.bottom - y) // row_h)
+        start = max(0, min(self.hit_sel - max_lines // 2, len(self.hits) - max_lines))
+        for n in range(start, min(len(self.hits), start + max_lines)):
+            h = self.hits[n]
+            cls = detail_scene(h["category"])
+            label = f"[{cls.LABEL if cls else h['category']}] {h['code']}"
+            if n == self.hit_sel:
+                draw_pulsing_highlight(s, pygame.Rect(content.left - 8, y - 2, content.width + 8, row_h - 2), 70)
+                draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y))
+            draw_text(s, label, 22, FG if n == self.hit_sel else ACCENT, topleft=(content.left + 18, y))
+            draw_text(s, self._snippet(h), 16, MUTED, topleft=(content.left + 18, y + self.line_h - 4))
+            y += row_h
+
+    def draw(self, s):
+        s.fill(BG)
+        content = draw_header_with_right_logo(
+            s, TITLE_TEXT, logo_path=LOGO_PATH, logo_scale_h=0.55, top_pad=36, side_pad=40
+        )
+        if self.searching:
+            self._draw_search(s, content)
+            return
+        label = self.TITLE
+        if self.index.pending or not self.index.scanned:
+            label += "  (indexing…)"
+        draw_text(s, label, 22, FG, topleft=(content.left, content.top - 8))
+        draw_text(s, "Enter: open • ↑/↓ select • F: search all archives • ESC back", 18, MUTED,
+                  topleft=(content.left, content.top + 20))
+
+        t = pygame.time.get_ticks()/1000.0
+        pulse = 60 + int(60*(0.5 + 0.5*math.sin(t*6)))
+        EXTRA_DOWN = 40   # listede 32, detayda 48-56 iyi olur
+        content.move_ip(0, EXTRA_DOWN)
+        content.height = max(50, content.height - EXTRA_DOWN)
+        y = content.top + 48
+        area_h = content.bottom - y
+        max_lines = max(1, area_h // self.line_h)
+        start = max(0, self.sel - max_lines // 2)
+        end   = min(len(self.items), start + max_lines)
+
+        for i in range(start, end):
+            label = self.items[i][0]
+            if i == self.sel:
+                rect = pygame.Rect(content.left - 8, y - 2, content.width + 8, self.line_h)
+                draw_pulsing_highlight(s, rect, pulse)
+                draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y))
+                color = FG
+            else:
+                color = ACCENT
+            draw_text(s, label, 24, color, topleft=(content.left + 18, y))
+            y += self.line_h
+        draw_stamp(s, self.STAMP, color=(220,40,40), scale=1.0, angle=-18)
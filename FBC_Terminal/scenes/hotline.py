@@ -1,7 +1,9 @@
 # scenes/hotline.py
 import os, math, random, pygame
 from ..utils.gfx import draw_text, make_scanlines
-from ..utils.audio import make_beep_sequence, transcode_to_temp_wav
+from ..utils.cache import file_signature
+from ..utils.audio import wav_job, music_clock
+from ..utils.sfx import sfx
 from ..settings import BG, FG, ACCENT, MUTED, ROOT_DIR
 
 ASSET_DIR = os.path.join(ROOT_DIR, "assets", "hotline")
@@ -9,40 +11,37 @@ PHONE_PNG = os.path.join(ASSET_DIR, "hotline_phone.png")
 RING_WAV  = os.path.join(ASSET_DIR, "hotline_ring.mp3")      
 MSG_MP3   = os.path.join(ASSET_DIR, "hotline_message.mp3")   
 
+# Wobble: row y shifts int(AMP * sin(y * FREQ + t * SPEED)) px. The phase is quantised
+# to PHASES steps per period; each step's rows are grouped into runs of equal shift.
+WOBBLE_AMP    = 2
+WOBBLE_FREQ   = 0.03
+WOBBLE_SPEED  = 3.2
+WOBBLE_PHASES = 96
+
 class HotlineScene:
     """Hotline Phone Room: play -> reply with E -> play text message -> ESC menu."""
     def __init__(self, app):
         self.app = app
-        self.w, self.h = self.app.screen.get_size()
-        self.room = pygame.Surface((self.w, self.h)).convert_alpha()
-        self.scan = make_scanlines((self.w, self.h), alpha=36)
+        self.room = None        # static layer, see _compose_room()
+        self._room_key = None   # (screen size, phone asset signature) it was composed for
+        self._wobble_runs = {}  # phase step -> [(y0, y1, shift)]
+        self.phone_img = None
+        self._compose_room(self.app.screen.get_size())
 
         self.t = 0.0
         self.wobble = True
         self.glitch_phase = 0.0
         self.answered = False
         self.playing_msg = False
-        self.msg_tmp = None 
-
-        self.phone_img = None
-        if os.path.exists(PHONE_PNG):
-            try:
-                img = pygame.image.load(PHONE_PNG).convert_alpha()
-                scale = min(1.0, (self.h * 0.85) / img.get_height())
-                self.phone_img = pygame.transform.smoothscale(
-                    img, (int(img.get_width()*scale), int(img.get_height()*scale))
-                )
-            except Exception:
-                self.phone_img = None
+        self.msg_job = None     # ffmpeg -> temp WAV when the MP3 can't be opened directly
+        self._play_when_ready = False
 
         self.ring_snd = None
         self.msg_loaded = False
-        try:
-            if not pygame.mixer.get_init():
-                pygame.mixer.pre_init(44100, -16, 2, 1024)
-                pygame.mixer.init()
-        except Exception:
-            pass
+        self.clock = music_clock()  # shared mixer.music position
+        self.audio = self.app.audio
+        self.audio.start()
+        self._ring_chan = None
 
         try:
             if os.path.exists(RING_WAV):
@@ -51,19 +50,10 @@ class HotlineScene:
         except Exception:
             self.ring_snd = None
 
-        try:
-            if os.path.exists(MSG_MP3):
-                try:
-                    pygame.mixer.music.load(MSG_MP3)
-                    self.msg_loaded = True
-                except Exception:
-                    tmp = transcode_to_temp_wav(MSG_MP3)
-                    if tmp:
-                        pygame.mixer.music.load(tmp)
-                        self.msg_tmp = tmp
-                        self.msg_loaded = True
-        except Exception:
-            self.msg_loaded = False
+        if os.path.exists(MSG_MP3):
+            self.msg_loaded = self.clock.load(MSG_MP3)
+            if not self.msg_loaded:
+                self.msg_job = wav_job(MSG_MP3)  # decoded while the phone rings
 
         self._start_ringing()
 
@@ -71,45 +61,43 @@ class HotlineScene:
     def enter(self): pass
     def exit(self):
         self._stop_all_audio()
-        if self.msg_tmp and os.path.exists(self.msg_tmp):
-            try: os.remove(self.msg_tmp)
-            except Exception: pass
+        self.clock.unload()
+        if self.msg_job:
+            self.msg_job.release()
+            self.msg_job = None
 
     # ————— audio helpers —————
     def _start_ringing(self):
         
         if self.ring_snd:
-            try: self.ring_snd.play(loops=-1)
-            except Exception: pass
+            self._ring_chan = self.audio.play("ambience", self.ring_snd, loops=-1)
         else:
-            try: make_beep_sequence(count=2, beep_ms=120, pause_ms=200, freq=620, volume=0.22).play()
-            except Exception: pass
+            sfx().play("ring")
 
     def _stop_ringing(self):
         try:
-            if self.ring_snd:
-                self.ring_snd.stop()
+            if self._ring_chan:
+                self._ring_chan.stop()
+                self._ring_chan = None
         except Exception:
             pass
 
     def _play_message(self):
+        if not self.msg_loaded and self.msg_job:
+            self._play_when_ready = True  # still transcoding; update() starts it
+            self.playing_msg = True
+            return
         if not self.msg_loaded:
             
-            try: make_beep_sequence(count=1, beep_ms=180, pause_ms=0, freq=520, volume=0.22).play()
-            except Exception: pass
+            sfx().play("hotline_msg")
             self.playing_msg = True
             return
-        try:
-            pygame.mixer.music.set_volume(0.90)
-            pygame.mixer.music.play()
-            self.playing_msg = True
-        except Exception:
-            self.playing_msg = False
+        self.clock.set_volume(0.90)
+        self.playing_msg = self.clock.play()
 
     def _stop_all_audio(self):
         self._stop_ringing()
-        try: pygame.mixer.music.stop()
-        except Exception: pass
+        self.clock.stop()
 
     # ————— input —————
     def handle(self, e):
@@ -130,30 +118,72 @@ class HotlineScene:
                 self._stop_all_audio()
                 self.answered = False
                 self.playing_msg = False
+                self._play_when_ready = False
                 self._start_ringing()
             elif k == pygame.K_f:
                 self.wobble = not self.wobble
 
+    # ————— wobble —————
+    def _runs(self, step):
+        """Rows grouped into runs of equal shift for one phase step (built on first use)."""
+        runs = self._wobble_runs.get(step)
+        if runs is None:
+            phase = 2 * math.pi * step / WOBBLE_PHASES
+            runs, y0, cur = [], 0, None
+            for y in range(self.h):
+                off = int(WOBBLE_AMP * math.sin(y * WOBBLE_FREQ + phase))
+                if off != cur:
+                    if cur is not None:
+                        runs.append((y0, y, cur))
+                    y0, cur = y, off
+            runs.append((y0, self.h, cur))
+            self._wobble_runs[step] = runs
+        return runs
+
+    def _blit_wobble(self, s):
+        # one blit per run (~40 at 4K) instead of one per row
+        w = self.w
+        phase = (self.t * WOBBLE_SPEED) % (2 * math.pi)
+        for y0, y1, off in self._runs(int(phase / (2 * math.pi) * WOBBLE_PHASES) % WOBBLE_PHASES):
+            s.blit(self.room, (off, y0), area=pygame.Rect(0, y0, w, y1 - y0))
+            if off > 0:
+                s.fill(BG, (0, y0, off, y1 - y0))
+            elif off < 0:
+                s.fill(BG, (w + off, y0, -off, y1 - y0))
+
     # ————— update/draw —————
     def update(self, dt):
         self.t += dt
         self.glitch_phase += dt * (1.0 if not self.answered else 2.0)
 
-        # music.get_busy false is
-        if self.playing_msg:
-            try:
-                if not pygame.mixer.music.get_busy():
-                    self.playing_msg = False
-            except Exception:
-                self.playing_msg = False
+        job = self.msg_job
+        if job and not self.msg_loaded and job.done():
+            self.msg_loaded = bool(job.result) and self.clock.load(job.result, duration_from=MSG_MP3)
+            if not self.msg_loaded:
+                job.release()
+                self.msg_job = None
+            if self._play_when_ready:
+                self._play_when_ready = False
+                self._play_message()
 
-    def draw(self, s):
-        
-        self.room.fill(BG)
-        w, h = self.w, self.h
+        # message finished
+        if self.playing_msg and self.msg_loaded and self.clock.finished:
+            self.playing_msg = False
+
+    def _compose_room(self, size):
+        """
+        Static layer: background, phone (or the fallback handset) and scanlines, drawn
+        once per screen size and phone asset. The scanlines are full-width rows, so the
+        wobble's horizontal shifts leave them as they were when drawn on top.
+        """
+        key = (size, file_signature(PHONE_PNG))
+        if key == self._room_key:
+            return
+        self.w, self.h = w, h = size
         cx, cy = w//2, int(h*0.58)
+        self.room = pygame.Surface(size).convert()  # opaque: blits are plain copies
+        self.room.fill(BG)
 
-        
         #floor = pygame.Rect(0, cy, w, h-cy)
         #wall  = pygame.Rect(0, int(h*0.18), w, int(h*0.40))
         #pygame.draw.rect(self.room, (28, 30, 26), floor)
@@ -176,7 +206,18 @@ class HotlineScene:
                  #(int(w*0.88), int(h*0.70 + i*3))]
            # )
         #self.room.blit(cone, (0,0), special_flags=pygame.BLEND_ADD)
-        
+
+        self.phone_img = None
+        if key[1] is not None:
+            try:
+                img = pygame.image.load(PHONE_PNG).convert_alpha()
+                scale = min(1.0, (h * 0.85) / img.get_height())
+                self.phone_img = pygame.transform.smoothscale(
+                    img, (int(img.get_width()*scale), int(img.get_height()*scale))
+                )
+            except Exception:
+                self.phone_img = None
+
         if self.phone_img:
             r = self.phone_img.get_rect(center=(cx, int(h*0.56)))
             self.room.blit(self.phone_img, r)
@@ -188,22 +229,27 @@ class HotlineScene:
             pygame.draw.rect(self.room, (200, 32, 32), handset, border_radius=11)
             pygame.draw.rect(self.room, (240, 60, 60), handset, 2, border_radius=11)
 
-        
+        # scanline
+        self.room.blit(make_scanlines(size, alpha=36), (0,0))
+        self.vignette = None  # only for a target with per-pixel alpha; made on first use
+        self._wobble_runs = {}
+        self._room_key = key
+
+    def draw(self, s):
+        if s.get_size() != (self.w, self.h):  # resized / fullscreen toggled
+            self._compose_room(s.get_size())
+
+        # per frame only the animated parts: the wobble and the text below
         if self.wobble:
-            wsurf = pygame.Surface((w, h), pygame.SRCALPHA)
-            for y in range(h):
-                
-                off = int(2 * math.sin((y*0.03) + self.t*3.2))
-                wsurf.blit(self.room, (off, y), area=pygame.Rect(0, y, w, 1))
-            s.blit(wsurf, (0,0))
+            self._blit_wobble(s)
         else:
             s.blit(self.room, (0,0))
 
-        # scanline
-        s.blit(self.scan, (0,0))
-        vignette = pygame.Surface((w,h), pygame.SRCALPHA)
-        pygame.draw.rect(vignette, (0,0,0,90), s.get_rect(), border_radius=0)
-        s.blit(vignette, (0,0), special_flags=pygame.BLEND_RGBA_SUB)
+        if s.get_flags() & pygame.SRCALPHA:  # RGBA_SUB of black only lowers alpha: the display has none
+            if self.vignette is None:
+                self.vignette = pygame.Surface(s.get_size(), pygame.SRCALPHA)
+                self.vignette.fill((0,0,0,90))
+            s.blit(self.vignette, (0,0), special_flags=pygame.BLEND_RGBA_SUB)
 
         # UI
         title = "HOTLINE CHAMBER"
@@ -218,3 +264,9 @@ class HotlineScene:
         if self.answered and (int(self.t*3) % 2 == 0):
             draw_text(s, "RECEIVING TRANSMISSION…", 18, (200,60,60),
                       topleft=(24 + int(2*math.sin(self.t*8.0)), 78))
+        if self.playing_msg and self.msg_loaded and self.clock.duration:
+            pos, dur = int(self.clock.position), int(self.clock.duration)
+            draw_text(s, f"{pos // 60:02d}:{pos % 60:02d} / {dur // 60:02d}:{dur % 60:02d}", 18, MUTED,
+                      topleft=(24, 100))
+        elif self._play_when_ready and self.msg_job:
+            draw_text(s, f"decoding… {int(self.msg_job.progress * 100)}%", 18, MUTED, topleft=(24, 100))
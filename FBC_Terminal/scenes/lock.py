@@ -4,7 +4,7 @@ from ..settings import (
     LOCK_CODE, LOCK_PASS2, LOCK_ATTEMPTS, LOCK_HINT
 )
 from ..utils.gfx import draw_text, draw_header_with_right_logo
-from ..utils.audio import make_beep_sequence
+from ..utils.sfx import sfx
 from ..overlays.decrypt import DecryptOverlay
 from .menu import MenuScene
 
@@ -24,9 +24,6 @@ class LockPrompt:
         self.cursor_t = 0.0
         self.shake_t = 0.0
         self.denied = False
-        # sesler
-        self.snd_ok  = make_beep_sequence(count=2, freq=880, beep_ms=90, pause_ms=90)
-        self.snd_err = make_beep_sequence(count=2, freq=320, beep_ms=50, pause_ms=70, volume=0.22)
 
     def exit(self):
         pass
@@ -97,8 +94,7 @@ class LockPrompt:
     def _try_unlock(self):
         txt = self.input_buf.strip().upper()
         if txt == LOCK_CODE or txt == LOCK_PASS2.upper():
-            try: self.snd_ok.play()
-            except: pass
+            sfx().play("unlock")
             self.app.push_info("ACCESS GRANTED")
             self.app.active_overlay = DecryptOverlay(self.app, duration=1.8, on_done=lambda: self.app.scenes.switch(MenuScene))
             self.app.scenes.switch(MenuScene)
@@ -106,8 +102,7 @@ class LockPrompt:
             self.attempts_left -= 1
             self.input_buf = ""
             self.shake_t = 0.35
-            try: self.snd_err.play()
-            except: pass
+            sfx().play("denied")
             if self.attempts_left <= 0:
                 self.denied = True
                 self.message = "ACCESS DENIED"
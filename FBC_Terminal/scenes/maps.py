@@ -1,12 +1,22 @@
 # -*- coding: utf-8 -*-
-import os, pygame
+import os, math, pygame
+from collections import OrderedDict
 
 from ..settings import (
     BG, FG, ACCENT, MUTED, BORDER,
-    TITLE_TEXT, LOGO_PATH, MAPS_DIR
+    TITLE_TEXT, LOGO_PATH, MAPS_DIR, FBC_SECTORS
 )
 from ..core.scene import Scene
-from ..utils.gfx import draw_text, draw_header_with_right_logo, draw_pulsing_highlight
+from ..utils.gfx import draw_text, draw_header_with_right_logo, draw_pulsing_highlight, scalable
+from ..utils.derivatives import derivatives, source_key
+from ..utils.workers import submit
+from ..utils.pyramid import MipPyramid, TileRenderer
+from ..utils.annotations import AnnotationLayer, annotation_path
+from ..utils.text import tokenize_words, wrap_tokens_to_lines
+
+PAN_SPEED    = 900.0   # px/s while a pan key is held
+PAN_ACCEL    = 10.0    # 1/s: how fast held keys reach PAN_SPEED
+PAN_FRICTION = 5.0     # 1/s: inertial coast decay after a key or drag is released
 
 # ---------------- helpers ----------------
 def _list_maps():
@@ -19,9 +29,12 @@ def _list_maps():
     return out
 
 def _load_thumb(path, max_w=440, max_h=280):
-    """Small thumbnail; returns Surface or None."""
+    """
+    Small thumbnail from the thumb derivative (the source only if its build failed);
+    returns Surface or None. Runs on a worker: no convert() here.
+    """
     try:
-        img = pygame.image.load(path).convert()
+        img = scalable(pygame.image.load(derivatives().pick(path, (max_w, max_h)) or path))
         w, h = img.get_width(), img.get_height()
         scale = min(max_w / w, max_h / h, 1.0)
         nw, nh = max(1, int(w*scale)), max(1, int(h*scale))
@@ -29,17 +42,83 @@ def _load_thumb(path, max_w=440, max_h=280):
     except Exception:
         return None
 
+class _PreparedMap:
+    """
+    One map decoded on a worker for the viewer: the fit-view image (display derivative,
+    or the source while that is still being built), its source size and its annotation
+    layer. Only the map on screen holds a zoom pyramid (full-resolution levels, by far
+    the largest part); neighbours keep just the fit-view image, so switching is still
+    instant and the pyramid is rebuilt behind it.
+    """
+    def __init__(self, path, box):
+        self.path = path
+        self.base = None
+        self.src_size = None
+        self.pyramid = None
+        notes = annotation_path(path)
+        self.notes = AnnotationLayer(notes) if os.path.exists(notes) else None
+        self._job = submit(self._load, box)
+
+    def _load(self, box):
+        src = derivatives().pick(self.path, box) or self.path
+        self.base = pygame.image.load(src)
+        info = derivatives().info(self.path)
+        self.src_size = tuple(info["size"]) if info else self.base.get_size()
+
+    def wait(self):
+        """Block until decoded (only when it wasn't prefetched); False if unreadable."""
+        try:
+            self._job.result()
+        except Exception:
+            return False
+        return self.base is not None
+
+_prepared = OrderedDict()  # (source key, box) -> _PreparedMap: current map + neighbours
+
+def _prepare(path, box):
+    """Start decoding path for the viewer unless already cached; returns the _PreparedMap."""
+    key = (source_key(path), box)
+    pm = _prepared.get(key)
+    if pm is None:
+        pm = _prepared[key] = _PreparedMap(path, box)
+        if len(_prepared) > 4:
+            _prepared.popitem(last=False)
+    else:
+        _prepared.move_to_end(key)
+    return pm
+
+def _release_pyramids(keep=None):
+    """Drop the zoom levels of every prepared map except keep."""
+    for pm in _prepared.values():
+        if pm is not keep:
+            pm.pyramid = None
+
+def _view_box(screen):
+    sw, sh = screen.get_size()
+    return int(sw*0.9), int(sh*0.82)
+
 
 # ---------------- list scene ----------------
 class MapsList(Scene):
     def enter(self):
         self.files = _list_maps()
         self.sel = 0
-        self.thumb_cache = {}  # path -> Surface
+        self.thumb_cache = {}  # path -> Surface (None: unreadable)
+        self._thumb_jobs = {}  # path -> Future of _load_thumb
         self.line_h = pygame.font.SysFont("consolas,monospace", 24).get_height() + 6
 
         if not self.files:
             self.app.push_info(f'Put .png maps in "{MAPS_DIR}"')
+        # thumbnails for the whole directory, built in the process pool and kept on
+        # disk (keyed by path + mtime): only new or edited maps are decoded again
+        for p in self.files:
+            derivatives().request(p)
+        self._prefetch()
+
+    def _prefetch(self):
+        # decode the selected map for the viewer while the list is still up
+        if self.files:
+            _prepare(self.files[self.sel], _view_box(self.app.screen))
 
     def handle(self, e):
         if e.type == pygame.KEYDOWN:
@@ -48,9 +127,9 @@ class MapsList(Scene):
                 self.app.scenes.switch(MenuScene)
             elif self.files:
                 if e.key in (pygame.K_UP, pygame.K_w):
-                    self.sel = (self.sel - 1) % len(self.files)
+                    self.sel = (self.sel - 1) % len(self.files); self._prefetch()
                 elif e.key in (pygame.K_DOWN, pygame.K_s):
-                    self.sel = (self.sel + 1) % len(self.files)
+                    self.sel = (self.sel + 1) % len(self.files); self._prefetch()
                 elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
                     idx = self.sel
                     files_copy = list(self.files)  # aktar
@@ -59,12 +138,22 @@ class MapsList(Scene):
                     self.app.toggle_fullscreen()
 
     def _thumb(self, path):
-        s = self.thumb_cache.get(path)
-        if s: return s
-        s = _load_thumb(path)
-        if s:
-            self.thumb_cache[path] = s
-        return s
+        """Thumbnail if decoded; otherwise starts the decode (after its build) and returns None."""
+        if path in self.thumb_cache:
+            return self.thumb_cache[path]
+        job = self._thumb_jobs.get(path)
+        if job is None:
+            build = derivatives().request(path)
+            if build is not None and not build.done():
+                return None  # still being generated
+            self._thumb_jobs[path] = submit(_load_thumb, path)
+            return None
+        if not job.done():
+            return None
+        del self._thumb_jobs[path]
+        s = job.result()
+        self.thumb_cache[path] = s.convert() if s is not None else None
+        return self.thumb_cache[path]
 
     def draw(self, s):
         s.fill(BG)
@@ -99,12 +188,16 @@ class MapsList(Scene):
             else:
                 color = ACCENT
             draw_text(s, name, 24, color, topleft=(content.left + 18, y))
+            self._thumb(p)  # visible rows decode ahead, so moving the selection shows them at once
             y += self.line_h
 
         # preview panel (below list)
         if self.files:
             sel_path = self.files[self.sel]
             thumb = self._thumb(sel_path)
+            if thumb is None and sel_path not in self.thumb_cache:
+                draw_text(s, "Preparing preview…", 18, MUTED,
+                          topleft=(content.left, y0 + min(len(self.files), max_lines)*self.line_h + 16))
             if thumb:
                 panel_h = thumb.get_height() + 20
                 panel_w = min(max(thumb.get_width()+20, 260), content.width)
@@ -128,21 +221,42 @@ class MapsList(Scene):
 class MapViewerScene(Scene):
     """
     Fit modları: 0=fit both, 1=fit width, 2=fit height, 3=free zoom
-    Pan: ok tuşları
+    Zoom: +/- veya mouse wheel (imlecin altındaki nokta sabit kalır).
+    Pan: WASD / ↑↓ basılı tutulunca veya mouse sürükleyerek; bırakınca ataletle yavaşlar.
+    Çizim: sadece ekrana düşen pyramid tile'ları ölçeklenir (TileRenderer); tam boy
+    ölçekli harita hiçbir zaman oluşturulmaz.
+    Notlar: haritanın yanındaki .json (AnnotationLayer); üzerine gelince adı, tıklayınca
+    detay paneli. L katmanı açar/kapatır.
     """
     def __init__(self, app, files, index):
         super().__init__(app)
         self.files = files
         self.index = index
         self.base = None
-        self.img = None
+        self.src_size = (1, 1)   # zoom is relative to source pixels; base may be a smaller derivative
+        self.pyramid = None
+        self.tiles = TileRenderer()
         self.scale = 1.0
         self.fit_mode = 0
-        self.offset = [0, 0]
+        self.offset = [0.0, 0.0]  # image centre relative to the view centre, screen px
+        self.vel = [0.0, 0.0]     # pan velocity, px/s
+        self.dragging = False
+        self._drag_t = 0
+        self._moved = 0           # drag distance since the press; a click if it stays tiny
+        self.notes = None
+        self.show_notes = True
+        self.hover = None
+        self.selected = None
+        self._detail = (None, [])  # (annotation, wrapped info lines)
 
     def enter(self):
         self._load_current()
 
+    def exit(self):
+        _release_pyramids()
+        self.pyramid = None
+        self.tiles.clear()
+
     def _load_current(self):
         if not self.files:
             from .maps import MapsList
@@ -151,18 +265,40 @@ class MapViewerScene(Scene):
             return
         self.index %= len(self.files)
         path = self.files[self.index]
-        try:
-            self.base = pygame.image.load(path).convert()
-        except Exception:
+        box = _view_box(self.app.screen)
+        pm = _prepare(path, box)  # usually prefetched already: no decode here
+        if not pm.wait():
             from .maps import MapsList
             self.app.push_info("Cannot load image.")
             self.app.scenes.switch(MapsList)
             return
+        self.base, self.src_size = pm.base, pm.src_size
+        if pm.pyramid is None or pm.pyramid.error is not None:
+            # full-resolution levels for zooming, built while the fit view is already up
+            pm.pyramid = MipPyramid(self.base if self.base.get_size() == self.src_size else path)
+        self.pyramid = pm.pyramid
+        _release_pyramids(keep=pm)
+        self.notes = pm.notes
+        self.hover = self.selected = None
+        self.tiles.clear()
         self._auto_fit()
+        # previous and next map decode in the background so ←/→ switches at once
+        n = len(self.files)
+        for j in (self.index + 1, self.index - 1):
+            _prepare(self.files[j % n], box)
+        _prepare(path, box)  # keep the current one most recent in the LRU
+
+    def _levels(self):
+        # display-size derivative until the pyramid lands (coarse when zoomed in, then refined)
+        return self.pyramid.levels if self.pyramid.ready else [self.base]
+
+    def _view_center(self):
+        sw, sh = self.app.screen.get_size()
+        return sw // 2, int(sh * 0.53)
 
     def _auto_fit(self):
         sw, sh = self.app.screen.get_size()
-        iw, ih = self.base.get_width(), self.base.get_height()
+        iw, ih = self.src_size
         tw, th = int(sw*0.9), int(sh*0.82)
         if self.fit_mode == 1:
             scale = tw / iw
@@ -170,42 +306,114 @@ class MapViewerScene(Scene):
             scale = th / ih
         else:
             scale = min(tw/iw, th/ih)
-        self.scale = max(0.05, scale)
-        self._rebuild_image()
-        self.offset = [0, 0]
+        self.scale = max(0.02, scale)
+        self.offset = [0.0, 0.0]
+        self.vel = [0.0, 0.0]
+
+    def _zoom(self, factor, anchor=None):
+        """Zoom keeping the image point under anchor (screen px; default view centre) in place."""
+        old = self.scale
+        self.scale = min(8.0, max(0.02, self.scale * factor))
+        cx, cy = self._view_center()
+        ax, ay = anchor or (cx, cy)
+        k = self.scale / old
+        self.offset[0] = (ax - cx) - ((ax - cx) - self.offset[0]) * k
+        self.offset[1] = (ay - cy) - ((ay - cy) - self.offset[1]) * k
+        self._clamp()
+
+    def _clamp(self):
+        """Keep part of the map on screen: its centre may go at most half its size off-centre."""
+        iw, ih = self.src_size
+        for i, half in enumerate((iw * self.scale / 2, ih * self.scale / 2)):
+            if abs(self.offset[i]) > half:
+                self.offset[i] = math.copysign(half, self.offset[i])
+                self.vel[i] = 0.0
+
+    def _origin(self):
+        """Screen position of the image's top-left corner (whole pixels: tiles never shimmer)."""
+        cx, cy = self._view_center()
+        iw, ih = self.src_size
+        return (int(round(cx + self.offset[0] - iw * self.scale / 2)),
+                int(round(cy + self.offset[1] - ih * self.scale / 2)))
 
-    def _rebuild_image(self):
-        iw, ih = self.base.get_width(), self.base.get_height()
-        nw, nh = max(1, int(iw*self.scale)), max(1, int(ih*self.scale))
-        self.img = pygame.transform.smoothscale(self.base, (nw, nh))
+    def _to_source(self, pos):
+        ox, oy = self._origin()
+        return (pos[0] - ox) / self.scale, (pos[1] - oy) / self.scale
+
+    def _note_at(self, pos):
+        if not (self.show_notes and self.notes and self.notes.ready):
+            return None
+        return self.notes.hit(*self._to_source(pos), self.scale)
 
     def handle(self, e):
         if e.type == pygame.KEYDOWN:
             if e.key in (pygame.K_ESCAPE, pygame.K_q):
+                if self.selected is not None:
+                    self.selected = None
+                    return
                 from .maps import MapsList
                 self.app.scenes.switch(MapsList)
-            elif e.key in (pygame.K_LEFT, pygame.K_a):
+            elif e.key == pygame.K_l:
+                self.show_notes = not self.show_notes
+                self.hover = self.selected = None
+            elif e.key == pygame.K_LEFT:
                 self.index = (self.index - 1) % len(self.files); self._load_current()
-            elif e.key in (pygame.K_RIGHT, pygame.K_d):
+            elif e.key == pygame.K_RIGHT:
                 self.index = (self.index + 1) % len(self.files); self._load_current()
             elif e.key == pygame.K_f:
                 self.fit_mode = (self.fit_mode + 1) % 3; self._auto_fit()
             elif e.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
-                self.scale *= 1.10; self._rebuild_image()
+                self._zoom(1.10)
             elif e.key in (pygame.K_MINUS, pygame.K_UNDERSCORE, pygame.K_KP_MINUS):
-                self.scale *= 0.90; self._rebuild_image()
+                self._zoom(0.90)
             elif e.key == pygame.K_0:
                 self._auto_fit()
-            elif e.key == pygame.K_UP:
-                self.offset[1] += 20
-            elif e.key == pygame.K_DOWN:
-                self.offset[1] -= 20
-            elif e.key == pygame.K_LEFT:
-                self.offset[0] += 20
-            elif e.key == pygame.K_RIGHT:
-                self.offset[0] -= 20
+        elif e.type == pygame.MOUSEWHEEL and self.base is not None:
+            self._zoom(1.10 ** e.y, pygame.mouse.get_pos())
+        elif e.type == pygame.MOUSEBUTTONDOWN and e.button == 1:
+            self.dragging = True
+            self.vel = [0.0, 0.0]
+            self._drag_t = pygame.time.get_ticks()
+            self._moved = 0
+        elif e.type == pygame.MOUSEBUTTONUP and e.button == 1:
+            self.dragging = False
+            if self._moved < 4:  # click, not a drag: select (or clear) the note under it
+                self.vel = [0.0, 0.0]
+                self.selected = self._note_at(e.pos)
+            elif pygame.time.get_ticks() - self._drag_t > 80:
+                self.vel = [0.0, 0.0]  # pointer had stopped before release: no fling
+        elif e.type == pygame.MOUSEMOTION and not self.dragging:
+            self.hover = self._note_at(e.pos)
+        elif e.type == pygame.MOUSEMOTION and self.dragging:
+            now = pygame.time.get_ticks()
+            dt = max(1, now - self._drag_t) / 1000.0
+            self._drag_t = now
+            self._moved += abs(e.rel[0]) + abs(e.rel[1])
+            self.offset[0] += e.rel[0]
+            self.offset[1] += e.rel[1]
+            # smoothed release velocity for the fling
+            self.vel[0] = 0.5 * self.vel[0] + 0.5 * e.rel[0] / dt
+            self.vel[1] = 0.5 * self.vel[1] + 0.5 * e.rel[1] / dt
+            self._clamp()
 
-    def update(self, dt): pass
+    def update(self, dt):
+        if self.dragging:
+            return
+        keys = pygame.key.get_pressed()
+        # map moves opposite to the direction looked at
+        dx = (keys[pygame.K_a]) - (keys[pygame.K_d])
+        dy = (keys[pygame.K_w] or keys[pygame.K_UP]) - (keys[pygame.K_s] or keys[pygame.K_DOWN])
+        if dx or dy:
+            a = min(1.0, PAN_ACCEL * dt)
+            self.vel[0] += (dx * PAN_SPEED - self.vel[0]) * a
+            self.vel[1] += (dy * PAN_SPEED - self.vel[1]) * a
+        else:
+            k = math.exp(-PAN_FRICTION * dt)
+            self.vel = [v * k if abs(v * k) > 5.0 else 0.0 for v in self.vel]
+        if self.vel[0] or self.vel[1]:
+            self.offset[0] += self.vel[0] * dt
+            self.offset[1] += self.vel[1] * dt
+            self._clamp()
 
     def draw(self, s):
         s.fill(BG)
@@ -213,15 +421,41 @@ class MapViewerScene(Scene):
             s, TITLE_TEXT, logo_path=LOGO_PATH, logo_scale_h=0.55, top_pad=36, side_pad=40
         )
 
-        if self.img:
-            rect = self.img.get_rect()
-            cx = s.get_width()//2 + self.offset[0]
-            cy = int(s.get_height()*0.53) + self.offset[1]
-            rect.center = (cx, cy)
-            s.blit(self.img, rect)
+        if self.base is not None:
+            self.tiles.draw(s, self._levels(), self.src_size[0], self.scale, self._origin())
+            if self.show_notes and self.notes and self.notes.ready:
+                marked = tuple(a for a in (self.selected, self.hover) if a is not None)
+                self.notes.draw(s, self._origin(), self.scale, marked=marked)
+                if self.selected is not None:
+                    self._draw_detail(s, content)
 
         name = os.path.basename(self.files[self.index]) if self.files else "-"
-        draw_text(s, f"Map: {name}   [{self.index+1}/{len(self.files)}]   Zoom: {self.scale*100:.0f}%",
+        notes = ""
+        if self.notes and self.notes.ready:
+            notes = f"   Notes: {len(self.notes.items)}" + ("" if self.show_notes else " (hidden)")
+        draw_text(s, f"Map: {name}   [{self.index+1}/{len(self.files)}]   Zoom: {self.scale*100:.0f}%{notes}",
                   18, MUTED, topleft=(content.left, content.top - 20))
-        draw_text(s, "←/→ next/prev • +/- zoom • 0 fit • F fit mode • ESC back",
-                  18, MUTED, topleft=(content.left, content.bottom + 8))
\ No newline at end of file
+        draw_text(s, "←/→ next/prev • +/- or wheel zoom • WASD/↑↓ or drag pan • 0 fit • F fit mode • "
+                     "click note details • L notes • ESC back",
+                  18, MUTED, topleft=(content.left, content.bottom + 8))
+
+    def _draw_detail(self, s, content):
+        """Panel with the selected note's name, kind and info (wrapped once per selection)."""
+        a = self.selected
+        width = min(520, content.width // 2)
+        if self._detail[0] is not a:
+            font = pygame.font.SysFont("consolas,monospace", 18)
+            lines = [" ".join(l) for l in wrap_tokens_to_lines(tokenize_words(a.info), font, width - 24)]
+            self._detail = (a, lines[:12])
+        lines = self._detail[1]
+        kind = "SECTOR" if a.kind == "area" and a.label.upper() in FBC_SECTORS else a.kind.upper()
+        rect = pygame.Rect(content.left, 0, width, 64 + 22 * len(lines))
+        rect.bottom = content.bottom - 8
+        panel = pygame.Surface(rect.size, pygame.SRCALPHA)
+        panel.fill((0, 30, 0, 200))
+        pygame.draw.rect(panel, BORDER, panel.get_rect(), 1)
+        s.blit(panel, rect.topleft)
+        draw_text(s, a.label or "(unnamed)", 22, FG, topleft=(rect.left + 12, rect.top + 10), bold=True)
+        draw_text(s, kind, 16, MUTED, topleft=(rect.left + 12, rect.top + 38))
+        for i, line in enumerate(lines):
+            draw_text(s, line, 18, ACCENT, topleft=(rect.left + 12, rect.top + 60 + 22 * i))
@@ -43,7 +43,7 @@ class MenuScene:
             "• Navigation: ↑/↓ move, Enter select, ESC back/quit",
             "• Fullscreen: F11",
             "• Documents: Enter open, ←/→ page, +/- zoom, 0 reset",
-            "• Videos: Enter play, SPACE pause, F fit mode",
+            "• Videos: Enter play, SPACE pause, ←/→ seek ±10s, 0-9 jump %, F fit mode",
             "• Audio Logs: SPACE play/pause, ←/→ seek ±5s, click word to seek\n",
             " ",
             ]
@@ -6,6 +6,7 @@ from ..settings import (
     QUARRY_ROWS, QUARRY_COLS, QUARRY_COOLDOWN
 )
 from ..utils.gfx import draw_text, draw_header_with_right_logo
+from ..utils.sfx import sfx
 
 # Tema renkleri
 GREEN  = (90, 220, 120)
@@ -142,13 +143,7 @@ class QuarryScene(Scene):
             # Kısa kırmızı flaş; cooldown/anim YOK
             self._flash_cell = (r, c, (220, 40, 40), 0.35)  # parlak kırmızı
             # Minik 'error' bip (opsiyonel)
-            try:
-                if pygame.mixer.get_init():
-                    err = pygame.mixer.Sound(buffer=(b"\x00\x80"*600))
-                    err.set_volume(0.25)
-                    err.play()
-            except Exception:
-                pass
+            sfx().play("quarry_empty")
             return  # erken çıkış
 
         gained = 0
@@ -185,12 +180,7 @@ class QuarryScene(Scene):
         self._flash_cell = (r, c, flash_col, 0.28)
 
         # minik tık
-        try:
-            if pygame.mixer.get_init():
-                click = pygame.mixer.Sound(buffer=(b"\x00\x00"*300))
-                click.play()
-        except Exception:
-            pass
+        sfx().play("quarry_click")
 
     def update(self, dt):
         # Hücre flaşı sönümü
@@ -1,5 +1,5 @@
 # -*- coding: utf-8 -*-
-import os, tempfile
+import os, time, threading
 import pygame
 
 try:
@@ -7,10 +7,16 @@ try:
 except Exception:
     cv2 = None
 
-from ..settings import BG, FG, MUTED, ACCENT, TITLE_TEXT, LOGO_PATH, VIDEOS_DIR
+from ..settings import (
+    BG, FG, MUTED, ACCENT, TITLE_TEXT, LOGO_PATH, VIDEOS_DIR, VIDEO_SEEK_STEP, VIDEO_BACKEND,
+    VIDEO_PRELOAD_SEC, VIDEO_PLAYLIST_LOOP, VIDEO_PLAYLIST_SHUFFLE, VIDEO_TRICK_FPS, VIDEO_TRICK_SEQ_MAX
+)
 from ..core.scene import Scene
 from ..utils.gfx import draw_text, draw_header_with_right_logo, draw_pulsing_highlight
-from ..utils.audio import get_ffmpeg_exe, extract_audio_to_wav, find_sidecar_wav  # utils/audio.py
+from ..utils.audio import get_ffmpeg_exe, wav_job, find_sidecar_wav, music_clock  # utils/audio.py
+from ..utils.video import KeyframeIndex, KeyframeReader, open_decoder, BACKENDS
+from ..utils.catalog import video_catalog
+from ..utils.playlist import Playlist
 
 # --------- Helpers ---------
 def list_videos():
@@ -20,12 +26,56 @@ def list_videos():
     files = [os.path.join(VIDEOS_DIR, n) for n in sorted(os.listdir(VIDEOS_DIR)) if n.endswith(exts)]
     return files
 
+def _fmt_time(sec):
+    sec = int(sec or 0)
+    h, m, s = sec // 3600, (sec // 60) % 60, sec % 60
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m:02d}:{s:02d}"
+
+THUMB_W, THUMB_H = 128, 72
+
+def prepare_audio(path, duration=None):
+    """
+    (sidecar_wav, job) for a video: the sidecar WAV if there is one, else an ffmpeg
+    extraction queued on the job queue (None without ffmpeg). Never blocks.
+    """
+    sidecar = find_sidecar_wav(path)
+    if sidecar and os.path.exists(sidecar):
+        return sidecar, None
+    return None, wav_job(path, duration=duration)
+
+class _PreparedVideo:
+    """Next playlist entry, opened off the main thread: decoder primed, audio extracted."""
+    def __init__(self, path):
+        self.path = path
+        self.decoder = None
+        self.sidecar = None   # sidecar WAV path, or
+        self.audio_job = None # ffmpeg extraction (temp WAV), handed to the player
+        self.kf_index = None
+        self.ready = False
+        self.cancelled = False
+        self._lock = threading.Lock()
+
+    def dispose(self):
+        with self._lock:
+            if self.decoder:
+                self.decoder.release()
+                self.decoder = None
+            if self.audio_job:
+                self.audio_job.release()
+                self.audio_job = None
+
+
 # --------- List of Content Pages ---------
 class VideosList(Scene):
     def enter(self):
         self.files = list_videos()
         self.sel = 0
-        self.line_h = pygame.font.SysFont("consolas,monospace", 24).get_height() + 6
+        self.can_decode = cv2 is not None or bool(get_ffmpeg_exe())
+        self.line_h = THUMB_H + 10
+        # metadata + posters: cached on disk, new/changed files probed in the background
+        self.catalog = video_catalog()
+        if self.can_decode:
+            self.catalog.refresh(self.files)
 
     def handle(self, e):
         if e.type == pygame.KEYDOWN:
@@ -40,6 +90,9 @@ class VideosList(Scene):
                 elif e.key in (pygame.K_RETURN, pygame.K_SPACE):
                     path = self.files[self.sel]
                     self.app.scenes.switch(lambda app: VideoPlayerScene(app, path))
+                elif e.key == pygame.K_p:
+                    playlist = Playlist(self.files, self.sel, VIDEO_PLAYLIST_LOOP, VIDEO_PLAYLIST_SHUFFLE)
+                    self.app.scenes.switch(lambda app: VideoPlayerScene(app, playlist.current, playlist))
                 elif e.key == pygame.K_F11:
                     self.app.toggle_fullscreen()
 
@@ -48,12 +101,15 @@ class VideosList(Scene):
         content = draw_header_with_right_logo(
             s, TITLE_TEXT, logo_path=LOGO_PATH, logo_scale_h=0.52, top_pad=36, side_pad=40
         )
-        draw_text(s, "Videos", 22, FG, topleft=(content.left, content.top - 8))
-        draw_text(s, "Enter/Space: play • SPACE pause • F fit mode • ESC back",
+        label = "Videos"
+        if self.catalog.pending:
+            label += f"  (indexing… {self.catalog.pending} left)"
+        draw_text(s, label, 22, FG, topleft=(content.left, content.top - 8))
+        draw_text(s, "Enter/Space: play • P: play all • SPACE pause • ←/→ seek • F fit mode • ESC back",
                   18, MUTED, topleft=(content.left, content.top + 20))
 
-        if cv2 is None:
-            draw_text(s, "OpenCV not available — pip install opencv-python", 22, ACCENT,
+        if not self.can_decode:
+            draw_text(s, "No video decoder — pip install opencv-python or imageio-ffmpeg", 22, ACCENT,
                       topleft=(content.left, content.top + 60))
             return
 
@@ -73,127 +129,374 @@ class VideosList(Scene):
         end   = min(len(self.files), start + max_lines)
 
         for i in range(start, end):
-            name = os.path.basename(self.files[i])
+            path = self.files[i]
+            name = os.path.basename(path)
             if i == self.sel:
-                rect = pygame.Rect(content.left - 8, y - 2, content.width + 8, self.line_h)
+                rect = pygame.Rect(content.left - 8, y - 2, content.width + 8, self.line_h - 4)
                 draw_pulsing_highlight(s, rect, pulse)
-                draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y)); color = FG
+                draw_text(s, "▸", 24, FG, topleft=(content.left - 4, y + THUMB_H // 2 - 12)); color = FG
             else:
                 color = ACCENT
-            draw_text(s, name, 24, color, topleft=(content.left + 18, y))
+
+            box = pygame.Rect(content.left + 18, y + 2, THUMB_W, THUMB_H)
+            poster = self.catalog.poster(path)
+            if poster:
+                # center-crop to the box (posters are THUMB_W wide, height follows aspect)
+                area = pygame.Rect(0, 0, min(THUMB_W, poster.get_width()), min(THUMB_H, poster.get_height()))
+                area.center = poster.get_rect().center
+                s.blit(poster, area.copy().move(box.centerx - area.centerx, box.centery - area.centery), area)
+            pygame.draw.rect(s, MUTED, box, 1)
+
+            tx = box.right + 14
+            draw_text(s, name, 24, color, topleft=(tx, y + 6))
+            info = self.catalog.get(path)
+            if info is None or "sig" not in info:
+                meta = "probing…"
+            elif info.get("error"):
+                meta = "unreadable"
+            else:
+                meta = f"{_fmt_time(info.get('duration'))}  •  {info.get('width')}x{info.get('height')}"
+                meta += f"  •  {info.get('fps', 0):.0f} fps"
+                if info.get("codec"):
+                    meta += f"  •  {info['codec']}"
+                if info.get("has_audio") is not None:
+                    meta += "  •  audio" if info["has_audio"] else "  •  no audio"
+            draw_text(s, meta, 18, MUTED, topleft=(tx, y + 40))
             y += self.line_h
 
 # --------- VideoPlayer ---------
 class VideoPlayerScene(Scene):
     """
-    Video: OpenCV ile frame çizimi
+    Video: decoder backend (OpenCV veya ffmpeg rawvideo pipe), B ile değişir
     Audio: sidecar WAV (same-name.wav) veya ffmpeg ile çıkarılan geçici WAV
+    Playlist: son saniyelerde sıradaki video arka planda açılır, geçiş boşluksuz
+    Trick-play: [ / ] ile -16x..16x; yüksek hızlarda sadece keyframe çözülür
     """
-    def __init__(self, app, path):
+    TRICK_SPEEDS = (-16, -8, -4, -2, 1, 2, 4, 8, 16)
+
+    def __init__(self, app, path, playlist=None):
         super().__init__(app)
         self.path = path
-        self.cap = None
+        self.playlist = playlist
+        self._next = None  # _PreparedVideo for the upcoming playlist entry
+        self.decoder = None
+        self.decode_ms = 0.0  # smoothed per-frame decode cost
         self.frame_surf = None
         self.accum = 0.0
         self.fps = 30.0
         self.ended = False
         self.paused = False
         self.fit_mode = 0  # 0 both, 1 fit width, 2 fit height
+        self.frame_idx = -1  # index of the frame in frame_surf
+        self.kf_index = None  # KeyframeIndex, built in the background
+
+        # trick-play
+        self.speed = 1
+        self.trick_pos = 0.0  # media time while speed != 1 (audio is muted)
+        self._trick_accum = 0.0
+        self._trick_kf = None  # KeyframeReader while showing keyframes only
 
         # audio
-        self.audio_wav = None
+        self.clock = music_clock()  # shared mixer.music position
+        self.audio_job = None  # ffmpeg extraction in flight / owning the temp WAV
         self.sidecar_used = False
         self.has_audio = False
         self.length_sec = None
 
     def enter(self):
-        if cv2 is None:
-            from .videos import VideosList
-            self.app.push_info("OpenCV not available.")
-            self.app.scenes.switch(VideosList)
-            return
-
         # Video init
-        self.cap = __import__("cv2").VideoCapture(self.path)
-        if not self.cap.isOpened():
+        self.decoder = open_decoder(self.path, VIDEO_BACKEND)
+        if self.decoder is None:
             from .videos import VideosList
             self.app.push_info("Cannot open video.")
             self.app.scenes.switch(VideosList)
             return
 
-        fps = self.cap.get(__import__("cv2").CAP_PROP_FPS)
-        if fps and fps > 1:
-            self.fps = float(fps)
-        total_frames = self.cap.get(__import__("cv2").CAP_PROP_FRAME_COUNT) or 0
-        self.length_sec = (total_frames / self.fps) if self.fps > 0 else None
+        self._use_decoder(self.decoder)
+        self.decoder.set_output_size(self._target_size())
         self._read_frame()  # first frame
 
-        # Audio init (priority: sidecar WAV -> ffmpeg -> none)
-        self._init_audio()
+        # Keyframe index (cached per file; first visit scans in the background)
+        threading.Thread(target=self._load_index, daemon=True).start()
+
+        # Audio init (priority: sidecar WAV -> ffmpeg in the background -> none)
+        sidecar, self.audio_job = prepare_audio(self.path, self.length_sec)
+        if sidecar:
+            self._start_audio(sidecar, sidecar=True)
+        elif self.audio_job is None:
+            self.app.push_info("Audio muted: add sidecar WAV or install ffmpeg")
+
+    def _use_decoder(self, dec):
+        self.decoder = dec
+        self.fps = dec.fps
+        total_frames = dec.frame_count
+        self.length_sec = (total_frames / self.fps) if self.fps > 0 and total_frames else None
+        self.frame_idx = -1
+        self.accum = 0.0
+        self.ended = False
+        self.speed = 1
+        self._close_keyframes()
 
     # --- audio helpers ---
-    def _init_audio(self):
+    def _start_audio(self, wav, sidecar=False, start=0.0):
         self.has_audio = False
-        self.sidecar_used = False
-
-        # 1) sidecar .wav?
-        sidecar = find_sidecar_wav(self.path)
-        if sidecar and os.path.exists(sidecar):
-            try:
-                if not pygame.mixer.get_init():
-                    pygame.mixer.init()
-                pygame.mixer.music.load(sidecar)
-                pygame.mixer.music.play()
-                self.has_audio = True
-                self.sidecar_used = True
-                return
-            except Exception:
-                self.has_audio = False
-
-        # 2) ffmpeg extraction
-        ff = get_ffmpeg_exe()
-        if ff:
-            try:
-                tmpdir = tempfile.gettempdir()
-                base = os.path.splitext(os.path.basename(self.path))[0]
-                self.audio_wav = os.path.join(tmpdir, f"{base}_tmp_audio.wav")
-                ok = extract_audio_to_wav(self.path, self.audio_wav, ff)
-                if ok:
-                    if not pygame.mixer.get_init():
-                        pygame.mixer.init()
-                    pygame.mixer.music.load(self.audio_wav)
-                    pygame.mixer.music.play()
-                    self.has_audio = True
-                else:
-                    self.audio_wav = None
-            except Exception:
-                self.has_audio = False
+        self.sidecar_used = sidecar
+        if not wav:
+            return
+        if self.clock.load(wav):
+            self.has_audio = self.clock.play(start, paused=self.paused)
 
+    def _poll_audio_job(self):
+        """Extraction finished while the video was already running: join in at the current frame."""
+        job = self.audio_job
+        if self.has_audio or job is None or not job.done() or self.sidecar_used:
+            return
+        if job.result:
+            self._start_audio(job.result, start=self._position())
         if not self.has_audio:
-            self.app.push_info("Audio muted: add sidecar WAV or install ffmpeg")
+            self.app.push_info("Audio muted: extraction failed")
+            job.release()
+            self.audio_job = None
+
+    def _drop_audio(self):
+        self.clock.unload()  # release the file before deleting it
+        if self.audio_job:
+            self.audio_job.release()  # cancels a running extraction
+            self.audio_job = None
+        self.has_audio = False
+
+    # --- playlist ---
+    def _prepare(self, prep):
+        """Worker thread: open + prime the next decoder, extract its audio, load its index."""
+        try:
+            dec = open_decoder(prep.path, VIDEO_BACKEND)
+            if dec is not None:
+                dec.set_output_size(self._target_size(dec))
+                if not dec.prime():
+                    dec.release(); dec = None
+            prep.decoder = dec
+            if dec is not None:
+                prep.sidecar, prep.audio_job = prepare_audio(prep.path)
+                if prep.audio_job:
+                    prep.audio_job.wait()
+                try: prep.kf_index = KeyframeIndex.load_or_build(prep.path)
+                except Exception: prep.kf_index = None
+        except Exception:
+            prep.decoder = None
+        prep.ready = True
+        if prep.cancelled:
+            prep.dispose()
+
+    def _cancel_next(self):
+        if self._next:
+            self._next.cancelled = True
+            if self._next.ready:
+                self._next.dispose()
+            self._next = None
+
+    def _remaining(self):
+        if not self.length_sec:
+            return float("inf")
+        return self.length_sec - self._position()
+
+    def _update_playlist(self):
+        nxt = self.playlist.peek_next()
+        if self._next and self._next.path != nxt:
+            self._cancel_next()  # loop/shuffle changed the queue
+        if nxt is None:
+            return
+        if self._next is None and (self.ended or self._remaining() <= VIDEO_PRELOAD_SEC):
+            self._next = _PreparedVideo(nxt)
+            threading.Thread(target=self._prepare, args=(self._next,), daemon=True).start()
+        if self.ended and self._next and self._next.ready:
+            self._advance()
+
+    def _advance(self):
+        """Swap in the prepared video: its first frame is already decoded."""
+        prep, self._next = self._next, None
+        self.playlist.advance()
+        if prep.decoder is None:
+            self.app.push_info(f"Skipped: {os.path.basename(prep.path)}")
+            prep.dispose()
+            self.path = prep.path
+            return  # still ended -> next update prepares the one after
+        self._drop_audio()
+        if self.decoder is not None:
+            self.decoder.release()
+        self.path = prep.path
+        self.kf_index = prep.kf_index
+        self.decode_ms = 0.0
+        self._use_decoder(prep.decoder)
+        self._read_frame()
+        self.audio_job, prep.audio_job = prep.audio_job, None
+        if prep.sidecar:
+            self._start_audio(prep.sidecar, sidecar=True)
+        elif self.audio_job:
+            self._start_audio(self.audio_job.result)
 
     # --- video helpers ---
-    def _read_frame(self):
-        ok, frame = self.cap.read()
-        if not ok:
-            self.ended = True
+    def _load_index(self):
+        try:
+            self.kf_index = KeyframeIndex.load_or_build(self.path)
+        except Exception:
+            self.kf_index = None
+
+    def _position(self):
+        if self.speed != 1:
+            return self.trick_pos
+        return max(0, self.frame_idx) / self.fps if self.fps > 0 else 0.0
+
+    def _seek(self, target):
+        """Jump to the nearest keyframe <= target, then decode forward to the exact frame."""
+        if self.decoder is None:
             return
-        frame = __import__("cv2").cvtColor(frame, __import__("cv2").COLOR_BGR2RGB)
+        if self.length_sec:
+            target = min(target, max(0.0, self.length_sec - 1.0 / self.fps))
+        target = max(0.0, target)
+        if self.speed != 1:
+            self.trick_pos = target  # trick-play picks it up on the next tick
+            self._trick_accum = 1.0
+            return
+        target_frame = int(round(target * self.fps))
+
+        kf = self.kf_index.floor(target) if self.kf_index else None
+        if kf is not None and not self.decoder.exact_seek:
+            start_frame = int(round(kf * self.fps))
+            # already between that keyframe and the target: just decode forward
+            if not (start_frame <= self.frame_idx + 1 <= target_frame):
+                self.decoder.seek_frame(start_frame)
+                self.frame_idx = start_frame - 1
+            while self.frame_idx + 1 < target_frame:
+                if not self.decoder.grab():
+                    break
+                self.frame_idx += 1
+        else:
+            # ffmpeg seeks accurately itself; OpenCV without an index finds its own way
+            self.decoder.seek_frame(target_frame)
+            self.frame_idx = target_frame - 1
+
+        self.ended = False
+        self.accum = 0.0
+        self._read_frame()
+        self._sync_audio()
+
+    def _sync_audio(self):
+        if self.has_audio:
+            self.clock.play(self._position(), paused=self.paused)
+
+    # --- trick-play ---
+    def _set_speed(self, speed):
+        if speed == self.speed or self.decoder is None:
+            return
+        keyframes = speed < 0 or speed > VIDEO_TRICK_SEQ_MAX
+        if keyframes and self.kf_index is None:
+            # without the index there is nothing to snap to: keyframe modes wait for it
+            self.app.push_info("Keyframe index not ready yet.")
+            return
+        if self.speed == 1:
+            # entering trick-play: audio is muted, position is tracked separately
+            self.trick_pos = self._position()
+            if self.has_audio:
+                self.clock.pause()
+        self.speed = speed
+        self.ended = False  # rewinding from the end is allowed
+        self._trick_accum = 1.0  # show the first trick frame immediately
+        if keyframes and self._trick_kf is None:
+            self._trick_kf = KeyframeReader(self.path, self.kf_index, self.fps, self.decoder.out_size)
+        elif not keyframes:
+            self._close_keyframes()
+        if speed == 1:
+            self.decoder.set_skip(None)
+            self._seek(self.trick_pos)  # exact frame + audio resync
+        else:
+            self.decoder.set_skip("noref" if not keyframes else None)
+
+    def _update_trick(self, dt):
+        end = self.length_sec or float("inf")
+        self.trick_pos = min(max(0.0, self.trick_pos + self.speed * dt), end)
 
+        if 1 < self.speed <= VIDEO_TRICK_SEQ_MAX:
+            # low multiples: decode sequentially (non-reference frames dropped by ffmpeg,
+            # skipped frames only grab()bed by OpenCV), convert just the one shown
+            target = int(self.trick_pos * self.fps)
+            budget = 2 * self.speed  # per tick; if decoding can't keep up, time waits for it
+            while self.frame_idx + 1 < target and budget > 0:
+                if not self.decoder.grab():
+                    self.ended = True
+                    break
+                self.frame_idx += 1; budget -= 1
+            if not self.ended and self.frame_idx < target:
+                self._read_frame()
+            self.trick_pos = min(self.trick_pos, (self.frame_idx + 1) / self.fps)
+        else:
+            # high multiples and rewind: keyframes only, decoded by the reader's thread;
+            # the target moves at a fixed rate so the cost does not grow with the multiple
+            self._trick_accum += dt
+            if self._trick_accum >= 1.0 / VIDEO_TRICK_FPS:
+                self._trick_accum = 0.0
+                self._trick_kf.want(self.trick_pos, self.speed)
+            got = self._trick_kf.latest()
+            if got is not None:
+                self.frame_idx, self.frame_surf = got
+
+        if self.speed < 0 and self.trick_pos <= 0.0:
+            self._set_speed(1)  # rewound to the start: play from there
+        elif self.ended or self.trick_pos >= end:
+            self.speed = 1
+            self._close_keyframes()
+            self.decoder.set_skip(None)
+            self.ended = True
+            if self.has_audio:
+                self.clock.stop()
+
+    def _close_keyframes(self):
+        if self._trick_kf is not None:
+            self._trick_kf.close()
+            self._trick_kf = None
+
+    def _target_size(self, dec=None):
         sw, sh = self.app.screen.get_size()
         target_w, target_h = int(sw * 0.9), int(sh * 0.9)
-        fh, fw = frame.shape[0], frame.shape[1]
+        fw, fh = (dec or self.decoder).size
+        if not fw or not fh:
+            return target_w, target_h
         if self.fit_mode == 1:
             scale = target_w / fw
         elif self.fit_mode == 2:
             scale = target_h / fh
         else:
             scale = min(target_w / fw, target_h / fh)
+        return max(1, int(fw * scale)), max(1, int(fh * scale))
 
-        new_w, new_h = max(1, int(fw * scale)), max(1, int(fh * scale))
-        frame = __import__("cv2").resize(frame, (new_w, new_h), interpolation=__import__("cv2").INTER_AREA)
-        # OpenCV array -> pygame surface
-        self.frame_surf = pygame.surfarray.make_surface(frame.swapaxes(0, 1)).convert()
+    def _read_frame(self):
+        t0 = time.perf_counter()
+        surf = self.decoder.read()
+        if surf is None:
+            self.ended = True
+            return
+        self.frame_idx += 1
+        self.frame_surf = surf
+        ms = (time.perf_counter() - t0) * 1000.0
+        self.decode_ms = ms if not self.decode_ms else self.decode_ms * 0.9 + ms * 0.1
+
+    def _switch_backend(self):
+        """Reopen the current position with the next decoder backend."""
+        self._set_speed(1)
+        cur = self.decoder.name
+        nxt = BACKENDS[(BACKENDS.index(cur) + 1) % len(BACKENDS)]
+        dec = open_decoder(self.path, nxt)
+        if dec is None or dec.name == cur:
+            if dec: dec.release()
+            self.app.push_info(f"Decoder '{nxt}' not available.")
+            return
+        self.decoder.release()
+        self.decoder = dec
+        self.decode_ms = 0.0
+        dec.set_output_size(self._target_size())
+        frame = max(0, self.frame_idx)
+        dec.seek_frame(frame)
+        self.frame_idx = frame - 1
+        self._read_frame()
 
     # --- scene io ---
     def handle(self, e):
@@ -204,29 +507,68 @@ class VideoPlayerScene(Scene):
                 self.app.scenes.switch(VideosList)
             elif e.key == pygame.K_SPACE:
                 self.paused = not self.paused
-                if self.has_audio:
-                    try:
-                        if self.paused:
-                            pygame.mixer.music.pause()
-                        else:
-                            pygame.mixer.music.unpause()
-                    except Exception:
-                        pass
+                if self.has_audio and self.speed == 1:
+                    if self.paused:
+                        self.clock.pause()
+                    else:
+                        self.clock.resume()
             elif e.key == pygame.K_f:
                 self.fit_mode = (self.fit_mode + 1) % 3
+                if self.decoder:
+                    self.decoder.set_output_size(self._target_size())
+                self._cancel_next()  # prepared at the old size
+            elif e.key == pygame.K_b and self.decoder:
+                self._switch_backend()
+            elif e.key == pygame.K_LEFT:
+                self._seek(self._position() - VIDEO_SEEK_STEP)
+            elif e.key == pygame.K_RIGHT:
+                self._seek(self._position() + VIDEO_SEEK_STEP)
+            elif pygame.K_0 <= e.key <= pygame.K_9 and self.length_sec:
+                # 0..9 -> 0%..90%
+                self._seek(self.length_sec * (e.key - pygame.K_0) / 10.0)
+            elif e.key in (pygame.K_RIGHTBRACKET, pygame.K_LEFTBRACKET) and self.decoder:
+                i = self.TRICK_SPEEDS.index(self.speed)
+                i += 1 if e.key == pygame.K_RIGHTBRACKET else -1
+                self._set_speed(self.TRICK_SPEEDS[max(0, min(len(self.TRICK_SPEEDS) - 1, i))])
+            elif e.key == pygame.K_RETURN:
+                self._set_speed(1)
+            elif self.playlist:
+                if e.key == pygame.K_n:
+                    self.ended = True  # next update swaps in the following entry
+                    self.clock.stop()
+                elif e.key == pygame.K_l:
+                    self.playlist.loop = not self.playlist.loop
+                elif e.key == pygame.K_s:
+                    self.playlist.set_shuffle(not self.playlist.shuffle)
 
     def update(self, dt):
-        if self.ended or self.cap is None or self.paused:
+        if self.decoder is None:
+            return
+        self._poll_audio_job()
+        if self.paused:
+            return
+        if self.playlist:
+            self._update_playlist()
+        if self.ended:
+            return
+        if self.speed != 1:
+            self._update_trick(dt)
             return
         self.accum += dt
         interval = 1.0 / self.fps if self.fps > 0 else 1 / 30
+        if self.has_audio and self.frame_idx >= 0 and self.clock.playing:
+            # audio is the master clock: nudge the frame timer when video drifts > 2 frames
+            drift = self.clock.position - (self.frame_idx * interval + self.accum)
+            if abs(drift) > 2 * interval:
+                self.accum += max(-0.25, min(0.25, drift))
         while self.accum >= interval:
             self.accum -= interval
             self._read_frame()
             if self.ended:
-                if self.has_audio:
-                    try: pygame.mixer.music.stop()
-                    except Exception: pass
+                if self.playlist and self._next and self._next.ready:
+                    self._advance()  # gapless: swap within the same tick
+                elif self.has_audio:
+                    self.clock.stop()
                 break
 
     def draw(self, s):
@@ -240,31 +582,46 @@ class VideoPlayerScene(Scene):
 
         name = os.path.basename(self.path)
         draw_text(s, name, 20, FG, topleft=(20, 14))
-        draw_text(s, "SPACE: pause • F: fit mode • ESC: back", 18, MUTED, topleft=(20, 42))
+        draw_text(s, "SPACE: pause • ←/→: ±10s • 0-9: jump % • [/]: rewind/ffwd • F: fit mode • B: decoder • ESC: back",
+                  18, MUTED, topleft=(20, 42))
+        if self.speed != 1:
+            arrow = "▶▶" if self.speed > 0 else "◀◀"
+            draw_text(s, f"{arrow} {abs(self.speed)}x   (audio muted • Enter: normal speed)", 22, ACCENT,
+                      topleft=(20, s.get_height() - 40))
         if self.length_sec:
+            pos = self._position()
             m = int(self.length_sec // 60); sec = int(self.length_sec % 60)
-            draw_text(s, f"Duration: {m:02d}:{sec:02d}", 18, MUTED, topleft=(20, 64))
+            pm = int(pos // 60); ps = int(pos % 60)
+            draw_text(s, f"Time: {pm:02d}:{ps:02d} / {m:02d}:{sec:02d}", 18, MUTED, topleft=(20, 64))
         if self.has_audio:
             src = "WAV" if self.sidecar_used else "ffmpeg"
             draw_text(s, f"Audio: {src}", 16, MUTED, topleft=(20, 84))
+        elif self.audio_job and not self.audio_job.done():
+            draw_text(s, f"Audio: extracting… {int(self.audio_job.progress * 100)}%", 16, MUTED, topleft=(20, 84))
         else:
             draw_text(s, "Audio: off", 16, MUTED, topleft=(20, 84))
+        if self.decoder:
+            draw_text(s, f"Decoder: {self.decoder.name} ({self.decode_ms:.1f} ms/frame)",
+                      16, MUTED, topleft=(20, 104))
+        if self.playlist:
+            pl = self.playlist
+            mode = ("loop" if pl.loop else "once") + (" • shuffle" if pl.shuffle else "")
+            nxt = pl.peek_next()
+            state = ""
+            if nxt and self._next:
+                state = " (ready)" if self._next.ready else " (preparing…)"
+            draw_text(s, f"Playlist {pl.pos + 1}/{len(pl.order)} • {mode} • N: next • L: loop • S: shuffle",
+                      16, MUTED, topleft=(20, 124))
+            draw_text(s, f"Next: {os.path.basename(nxt) if nxt else '—'}{state}",
+                      16, MUTED, topleft=(20, 144))
 
     def cleanup(self):
-        try:
-            if self.cap is not None:
-                self.cap.release()
-        except Exception:
-            pass
-        try:
-            pygame.mixer.music.stop()
-        except Exception:
-            pass
-        try:
-            if self.audio_wav and os.path.exists(self.audio_wav):
-                os.remove(self.audio_wav)
-        except Exception:
-            pass
+        self._cancel_next()
+        self._close_keyframes()
+        if self.decoder is not None:
+            self.decoder.release()
+            self.decoder = None
+        self._drop_audio()
 
     def exit(self):
         self.cleanup()
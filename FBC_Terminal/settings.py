@@ -15,17 +15,50 @@ MAPS_DIR   = os.path.join(ASSETS_DIR, "maps")
 
 ALTERED_DIR = os.path.join(ASSETS_DIR, "AlteredItems")
 OOP_DIR     = os.path.join(ASSETS_DIR, "OOP")
+# Dossier archives (folders of info.txt, dates.txt, image.png), indexed together for search
+ARCHIVE_DIRS = {"altered": ALTERED_DIR, "oop": OOP_DIR}
 
 AHTI_IMAGE  = os.path.join(ASSETS_DIR, "Ahti.png")
 AHTI_SONG   = os.path.join(ASSETS_DIR, "Sankarin Tango.mp3")
-AHTI_CHANNEL_ID = 5
 
 KEYSOUND_FILE = os.path.join(ASSETS_DIR, "keysound.mp3")
 
+# Derived data (indexes, thumbnails, transcodes); safe to delete
+CACHE_DIR  = os.path.join(ROOT_DIR, "cache")
+# Display-ready copies of dossier/map images (fit inside w x h, never upscaled), smallest first
+IMAGE_VARIANTS = {"thumb": (440, 280), "panel": (960, 960), "screen": (1920, 1080)}
+
 # ---- Runtime ----
 FULLSCREEN = True
 FPS        = 60
 
+# ---- Audio engine ----
+# "latency": small buffer, key clicks/beeps land within a frame.
+# "throughput": big buffer, fewer dropouts on slow machines or heavy video decoding.
+AUDIO_PROFILE  = "latency"
+AUDIO_PROFILES = {
+    "latency":    {"frequency": 44100, "size": -16, "channels": 2, "buffer": 512},
+    "throughput": {"frequency": 44100, "size": -16, "channels": 2, "buffer": 2048},
+}
+AUDIO_CHANNELS  = {"ui": 6, "music": 2, "ambience": 2}  # reserved per class
+AUDIO_FREE_CHANNELS = 4  # unreserved, above the classes: plain Sound.play() lands here
+AUDIO_DUCK      = 0.35   # music gain while a voice (log, message, video) is playing
+AUDIO_DUCK_FADE = 0.30   # seconds for the duck ramp
+AUDIO_STALL_MS  = 120    # frames longer than this during playback count as stalls
+AUDIO_DEBUG     = False  # show audio problems in the info bar, log a summary on exit (INFO)
+
+# ---- Audio logs ----
+AUDIO_PLAYALL_LOOP = False  # play all: start over after the last log
+
+# ---- Video player ----
+VIDEO_SEEK_STEP = 10.0   # ←/→ seek (seconds)
+VIDEO_BACKEND   = "auto" # "cv2", "ffmpeg" (scaled in the decoder) or "auto" (ffmpeg above 1080p)
+VIDEO_PRELOAD_SEC = 8.0  # playlist: open the next video this long before the end
+VIDEO_PLAYLIST_LOOP    = True
+VIDEO_PLAYLIST_SHUFFLE = False
+VIDEO_TRICK_FPS     = 12.0  # trick-play: keyframes shown per second at high speeds / rewind
+VIDEO_TRICK_SEQ_MAX = 4     # trick-play: up to this multiple, decode sequentially (noref skip)
+
 # Threshold Automatic 
 THRESHOLD_MIN_DELAY = 120.0  
 THRESHOLD_MAX_DELAY = 200.0
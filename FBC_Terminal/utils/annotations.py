@@ -0,0 +1,381 @@
+import os, json, time
+import pygame
+from collections import OrderedDict
+from ..settings import BG, FG, ACCENT, MUTED
+from .workers import submit
+from .gfx import mono_font
+
+# Drawn bottom to top; a hover/click prefers the topmost kind.
+KINDS = ("area", "route", "point")
+KIND_COLORS = {"area": MUTED, "route": ACCENT, "point": FG}
+_KEY = (255, 0, 255)  # transparent colour of the render buffer
+
+def annotation_path(map_path):
+    """Sidecar next to the map: maps/central.png -> maps/central.json."""
+    return os.path.splitext(map_path)[0] + ".json"
+
+class Annotation:
+    """One area (closed polygon), route (polyline) or point, in source-image pixels."""
+    __slots__ = ("kind", "points", "label", "info", "color", "min_zoom", "bbox", "area")
+
+    def __init__(self, kind, points, label="", info="", color=None, min_zoom=0.0):
+        self.kind = kind
+        self.points = points
+        self.label = label
+        self.info = info
+        self.color = color or KIND_COLORS[kind]
+        self.min_zoom = min_zoom  # labels of points only from this zoom up
+        xs = [p[0] for p in points]
+        ys = [p[1] for p in points]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+        self.area = abs(sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1)
+                            in zip(points, points[1:] + points[:1]))) / 2 if kind == "area" else 0.0
+
+    @classmethod
+    def parse(cls, raw):
+        """From a JSON object; None when malformed (a bad entry never drops the file)."""
+        try:
+            kind = raw.get("type", "point")
+            if kind not in KINDS:
+                return None
+            pts = [(float(x), float(y)) for x, y in (raw["points"] if kind != "point" else [raw["at"]])]
+            if len(pts) < (3 if kind == "area" else 2 if kind == "route" else 1):
+                return None
+            color = tuple(raw["color"][:3]) if raw.get("color") else None
+            return cls(kind, pts, str(raw.get("label", "")), str(raw.get("info", "")),
+                       color, float(raw.get("min_zoom", 0.0)))
+        except Exception:
+            return None
+
+    def contains(self, x, y, tol):
+        """Hit test in source px; tol = pointer tolerance converted to source px."""
+        pts = self.points
+        if self.kind == "point":
+            return (x - pts[0][0]) ** 2 + (y - pts[0][1]) ** 2 <= tol * tol
+        segs = list(zip(pts, pts[1:] + pts[:1] if self.kind == "area" else pts[1:]))
+        if any(_seg_dist2(x, y, a, b) <= tol * tol for a, b in segs):
+            return True
+        if self.kind != "area":
+            return False
+        inside = False  # even-odd ray cast
+        for (x0, y0), (x1, y1) in segs:
+            if (y0 > y) != (y1 > y) and x < x0 + (y - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        return inside
+
+def _seg_dist2(x, y, a, b):
+    (ax, ay), (bx, by) = a, b
+    dx, dy = bx - ax, by - ay
+    d = dx * dx + dy * dy
+    t = 0.0 if d == 0 else max(0.0, min(1.0, ((x - ax) * dx + (y - ay) * dy) / d))
+    px, py = ax + t * dx - x, ay + t * dy - y
+    return px * px + py * py
+
+class SpatialGrid:
+    """
+    Uniform grid over source pixels: cell -> [item index]. An item is listed in every
+    cell its bbox touches, so a window or a pointer only looks at the items of the
+    few cells it covers, however many the map has.
+    """
+    def __init__(self, cell):
+        self.cell = cell
+        self.cells = {}
+
+    def _span(self, x0, y0, x1, y1):
+        c = self.cell
+        return range(int(x0 // c), int(x1 // c) + 1), range(int(y0 // c), int(y1 // c) + 1)
+
+    def insert(self, i, bbox):
+        xs, ys = self._span(*bbox)
+        for cy in ys:
+            for cx in xs:
+                self.cells.setdefault((cx, cy), []).append(i)
+
+    def query(self, x0, y0, x1, y1):
+        """Indices of items in the cells meeting the rect (may include near misses)."""
+        xs, ys = self._span(x0, y0, x1, y1)
+        out = set()
+        for cy in ys:
+            for cx in xs:
+                ids = self.cells.get((cx, cy))
+                if ids:
+                    out.update(ids)
+        return out
+
+class AnnotationLayer:
+    """
+    Areas, routes and points of one map from its JSON sidecar, parsed and put in a
+    SpatialGrid on a worker. Per frame only the items in the view are drawn; items
+    too small at the current zoom are skipped and labels are placed only where they
+    fit, so thousands of annotations cost about as much as the few on screen.
+
+    File: {"annotations": [
+        {"type": "area",  "points": [[x, y], ...], "label": "...", "info": "..."},
+        {"type": "route", "points": [[x, y], ...], "label": "..."},
+        {"type": "point", "at": [x, y], "label": "...", "min_zoom": 0.5}]}
+    optional "color": [r, g, b]; coordinates are pixels of the full-size map image.
+    """
+    CELL = 256        # grid cell edge, source px
+    HIT_PX = 6        # pointer tolerance, screen px
+    MIN_PX = 3        # areas/routes smaller than this on screen are not drawn
+    LABEL_SIZE = 16
+    TILE = 512        # render tile edge, zoomed-image px
+    TILE_LABELS = 8   # labels placed per tile
+    CACHE = 64        # rendered tiles kept (LRU; never fewer than two views' worth)
+    RENDER_MS = 6     # per frame, missing tiles are rendered until this is spent (at least one)
+    SETTLE_MS = 150   # while zooming, the last zoom's tiles are stretched until the zoom rests this long
+
+    def __init__(self, path):
+        self.items = []
+        self.grid = None
+        self.extent = None    # union of all bboxes: queries are clipped to it
+        self.error = None
+        self._view_key = None
+        self._view = []       # draw-ordered items of the cells last queried
+        self._labels = {}     # (text, color) -> Surface
+        self._tiles = OrderedDict()  # (zoom, tx, ty) -> colour-keyed Surface, None when empty
+        self._places = {}     # (tx, ty) -> [(label Surface, rect)] at the shown zoom (see _place)
+        self._shown = None    # zoom the tiles are drawn at
+        self._prev = None     # the zoom before it, stretched where a tile is still missing
+        self._scratch = None  # one plain tile: RLE tiles are copied here before scaling
+        self._scale = None    # last zoom asked for, and when it changed
+        self._scale_t = 0
+        self._job = submit(self._build, path)
+
+    def _build(self, path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            raw = data.get("annotations", []) if isinstance(data, dict) else data
+            items = [a for a in map(Annotation.parse, raw) if a is not None]
+            items.sort(key=lambda a: KINDS.index(a.kind))  # stable: file order within a kind
+            grid = SpatialGrid(self.CELL)
+            for i, a in enumerate(items):
+                grid.insert(i, a.bbox)
+            if items:
+                self.extent = (min(a.bbox[0] for a in items), min(a.bbox[1] for a in items),
+                               max(a.bbox[2] for a in items), max(a.bbox[3] for a in items))
+            self.items = items
+            self.grid = grid  # published last: ready means items are complete
+        except Exception as e:
+            self.error = e
+
+    @property
+    def ready(self):
+        return self.grid is not None
+
+    def visible(self, x0, y0, x1, y1):
+        """Items whose bbox meets the source rect, bottom to top."""
+        if not self.ready or self.extent is None:
+            return []
+        # zoomed far out the view spans many empty cells: only walk the annotated ones
+        x0, y0 = max(x0, self.extent[0]), max(y0, self.extent[1])
+        x1, y1 = min(x1, self.extent[2]), min(y1, self.extent[3])
+        if x1 < x0 or y1 < y0:
+            return []
+        c = self.CELL
+        key = (int(x0 // c), int(y0 // c), int(x1 // c), int(y1 // c))
+        if key != self._view_key:  # panning inside the same cells reuses the last query
+            self._view = [self.items[i] for i in sorted(self.grid.query(x0, y0, x1, y1))]
+            self._view_key = key
+        return [a for a in self._view
+                if a.bbox[0] <= x1 and a.bbox[2] >= x0 and a.bbox[1] <= y1 and a.bbox[3] >= y0]
+
+    def hit(self, x, y, scale):
+        """Topmost item under source point (x, y); among areas the smallest. None if nothing."""
+        if not self.ready:
+            return None
+        tol = self.HIT_PX / max(scale, 1e-6)
+        best = None
+        for i in sorted(self.grid.query(x - tol, y - tol, x + tol, y + tol), reverse=True):
+            a = self.items[i]
+            if not a.contains(x, y, tol):
+                continue
+            if a.kind != "area":
+                return a
+            if best is None or a.area < best.area:
+                best = a
+        return best
+
+    def _label(self, text, color):
+        surf = self._labels.get((text, color))
+        if surf is None:
+            surf = self._labels[(text, color)] = mono_font(self.LABEL_SIZE).render(text, True, color, BG)
+        return surf
+
+    def draw(self, s, origin, scale, view=None, marked=()):
+        """Draw what meets view (default all of s); origin = image top-left on s. marked = highlighted items."""
+        view = view or s.get_rect()
+        ox, oy = origin
+        rel = view.move(-ox, -oy)  # the view in zoomed-image px
+        now = pygame.time.get_ticks()
+        if scale != self._scale:
+            self._scale, self._scale_t = scale, now
+        if self._shown is not None and scale != self._shown and now - self._scale_t < self.SETTLE_MS:
+            self._stretch(s, rel, ox, oy, scale, self._shown)  # mid-zoom: nearest-neighbour preview, like the tiles
+        else:
+            if scale != self._shown:
+                self._prev, self._shown = self._shown, scale
+                self._places = {}
+            self._draw_tiles(s, rel, ox, oy, scale)
+        for a in marked:  # on top, always with their fill and name
+            cx, cy, _ = self._shape(s, a, ox, oy, scale, True, view)
+            surf = self._label(a.label or "(unnamed)", a.color)
+            s.blit(surf, surf.get_rect(center=(int(cx), int(cy))))
+
+    def _span(self, rel):
+        T = self.TILE
+        return range(rel.left // T, (rel.right - 1) // T + 1), range(rel.top // T, (rel.bottom - 1) // T + 1)
+
+    def _draw_tiles(self, s, rel, ox, oy, scale):
+        T = self.TILE
+        xs, ys = self._span(rel)
+        cx, cy = rel.center
+        # nearest the view centre first: those are the ones worth the frame budget
+        order = sorted(((tx, ty) for ty in ys for tx in xs),
+                       key=lambda t: (t[0] * T + T / 2 - cx) ** 2 + (t[1] * T + T / 2 - cy) ** 2)
+        t0 = time.perf_counter()
+        rendered = False
+        for tx, ty in order:
+            key = (scale, tx, ty)
+            if key in self._tiles:
+                self._tiles.move_to_end(key)
+            elif not rendered or (time.perf_counter() - t0) * 1000.0 < self.RENDER_MS:
+                self._tiles[key] = self._render(tx, ty, scale)
+                rendered = True
+            else:
+                if self._prev is not None:  # the rest come in over the next frames
+                    clip = pygame.Rect(ox + tx * T, oy + ty * T, T, T)
+                    self._stretch(s, rel.clip(clip.move(-ox, -oy)), ox, oy, scale, self._prev)
+                continue
+            tile = self._tiles[key]
+            if tile is not None:
+                s.blit(tile, (ox + tx * T, oy + ty * T))
+        cap = max(self.CACHE, 2 * len(order))
+        while len(self._tiles) > cap:
+            self._tiles.popitem(last=False)
+
+    def _stretch(self, s, rel, ox, oy, scale, old):
+        """The tiles of zoom old that are still cached, scaled to zoom over rel."""
+        k = scale / old
+        want = pygame.Rect(int(rel.x / k), int(rel.y / k), int(rel.width / k) + 2, int(rel.height / k) + 2)
+        T = self.TILE
+        xs, ys = self._span(want)
+        for ty in ys:
+            for tx in xs:
+                tile = self._tiles.get((old, tx, ty))
+                if tile is None:
+                    continue
+                part = want.clip(pygame.Rect(tx * T, ty * T, T, T))
+                if part.width <= 0 or part.height <= 0:
+                    continue
+                # reading an RLE surface decodes it on every lock; a blit from it does not
+                if self._scratch is None:
+                    self._scratch = pygame.Surface((T, T))
+                local = part.move(-tx * T, -ty * T)
+                self._scratch.fill(_KEY, local)
+                self._scratch.blit(tile, local, local)
+                sub = self._scratch.subsurface(local)
+                out = pygame.transform.scale(sub, (max(1, round(part.width * k)), max(1, round(part.height * k))))
+                out.set_colorkey(_KEY)
+                s.blit(out, (ox + round(part.x * k), oy + round(part.y * k)))
+
+    def _place(self, tx, ty, scale):
+        """
+        Labels whose anchor lies in tile (tx, ty): top-most kinds first, none covering
+        another, at most TILE_LABELS. Decided per tile and kept for the zoom, so every
+        tile a label overlaps draws it the same way and it is never cut at a tile edge.
+        """
+        got = self._places.get((tx, ty))
+        if got is not None:
+            return got
+        T = self.TILE
+        box = pygame.Rect(tx * T, ty * T, T, T)
+        pad = 16 / scale  # point labels sit above their point
+        labels = []
+        for a in self.visible(box.left / scale - pad, box.top / scale - pad,
+                              box.right / scale + pad, box.bottom / scale + pad):
+            if not a.label or (a.kind == "point" and scale < a.min_zoom):
+                continue
+            if a.kind != "point" and max(a.bbox[2] - a.bbox[0], a.bbox[3] - a.bbox[1]) * scale < self.MIN_PX:
+                continue
+            cx, cy, room = self._anchor(a, 0, 0, scale)
+            if box.collidepoint(int(cx), int(cy)):
+                labels.append((a, cx, cy, room))
+        labels.sort(key=lambda t: -KINDS.index(t[0].kind))
+        placed = []
+        char_w = mono_font(self.LABEL_SIZE).size("M")[0]
+        for a, cx, cy, room in labels:
+            if room is not None and len(a.label) * char_w > room:
+                continue  # area/route too small at this zoom for its name (checked before rendering it)
+            surf = self._label(a.label, a.color)
+            r = surf.get_rect(center=(int(cx), int(cy)))
+            if r.collidelist([p[1] for p in placed]) != -1:
+                continue
+            placed.append((surf, r))
+            if len(placed) >= self.TILE_LABELS:
+                break
+        self._places[(tx, ty)] = placed
+        return placed
+
+    def _render(self, tx, ty, scale):
+        """
+        Shapes and labels meeting tile (tx, ty) on a colour-keyed surface, or None when
+        it has nothing. They only move with the origin at one zoom, so panning just
+        blits cached tiles and renders the few newly exposed ones.
+        """
+        T = self.TILE
+        box = pygame.Rect(tx * T, ty * T, T, T)
+        pad = 8 / scale  # strokes and point markers reach a few px past their bbox
+        items = [a for a in self.visible(box.left / scale - pad, box.top / scale - pad,
+                                         box.right / scale + pad, box.bottom / scale + pad)
+                 if a.kind == "point" or max(a.bbox[2] - a.bbox[0], a.bbox[3] - a.bbox[1]) * scale >= self.MIN_PX]
+        labels = [(surf, r) for nx in (tx - 1, tx, tx + 1) for ny in (ty - 1, ty, ty + 1)
+                  for surf, r in self._place(nx, ny, scale) if r.colliderect(box)]
+        if not items and not labels:
+            return None
+        tile = pygame.Surface((T, T))
+        tile.fill(_KEY)
+        for a in items:
+            self._shape(tile, a, -box.x, -box.y, scale, False)
+        for surf, r in labels:
+            tile.blit(surf, r.move(-box.x, -box.y))
+        tile.set_colorkey(_KEY, pygame.RLEACCEL)  # mostly empty: RLE blits are cheap
+        return tile
+
+    @staticmethod
+    def _anchor(a, ox, oy, scale):
+        """Label anchor (x, y) of one item and the room for its label (None: any)."""
+        if a.kind == "area":
+            return (ox + (a.bbox[0] + a.bbox[2]) / 2 * scale, oy + (a.bbox[1] + a.bbox[3]) / 2 * scale,
+                    (a.bbox[2] - a.bbox[0]) * scale)
+        if a.kind == "route":
+            x, y = a.points[len(a.points) // 2]
+            return ox + x * scale, oy + y * scale, max(a.bbox[2] - a.bbox[0], a.bbox[3] - a.bbox[1]) * scale
+        x, y = a.points[0]
+        return ox + x * scale, oy + y * scale - 14, None
+
+    @classmethod
+    def _shape(cls, s, a, ox, oy, scale, hl, view=None):
+        """Draw one item; returns its label anchor like _anchor()."""
+        pts = [(ox + x * scale, oy + y * scale) for x, y in a.points]
+        if a.kind == "area":
+            if hl:
+                _fill(s, pts, a.color, view or s.get_rect())
+            pygame.draw.polygon(s, a.color, pts, 2 if hl else 1)
+        elif a.kind == "route":
+            pygame.draw.lines(s, a.color, False, pts, 3 if hl else 2)
+        else:
+            pygame.draw.circle(s, a.color, pts[0], 6 if hl else 4, 0 if hl else 2)
+        return cls._anchor(a, ox, oy, scale)
+
+def _fill(s, pts, color, view):
+    """Translucent polygon fill, through a surface no bigger than its on-screen part."""
+    xs = [p[0] for p in pts]
+    ys = [p[1] for p in pts]
+    r = pygame.Rect(int(min(xs)), int(min(ys)), int(max(xs) - min(xs)) + 1, int(max(ys) - min(ys)) + 1).clip(view)
+    if r.width <= 0 or r.height <= 0:
+        return
+    tmp = pygame.Surface(r.size, pygame.SRCALPHA)
+    pygame.draw.polygon(tmp, (*color, 60), [(x - r.x, y - r.y) for x, y in pts])
+    s.blit(tmp, r)
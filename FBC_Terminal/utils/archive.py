@@ -0,0 +1,130 @@
+import os, threading
+from ..settings import ARCHIVE_DIRS
+from .cache import file_signature
+from .search import TermIndex, tokenize, excerpt
+
+# Files of a dossier folder; the text sections are indexed, the image is only tracked.
+DOSSIER_TEXTS = ("dates.txt", "info.txt")
+DOSSIER_IMAGE = "image.png"
+
+def _read(path):
+    try:
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return f.read().strip()
+    except Exception:
+        return None
+
+class ArchiveIndex(TermIndex):
+    """
+    Every dossier of every archive category in one store (cache/archive/catalog.json):
+    category, code, section texts, text length and term -> {folder: [section, ...]}.
+    Keyed by folder; the signature is the stat of its files, so edits re-probe only
+    that dossier. Lists and detail pages read from here; scan() is the only pass that
+    touches the archive folders and runs on a worker.
+    """
+    KIND = "archive"
+    SNIPPET = 90
+    SAME_PART = False  # a query may span the code and both sections
+
+    def __init__(self, roots=None):
+        self.roots = dict(roots or ARCHIVE_DIRS)
+        self._by_root = {os.path.abspath(d): c for c, d in self.roots.items()}
+        self._lists = {}  # category -> (version, [(code, folder)])
+        self._scan_lock = threading.Lock()
+        self.scanned = False
+        super().__init__()
+
+    def signature(self, path):
+        return [file_signature(os.path.join(path, n)) for n in DOSSIER_TEXTS + (DOSSIER_IMAGE,)]
+
+    def probe(self, path):
+        code = os.path.basename(path)
+        texts, terms = {}, {}
+        for term in tokenize(code):  # codes are searchable too
+            terms[term] = [-1]
+        for i, name in enumerate(DOSSIER_TEXTS):
+            t = texts[name] = _read(os.path.join(path, name))
+            for term in set(tokenize(t or "")):
+                terms.setdefault(term, []).append(i)
+        return {
+            "category": self._by_root.get(os.path.dirname(os.path.abspath(path))),
+            "code":     code,
+            "texts":    texts,
+            "length":   sum(len(t or "") for t in texts.values()),
+            "image":    os.path.exists(os.path.join(path, DOSSIER_IMAGE)),
+            "terms":    terms,
+        }
+
+    def scan(self):
+        """List the category folders and refresh changed dossiers (worker thread)."""
+        if not self._scan_lock.acquire(blocking=False):
+            return  # a scan is already running
+        try:
+            folders = []
+            for root in self.roots.values():
+                if not os.path.isdir(root):
+                    continue
+                for n in sorted(os.listdir(root)):
+                    p = os.path.join(root, n)
+                    if os.path.isdir(p):
+                        folders.append(p)
+            self.refresh(folders)
+        finally:
+            self.scanned = True
+            self._scan_lock.release()
+
+    def dossiers(self, category):
+        """[(code, folder)] of one category, sorted by code; recomputed only on change."""
+        hit = self._lists.get(category)
+        if hit and hit[0] == self.version:
+            return hit[1]
+        with self._lock:
+            items = sorted((e.get("code") or os.path.basename(p), p)
+                           for p, e in self.entries.items() if e.get("category") == category)
+            self._lists[category] = (self.version, items)
+        return items
+
+    def texts(self, folder):
+        """(section texts, signature) from the index, or (None, None) if not indexed yet."""
+        e = self.entries.get(folder)
+        if not e or "texts" not in e:
+            return None, None
+        return e["texts"], e.get("sig")
+
+    def search(self, query, limit=200):
+        """
+        Dossiers containing every query term (in any of their sections or the code),
+        across all categories. Returns [{"path", "category", "code", "section"}];
+        section is the first matching index into DOSSIER_TEXTS, or -1 when only the
+        code matched.
+        """
+        with self._lock:
+            hits = self._match(query)
+            out = []
+            for path in sorted(hits, key=lambda p: (self.entries[p].get("category") or "",
+                                                    self.entries[p].get("code") or "")):
+                e = self.entries[path]
+                out.append({
+                    "path": path,
+                    "category": e.get("category"),
+                    "code": e.get("code"),
+                    "section": min((i for i in hits[path] if i >= 0), default=-1),
+                })
+                if len(out) >= limit:
+                    break
+            return out
+
+    def snippet(self, hit, query):
+        e = self.entries.get(hit["path"]) or {}
+        if hit["section"] < 0:
+            return ""
+        text = (e.get("texts") or {}).get(DOSSIER_TEXTS[hit["section"]]) or ""
+        return excerpt(" ".join(text.split()), query, self.SNIPPET)
+
+_archive_index = None
+
+def archive_index():
+    global _archive_index
+    if _archive_index is None:
+        _archive_index = ArchiveIndex()
+    return _archive_index
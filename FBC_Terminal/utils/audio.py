@@ -1,34 +1,12 @@
-import os, math, shutil, tempfile, subprocess
+import os, time, shutil, tempfile, threading, subprocess
+from concurrent.futures import ThreadPoolExecutor
 import pygame
+from .mixer import audio_engine
 
-def make_beep_sequence(beep_ms=150, pause_ms=150, count=3, freq=880, volume=0.3, rate=44100):
-    if not pygame.mixer.get_init():
-        pygame.mixer.init()
-    from array import array
-    samples = array("h")
-    n_beep  = int(rate * (beep_ms/1000.0))
-    n_pause = int(rate * (pause_ms/1000.0))
-    amp = int(32767 * volume)
-    for _ in range(count):
-        for i in range(n_beep):
-            t = i / rate
-            sample = int(amp * math.sin(2*math.pi*freq*t))
-            samples.append(sample)
-        for _ in range(n_pause):
-            samples.append(0)
-    return pygame.mixer.Sound(buffer=samples.tobytes())
-
-def make_beep(freq=880, ms=120, volume=0.22, rate=44100):
-    try:
-        if not pygame.mixer.get_init():
-            pygame.mixer.init()
-        n = int(rate * (ms/1000.0))
-        amp = int(32767 * volume)
-        from array import array
-        buf = array("h", (int(amp * math.sin(2*math.pi*freq*(i/rate))) for i in range(n)))
-        return pygame.mixer.Sound(buffer=buf.tobytes())
-    except Exception:
-        return None
+try:
+    import mutagen
+except Exception:
+    mutagen = None
 
 def get_ffmpeg_exe():
     try:
@@ -39,34 +17,372 @@ def get_ffmpeg_exe():
     exe = shutil.which("ffmpeg")
     return exe
 
-def transcode_to_temp_wav(src_path, rate=44100, ch=2):
-    exe = get_ffmpeg_exe()
-    if not exe or not os.path.exists(src_path):
-        return None
-    tmp = tempfile.NamedTemporaryFile(delete=False, suffix=".wav")
-    tmp_path = tmp.name
-    tmp.close()
-    cmd = [exe, "-y", "-i", src_path, "-vn", "-acodec", "pcm_s16le", "-ar", str(rate), "-ac", str(ch), tmp_path]
+# --------- ffmpeg job queue ---------
+class FfmpegJob:
+    """
+    One ffmpeg run on the shared queue. The render loop only polls done() / progress;
+    wait() is for worker threads. Every user calls release() once when done with it.
+    """
+    def __init__(self, key, args, out, duration=None, temp=False):
+        self.key = key
+        self.args = args
+        self.out = out
+        self.duration = duration  # media length, for progress; None -> progress stays 0
+        self.temp = temp          # out is ours: removed when the last user releases the job
+        self.progress = 0.0       # 0..1
+        self.state = "queued"     # queued / running / done / failed / cancelled
+        self._refs = 1
+        self._proc = None
+        self._lock = threading.Lock()
+        self._done = threading.Event()
+
+    @property
+    def result(self):
+        """Output path once finished successfully, else None."""
+        return self.out if self.state == "done" else None
+
+    def done(self):
+        return self._done.is_set()
+
+    def wait(self, timeout=None):
+        self._done.wait(timeout)
+        return self.result
+
+    def _acquire(self):
+        with self._lock:
+            if self.state in ("cancelled", "failed"):
+                return False
+            self._refs += 1
+            return True
+
+    def release(self):
+        """Drop one user; the last one cancels a queued/running job and deletes a temp output."""
+        with self._lock:
+            self._refs -= 1
+            if self._refs > 0:
+                return
+            finished = self._done.is_set()
+            if not finished:
+                self.state = "cancelled"
+            proc = self._proc
+        ffmpeg_queue()._forget(self)
+        if proc is not None:
+            try: proc.kill()
+            except Exception: pass
+        if finished and self.temp:
+            _remove(self.out)
+
+def _remove(path):
     try:
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return tmp_path if os.path.exists(tmp_path) and os.path.getsize(tmp_path) > 0 else None
+        if path and os.path.exists(path):
+            os.remove(path)
     except Exception:
-        try: os.remove(tmp_path)
-        except Exception: pass
+        pass
+
+class FfmpegQueue:
+    """
+    Bounded pool (one slot per core) for ffmpeg transcodes. Identical jobs share one
+    run while anybody still holds it; progress comes from ffmpeg's -progress output.
+    """
+    def __init__(self, workers=None):
+        self.workers = workers or max(1, os.cpu_count() or 1)
+        self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fbc-ffmpeg")
+        self._jobs = {}  # key -> live job
+        self._lock = threading.Lock()
+
+    def submit(self, key, args, out, duration=None, temp=False):
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job._acquire():
+                return job
+            job = self._jobs[key] = FfmpegJob(key, args, out, duration, temp)
+        self._pool.submit(self._run, job)
+        return job
+
+    def _forget(self, job):
+        with self._lock:
+            if self._jobs.get(job.key) is job:
+                del self._jobs[job.key]
+
+    def _run(self, job):
+        proc = None
+        with job._lock:
+            if job.state == "queued":
+                exe = get_ffmpeg_exe()
+                cmd = [exe, "-hide_banner", "-nostdin", "-loglevel", "error", "-nostats",
+                       "-progress", "pipe:1", "-y"] + job.args + [job.out]
+                try:
+                    proc = job._proc = subprocess.Popen(
+                        cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                        text=True, bufsize=1)
+                    job.state = "running"
+                except Exception:
+                    job.state = "failed"
+        ok = False
+        if proc is not None:
+            try:
+                for line in proc.stdout:
+                    k, _, v = line.strip().partition("=")
+                    if k in ("out_time_us", "out_time_ms") and job.duration:  # both are µs
+                        try: job.progress = min(1.0, int(v) / 1e6 / job.duration)
+                        except ValueError: pass
+                    elif k == "progress" and v == "end":
+                        job.progress = 1.0
+                ok = proc.wait() == 0 and os.path.exists(job.out) and os.path.getsize(job.out) > 0
+            except Exception:
+                ok = False
+        with job._lock:
+            job._proc = None
+            if job.state == "cancelled":
+                _remove(job.out)  # partial output
+            else:
+                job.state = "done" if ok else "failed"
+                if ok:
+                    job.progress = 1.0
+                else:
+                    _remove(job.out)
+            job._done.set()
+        if job.state != "done":
+            self._forget(job)
+
+    def shutdown(self):
+        """Kill running ffmpeg processes and drop the queue (app exit)."""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            self._jobs.clear()
+        for job in jobs:
+            with job._lock:
+                if not job._done.is_set():
+                    job.state = "cancelled"
+                proc = job._proc
+            if proc is not None:
+                try: proc.kill()
+                except Exception: pass
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+_ffmpeg_queue = None
+
+def ffmpeg_queue():
+    global _ffmpeg_queue
+    if _ffmpeg_queue is None:
+        _ffmpeg_queue = FfmpegQueue()
+    return _ffmpeg_queue
+
+def shutdown_ffmpeg():
+    global _ffmpeg_queue
+    if _ffmpeg_queue is not None:
+        _ffmpeg_queue.shutdown()
+        _ffmpeg_queue = None
+
+def wav_job(src_path, rate=44100, ch=2, duration=None):
+    """
+    Queued decode of any audio/video file to a temp PCM WAV (shared with identical
+    requests). None without ffmpeg. Poll job.done(); job.release() when finished with it.
+    """
+    if not get_ffmpeg_exe() or not os.path.exists(src_path):
         return None
+    key = ("wav", os.path.abspath(src_path), rate, ch)
+    base = os.path.splitext(os.path.basename(src_path))[0]
+    fd, tmp = tempfile.mkstemp(prefix=f"{base}_", suffix="_tmp_audio.wav")
+    os.close(fd)
+    job = ffmpeg_queue().submit(
+        key, ["-i", src_path, "-vn", "-acodec", "pcm_s16le", "-ar", str(rate), "-ac", str(ch)],
+        tmp, duration=duration or media_duration(src_path), temp=True)
+    if job.out != tmp:  # joined an existing job
+        _remove(tmp)
+    return job
 
 def find_sidecar_wav(video_path):
     base, _ = os.path.splitext(video_path)
     cand = base + ".wav"
     return cand if os.path.exists(cand) else None
 
-def extract_audio_to_wav(video_path, out_wav, ffmpeg_exe):
-    if not ffmpeg_exe:
-        return False
-    cmd = [ffmpeg_exe, "-y", "-i", video_path, "-vn", "-acodec", "pcm_s16le",
-           "-ar", "44100", "-ac", "2", out_wav]
+def media_duration(path):
+    """Length in seconds via mutagen (mp3/wav/ogg/...); None if unknown."""
+    if mutagen is None or not path:
+        return None
     try:
-        subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=True)
-        return os.path.exists(out_wav) and os.path.getsize(out_wav) > 0
+        f = mutagen.File(path)
+        length = f.info.length if f is not None else 0
+        return float(length) if length and length > 0 else None
     except Exception:
-        return False
+        return None
+
+class MusicClock:
+    """
+    pygame.mixer.music with a trustworthy media position.
+    get_pos() only counts from the last play() and ignores start=, so the clock
+    keeps the start offset itself and measures on time.monotonic(), minus pauses.
+    One instance is shared by every scene that streams through mixer.music.
+    """
+    def __init__(self):
+        self.path = None
+        self.duration = None
+        self.loaded = False
+        self._offset = 0.0   # media time at the last (re)start
+        self._t0 = None      # monotonic time of the last (re)start; None while stopped/paused
+        self._paused = False
+        self._stopped = True
+        self._queued = None  # (path, duration) handed to mixer.music.queue
+
+    # --- loading ---
+    def load(self, path, duration_from=None):
+        """Load into mixer.music; duration_from = original file when path is a temp transcode."""
+        self.stop()
+        try:
+            audio_engine().start()
+            pygame.mixer.music.load(path)
+        except Exception:
+            self.path, self.loaded = None, False
+            return False
+        self.path, self.loaded = path, True
+        self.duration = media_duration(duration_from or path)
+        self._offset = 0.0
+        return True
+
+    def queue(self, path, duration_from=None):
+        """
+        Gapless follow-up through mixer.music.queue. Needs the current duration so
+        poll() can tell when the mixer has switched over; False if it can't be queued.
+        """
+        if not self.loaded or not self.duration or self._stopped:
+            return False
+        try:
+            pygame.mixer.music.queue(path)
+        except Exception:
+            return False
+        self._queued = (path, media_duration(duration_from or path))
+        return True
+
+    def poll(self):
+        """Call once per frame: True when playback has rolled over into the queued track."""
+        if not self._queued or self._t0 is None:
+            return False
+        ended_at = self._t0 + (self.duration - self._offset)
+        if time.monotonic() < ended_at:
+            return False
+        self.path, self.duration = self._queued
+        self._queued = None
+        self._offset, self._t0 = 0.0, ended_at
+        return True
+
+    def unload(self):
+        self.stop()
+        try: pygame.mixer.music.unload()
+        except Exception: pass
+        self.path, self.loaded, self.duration = None, False, None
+
+    # --- transport ---
+    def play(self, start=0.0, paused=False):
+        """(Re)start at media time `start`; paused=True leaves it cued there."""
+        if not self.loaded:
+            return False
+        if self.duration:
+            start = min(start, self.duration)
+        start = max(0.0, start)
+        try:
+            if start > 0:
+                pygame.mixer.music.play(start=start)
+            else:
+                pygame.mixer.music.play()
+            if paused:
+                pygame.mixer.music.pause()
+        except Exception:
+            return False
+        self._offset = start
+        self._stopped = False
+        self._paused = paused
+        self._t0 = None if paused else time.monotonic()
+        return True
+
+    def seek(self, t):
+        """Jump to media time t, keeping the current paused state."""
+        return self.play(t, paused=self._paused)
+
+    def pause(self):
+        if self._stopped or self._paused:
+            return
+        self._offset = self.position
+        self._t0 = None
+        self._paused = True
+        try: pygame.mixer.music.pause()
+        except Exception: pass
+
+    def resume(self):
+        if self._stopped or not self._paused:
+            return
+        self._t0 = time.monotonic()
+        self._paused = False
+        try: pygame.mixer.music.unpause()
+        except Exception: pass
+
+    def toggle(self):
+        if self._stopped:
+            self.play(self._offset if not self.finished else 0.0)
+        elif self._paused:
+            self.resume()
+        else:
+            self.pause()
+
+    def stop(self):
+        if not self._stopped:
+            self._offset = self.position
+        self._stopped = True
+        self._queued = None  # pygame drops its queue on stop()
+        self._paused = False
+        self._t0 = None
+        try: pygame.mixer.music.stop()
+        except Exception: pass
+
+    def set_volume(self, v):
+        try: pygame.mixer.music.set_volume(v)
+        except Exception: pass
+
+    # --- state ---
+    @property
+    def paused(self):
+        return self._paused
+
+    @property
+    def stopped(self):
+        return self._stopped
+
+    @property
+    def playing(self):
+        """True while audio is actually advancing (not paused, stopped or finished)."""
+        if self._stopped or self._paused:
+            return False
+        try:
+            return pygame.mixer.music.get_busy()
+        except Exception:
+            return False
+
+    @property
+    def finished(self):
+        """Started, not paused/stopped by us, and the stream has run out."""
+        return self.loaded and not self._stopped and not self._paused and not self.playing
+
+    @property
+    def elapsed(self):
+        """Where the stream should be by the wall clock, even if it has stopped early."""
+        if self._t0 is None:
+            return self._offset
+        return self._offset + time.monotonic() - self._t0
+
+    @property
+    def position(self):
+        """Current media time in seconds (clamped to the duration when known)."""
+        pos = self.elapsed
+        if self._t0 is not None and self.finished and self.duration:
+            pos = self.duration
+        if self.duration:
+            pos = min(pos, self.duration)
+        return max(0.0, pos)
+
+_music_clock = None
+
+def music_clock():
+    global _music_clock
+    if _music_clock is None:
+        _music_clock = MusicClock()
+    return _music_clock
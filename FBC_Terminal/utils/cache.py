@@ -0,0 +1,43 @@
+import os, json, hashlib, threading
+from ..settings import CACHE_DIR
+
+def cache_dir(kind):
+    """CACHE_DIR/<kind>, created on demand."""
+    path = os.path.join(CACHE_DIR, kind)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def cache_file(kind, src_path, ext):
+    """Stable cache path for a source file: <stem>-<hash of abs path><ext>."""
+    stem = os.path.splitext(os.path.basename(src_path))[0]
+    key = hashlib.sha1(os.path.abspath(src_path).encode("utf-8", "replace")).hexdigest()[:12]
+    return os.path.join(cache_dir(kind), f"{stem}-{key}{ext}")
+
+def file_signature(path):
+    """[size, mtime_ns] — cheap change detection for cached derivatives."""
+    try:
+        st = os.stat(path)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+def load_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except Exception:
+        return default
+
+def save_json(path, data):
+    """Atomic write (tmp + replace) so a crash never leaves half a file."""
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        text = json.dumps(data, separators=(",", ":"))  # C encoder; json.dump streams in Python
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+        return True
+    except Exception:
+        try: os.remove(tmp)
+        except Exception: pass
+        return False
@@ -0,0 +1,205 @@
+import os, time, threading, subprocess
+import pygame
+from .cache import cache_dir, cache_file, file_signature, load_json, save_json
+from .workers import submit
+from .audio import get_ffmpeg_exe, mutagen
+from .video import probe_video, cv2
+
+class FileCatalog:
+    """
+    Per-file metadata probed once in the background and persisted to
+    cache/<KIND>/catalog.json, keyed by file size + mtime. Subclasses implement probe().
+    """
+    KIND = None
+    VERSION = 1
+    FLUSH_SEC = 5.0  # while a pass is running, rewrite the file at most this often
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()
+        self._snap = self._written = 0  # snapshot counters: never let an older save land last
+        self.path = os.path.join(cache_dir(self.KIND), "catalog.json")
+        data = load_json(self.path, {}) or {}
+        self.entries = data.get("items", {}) if data.get("v") == self.VERSION else {}
+        self._pending = set()
+        self._done = 0
+        self._flushed = time.monotonic()
+        self.version = 0  # bumped on every change; lets views re-sort only when needed
+
+    def probe(self, path):
+        """Metadata dict for one file (subclasses); None marks it unreadable."""
+        return None
+
+    def signature(self, path):
+        """Change stamp stored with each entry; re-probe when it differs."""
+        return file_signature(path)
+
+    def _changed(self, path, old, new):
+        """Hook for derived indexes; called under the lock. new is None when a file is dropped."""
+
+    def refresh(self, files):
+        """Queue probes for new/changed files and forget files that are gone."""
+        keep = set(files)
+        with self._lock:
+            for p in [p for p in self.entries if p not in keep]:
+                self._changed(p, self.entries.pop(p), None)
+                self.version += 1
+        todo = []
+        for p in files:
+            sig = self.signature(p)
+            e = self.entries.get(p)
+            if (e and e.get("sig") == sig) or p in self._pending:
+                continue
+            todo.append((p, sig))
+        # mark the whole batch first so an early finisher doesn't see an empty queue and flush
+        with self._lock:
+            self._pending.update(p for p, _ in todo)
+        for p, sig in todo:
+            submit(self._work, p, sig)
+
+    def _work(self, path, sig):
+        try:
+            info = self.probe(path) or {"error": True}
+        except Exception:
+            info = {"error": True}
+        info["sig"] = sig
+        with self._lock:
+            self._changed(path, self.entries.get(path), info)
+            self.entries[path] = info
+            self._pending.discard(path)
+            self._done += 1
+            self.version += 1
+            flush = not self._pending or time.monotonic() - self._flushed > self.FLUSH_SEC
+            if flush:
+                self._flushed = time.monotonic()
+        if flush:
+            self.save()
+
+    def get(self, path):
+        return self.entries.get(path)
+
+    @property
+    def pending(self):
+        return len(self._pending)
+
+    def save(self):
+        with self._lock:
+            data = {"v": self.VERSION, "items": dict(self.entries)}
+            self._snap += 1
+            snap = self._snap
+        with self._save_lock:
+            if snap > self._written:
+                save_json(self.path, data)
+                self._written = snap
+
+# --------- videos ---------
+POSTER_AT    = 0.04      # fraction into the video
+POSTER_WIDTH = 128
+
+def extract_poster(path, at_sec, out_path, width=POSTER_WIDTH):
+    """Write a small JPEG frame at at_sec; ffmpeg first, OpenCV fallback."""
+    exe = get_ffmpeg_exe()
+    if exe:
+        cmd = [exe, "-hide_banner", "-loglevel", "error", "-nostdin", "-y",
+               "-ss", f"{at_sec:.3f}", "-i", path, "-frames:v", "1",
+               "-vf", f"scale={width}:-2:flags=area", "-q:v", "4", out_path]
+        try:
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                           check=True, timeout=30)
+            if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
+                return True
+        except Exception:
+            pass
+    if cv2 is not None:
+        cap = cv2.VideoCapture(path)
+        try:
+            cap.set(cv2.CAP_PROP_POS_MSEC, at_sec * 1000.0)
+            ok, frame = cap.read()
+            if ok:
+                h, w = frame.shape[:2]
+                frame = cv2.resize(frame, (width, max(1, int(h * width / w))),
+                                   interpolation=cv2.INTER_AREA)
+                return bool(cv2.imwrite(out_path, frame))
+        finally:
+            cap.release()
+    return False
+
+class VideoCatalog(FileCatalog):
+    """Duration, resolution, fps, codec, audio presence and a poster frame per video."""
+    KIND = "videos"
+
+    def __init__(self):
+        super().__init__()
+        self._posters = {}  # (path, sig) -> Surface (main thread only)
+
+    def probe(self, path):
+        info = probe_video(path)
+        if not info:
+            return None
+        poster = cache_file("posters", path, ".jpg")
+        at = (info.get("duration") or 0) * POSTER_AT
+        info["poster"] = poster if extract_poster(path, at, poster) else None
+        return info
+
+    def poster(self, path):
+        """Decoded poster Surface, loaded lazily for visible rows."""
+        e = self.entries.get(path)
+        if not e or not e.get("sig"):
+            return None
+        key = (path, tuple(e["sig"]))
+        if key in self._posters:
+            return self._posters[key]
+        surf = None
+        if e.get("poster"):
+            try:
+                surf = pygame.image.load(e["poster"]).convert()
+            except Exception:
+                surf = None
+        self._posters[key] = surf
+        return surf
+
+_video_catalog = None
+
+def video_catalog():
+    global _video_catalog
+    if _video_catalog is None:
+        _video_catalog = VideoCatalog()
+    return _video_catalog
+
+# --------- audio logs ---------
+_TAGS = ("title", "artist", "album", "date", "genre")
+
+class AudioCatalog(FileCatalog):
+    """Duration, bitrate, format and ID3 tags per audio log (mutagen)."""
+    KIND = "audios"
+
+    def probe(self, path):
+        if mutagen is None:
+            return None
+        f = mutagen.File(path, easy=True)
+        if f is None:
+            return None
+        info = f.info
+        out = {
+            "duration":    float(getattr(info, "length", 0) or 0),
+            "bitrate":     int((getattr(info, "bitrate", 0) or 0) // 1000),  # kbps
+            "sample_rate": int(getattr(info, "sample_rate", 0) or 0),
+            "channels":    int(getattr(info, "channels", 0) or 0),
+            "mtime":       os.path.getmtime(path),
+        }
+        tags = f.tags or {}
+        for k in _TAGS:
+            try:
+                v = tags.get(k)
+                out[k] = str(v[0]).strip() if v else ""
+            except Exception:
+                out[k] = ""
+        return out
+
+_audio_catalog = None
+
+def audio_catalog():
+    global _audio_catalog
+    if _audio_catalog is None:
+        _audio_catalog = AudioCatalog()
+    return _audio_catalog
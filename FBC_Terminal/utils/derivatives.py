@@ -0,0 +1,109 @@
+import os, hashlib
+import pygame
+from ..settings import IMAGE_VARIANTS
+from .cache import cache_dir, file_signature, load_json, save_json
+from .workers import submit_process
+from .gfx import scalable
+
+def source_key(path):
+    """Hash of the source's path + size + mtime: an edited image gets new derivatives."""
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    ident = f"{os.path.abspath(path)}|{sig[0]}|{sig[1]}"
+    return hashlib.sha1(ident.encode("utf-8", "replace")).hexdigest()[:16]
+
+def _variant_path(key, name):
+    return os.path.join(cache_dir("images"), f"{key}-{name}.png")
+
+def _meta_path(key):
+    return os.path.join(cache_dir("images"), f"{key}.json")
+
+def build_variants(src, key):
+    """
+    Process-pool worker: decode src once and write every IMAGE_VARIANTS size, largest
+    first so each one shrinks the previous. No display here (no convert()).
+    """
+    img = scalable(pygame.image.load(src))
+    src_size = img.get_size()
+    for name, (mw, mh) in sorted(IMAGE_VARIANTS.items(), key=lambda kv: -kv[1][0] * kv[1][1]):
+        w, h = img.get_size()
+        scale = min(mw / w, mh / h, 1.0)
+        if scale < 1.0:
+            img = pygame.transform.smoothscale(img, (max(1, int(w * scale)), max(1, int(h * scale))))
+        out = _variant_path(key, name)
+        tmp = f"{out}.{os.getpid()}.tmp.png"  # extension picks the encoder
+        pygame.image.save(img, tmp)
+        os.replace(tmp, out)
+    save_json(_meta_path(key), {"size": list(src_size)})  # written last: marks the set complete
+    return src_size
+
+class ImageDerivatives:
+    """
+    Display-size copies of big images (cache/images/<hash>-<variant>.png), built once
+    in the process pool. load() picks the smallest variant that covers the target box;
+    until the set exists (or when the box is bigger than every variant) it decodes
+    the source like before and queues the build.
+    """
+
+    def __init__(self):
+        self._jobs = {}  # key -> Future
+
+    def info(self, src):
+        """{"size": [w, h]} of the source once its variants exist, else None."""
+        key = source_key(src)
+        return load_json(_meta_path(key)) if key else None
+
+    def request(self, src):
+        """Queue the build unless done or running; returns the Future (None when built)."""
+        key = source_key(src)
+        if key is None or os.path.exists(_meta_path(key)):
+            return None
+        job = self._jobs.get(key)
+        if job is None:  # a failed build stays failed: load() keeps using the source
+            job = self._jobs[key] = submit_process(build_variants, src, key)
+        return job
+
+    def pick(self, src, box=None):
+        """Path of the smallest built variant covering box (w, h), the largest for None."""
+        key = source_key(src)
+        if key is None or not os.path.exists(_meta_path(key)):
+            return None
+        variants = list(IMAGE_VARIANTS.items())
+        for name, (mw, mh) in variants:
+            if box is not None and mw >= box[0] and mh >= box[1]:
+                break
+        else:
+            # nothing covers box: the largest still does if it holds the source unscaled
+            name, (mw, mh) = variants[-1]
+            size = (load_json(_meta_path(key)) or {}).get("size")
+            if box is not None and not (size and size[0] <= mw and size[1] <= mh):
+                return None
+        path = _variant_path(key, name)
+        return path if os.path.exists(path) else None
+
+    def load(self, src, box=None, alpha=False):
+        """Surface for drawing src inside box; never blocks on the pool. None if unreadable."""
+        path = self.pick(src, box)
+        if path is None:
+            self.request(src)
+            path = src
+        try:
+            img = pygame.image.load(path)
+            return img.convert_alpha() if alpha else img.convert()
+        except Exception:
+            if path != src:
+                try:
+                    img = pygame.image.load(src)
+                    return img.convert_alpha() if alpha else img.convert()
+                except Exception:
+                    pass
+            return None
+
+_derivatives = None
+
+def derivatives():
+    global _derivatives
+    if _derivatives is None:
+        _derivatives = ImageDerivatives()
+    return _derivatives
@@ -18,20 +18,40 @@ def list_videos():
         if p not in out: out.append(p)
     return out
 
+_audio_listing = (None, [])  # (folder mtime_ns, pairs)
+
 def list_audio_logs():
-    if not os.path.isdir(AUDIOS_DIR):
+    """
+    [(base, mp3_path, transcript_path)] for every mp3 with a transcript sidecar
+    (.srt / .vtt preferred over .txt), alphabetical. One scandir, reused until
+    the folder's mtime changes (files added, removed or renamed).
+    """
+    global _audio_listing
+    try:
+        mtime = os.stat(AUDIOS_DIR).st_mtime_ns
+    except OSError:
         return []
-    mp3s = {}
-    for p in glob.glob(os.path.join(AUDIOS_DIR, "*.mp3")) + glob.glob(os.path.join(AUDIOS_DIR, "*.MP3")):
-        base = os.path.splitext(os.path.basename(p))[0]
-        mp3s[base] = p
+    if _audio_listing[0] == mtime:
+        return list(_audio_listing[1])
+
+    names = {}
+    with os.scandir(AUDIOS_DIR) as it:
+        for de in it:
+            if de.is_file():
+                names[de.name.lower()] = de.path
     out = []
-    for p in glob.glob(os.path.join(AUDIOS_DIR, "*.txt")) + glob.glob(os.path.join(AUDIOS_DIR, "*.TXT")):
-        base = os.path.splitext(os.path.basename(p))[0]
-        if base in mp3s:
-            out.append((base, mp3s[base], p))
-    out.sort()
-    return out
+    for low, path in names.items():
+        if not low.endswith(".mp3"):
+            continue
+        stem = low[:-4]
+        for ext in (".srt", ".vtt", ".txt"):
+            if stem + ext in names:
+                base = os.path.splitext(os.path.basename(path))[0]
+                out.append((base, path, names[stem + ext]))
+                break
+    out.sort(key=lambda x: x[0].lower())
+    _audio_listing = (mtime, out)
+    return list(out)
 
 def list_altered_items():
     """Return list of dicts: {code, dates, info, image}"""
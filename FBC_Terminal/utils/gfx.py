@@ -1,8 +1,17 @@
 import pygame, math
+from collections import OrderedDict
 from ..settings import FG, ACCENT, BORDER
 
+_fonts = {}  # (size, bold) -> Font; SysFont looks the face up on disk every call
+
+def mono_font(size, bold=False):
+    f = _fonts.get((size, bold))
+    if f is None:
+        f = _fonts[(size, bold)] = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", size, bold=bold)
+    return f
+
 def draw_text(surface, text, size, color, *, center=None, topleft=None, bold=False):
-    font = pygame.font.SysFont("consolas,menlo,dejavusansmono,monospace", size, bold=bold)
+    font = mono_font(size, bold)
     surf = font.render(text, True, color)
     rect = surf.get_rect()
     if center:  rect.center = center
@@ -10,6 +19,59 @@ def draw_text(surface, text, size, color, *, center=None, topleft=None, bold=Fal
     surface.blit(surf, rect)
     return rect
 
+# ---------- decals: rotated text + drop shadow, rendered once ----------
+DECAL_CACHE = 64
+_decals = OrderedDict()  # (text, size, color, angle, shadow, offset, bold) -> (Surface, face size)
+
+def decal(text, size, color, angle=0, *, shadow=(0, 0, 0), offset=(2, 2), bold=True):
+    """
+    Stamp-style text as one surface: face and shadow rotated separately (the shadow
+    offset stays in screen space) and composited. Cached by every parameter, so
+    callers can ask for it each frame. Returns (surface, rotated face size).
+    """
+    key = (text, size, tuple(color), angle, tuple(shadow) if shadow else None, tuple(offset), bold)
+    hit = _decals.get(key)
+    if hit is not None:
+        _decals.move_to_end(key)
+        return hit
+    font = mono_font(size, bold)
+    face = font.render(text, True, color)
+    if angle:
+        face = pygame.transform.rotate(face, angle)
+    fw, fh = face.get_size()
+    if shadow:
+        ox, oy = offset
+        sh = font.render(text, True, shadow)
+        if angle:
+            sh = pygame.transform.rotate(sh, angle)
+        surf = pygame.Surface((fw + abs(ox), fh + abs(oy)), pygame.SRCALPHA)
+        surf.blit(sh, (max(0, ox), max(0, oy)))
+        surf.blit(face, (max(0, -ox), max(0, -oy)))
+    else:
+        surf = face
+    if pygame.display.get_surface() is not None:
+        surf = surf.convert_alpha()
+    hit = _decals[key] = (surf, (fw, fh))
+    if len(_decals) > DECAL_CACHE:
+        _decals.popitem(last=False)
+    return hit
+
+def draw_decal(surface, text, size, color, angle=0, *, center, shadow=(0, 0, 0), offset=(2, 2), bold=True):
+    """Blit a cached decal with its face centred on center; returns the blitted rect."""
+    surf, (fw, fh) = decal(text, size, color, angle, shadow=shadow, offset=offset, bold=bold)
+    ox, oy = offset if shadow else (0, 0)
+    x = center[0] - fw // 2 - max(0, -ox)
+    y = center[1] - fh // 2 - max(0, -oy)
+    return surface.blit(surf, (x, y))
+
+def scalable(surf):
+    """surf as 24/32 bit (smoothscale rejects paletted images); needs no display."""
+    if surf.get_bitsize() in (24, 32):
+        return surf
+    out = pygame.Surface(surf.get_size(), pygame.SRCALPHA, 32)
+    out.blit(surf, (0, 0))
+    return out
+
 def tint_green(surf: pygame.Surface, gain: float = 1.1) -> pygame.Surface:
     out = surf.convert_alpha()
     gray = pygame.Surface(out.get_size()).convert_alpha()
@@ -0,0 +1,193 @@
+import time
+import pygame
+from ..settings import (
+    AUDIO_PROFILE, AUDIO_PROFILES, AUDIO_CHANNELS, AUDIO_FREE_CHANNELS, AUDIO_DUCK, AUDIO_DUCK_FADE,
+    AUDIO_STALL_MS,
+)
+
+# Channel classes, highest priority first. A class that runs out of channels may
+# borrow an idle one from a lower class; otherwise it restarts its own oldest one.
+CLASSES = ("ui", "music", "ambience")
+
+class AudioEngine:
+    """
+    Owns the mixer: one init with a latency/throughput profile, reserved channel
+    ranges per class (so nothing else can grab them), music ducking under voice and
+    counters for starvation and playback hiccups.
+    voice = mixer.music streams (audio logs, hotline messages, video soundtrack);
+    music = looping songs (Ahti); ambience = ring tones etc. Channels above the
+    classes stay unreserved for plain Sound.play().
+    """
+
+    def __init__(self):
+        self.profile = None
+        self.ready = False
+        self._ranges = {}   # class -> [Channel]
+        # keyed by id() of our own Channel objects (pygame makes a new one per lookup)
+        self._owner = {}    # -> class whose range it belongs to
+        self._user = {}     # -> class currently playing on it (differs when borrowed)
+        self._base = {}     # -> volume before ducking
+        self._started = {}  # -> monotonic start, for oldest-first stealing
+        self._duck = 1.0
+        self.stats = {"starved": 0, "stolen": 0, "borrowed": 0, "stalls": 0, "dropouts": 0}
+        self._was_streaming = False
+
+    # --- setup ---
+    def configure(self, profile=None):
+        """Call before pygame.init() so its mixer init already uses the profile."""
+        self.profile = profile or AUDIO_PROFILE
+        p = AUDIO_PROFILES.get(self.profile) or AUDIO_PROFILES["latency"]
+        try: pygame.mixer.pre_init(p["frequency"], p["size"], p["channels"], p["buffer"])
+        except Exception: pass
+
+    def start(self):
+        """Make sure the mixer is open and the channel classes are laid out. Idempotent."""
+        if self.ready and pygame.mixer.get_init():
+            return True
+        if self.profile is None:
+            self.configure()
+        try:
+            if not pygame.mixer.get_init():
+                p = AUDIO_PROFILES.get(self.profile) or AUDIO_PROFILES["latency"]
+                pygame.mixer.init(p["frequency"], p["size"], p["channels"], p["buffer"])
+        except Exception:
+            self.ready = False
+            return False
+        total = sum(AUDIO_CHANNELS.get(c, 0) for c in CLASSES)
+        try:
+            pygame.mixer.set_num_channels(total + AUDIO_FREE_CHANNELS)
+            pygame.mixer.set_reserved(total)  # no implicit Sound.play() / find_channel() on our ranges
+        except Exception:
+            pass
+        self._ranges, self._owner = {}, {}
+        i = 0
+        for c in CLASSES:
+            chans = []
+            for _ in range(AUDIO_CHANNELS.get(c, 0)):
+                ch = pygame.mixer.Channel(i)
+                chans.append(ch)
+                self._owner[id(ch)] = c
+                i += 1
+            self._ranges[c] = chans
+        self.ready = True
+        return True
+
+    @property
+    def buffer_ms(self):
+        p = AUDIO_PROFILES.get(self.profile) or {}
+        return 1000.0 * p.get("buffer", 0) / max(1, p.get("frequency", 44100))
+
+    # --- playback ---
+    def _free(self, cls):
+        for ch in self._ranges.get(cls, ()):
+            if not ch.get_busy():
+                return ch
+        return None
+
+    def channel(self, cls):
+        """An idle channel for cls: own range, then an idle lower class, else own oldest."""
+        if not self.start():
+            return None
+        ch = self._free(cls)
+        if ch is not None:
+            return ch
+        self.stats["starved"] += 1
+        if cls in CLASSES:
+            for lower in CLASSES[CLASSES.index(cls) + 1:]:
+                ch = self._free(lower)
+                if ch is not None:
+                    self.stats["borrowed"] += 1
+                    return ch
+        own = self._ranges.get(cls) or []
+        if not own:
+            return None
+        self.stats["stolen"] += 1
+        return min(own, key=lambda c: self._started.get(id(c), 0.0))
+
+    def play(self, cls, sound, loops=0, volume=1.0, fade_ms=0):
+        """Play sound in a channel of class cls; returns the Channel (or None)."""
+        if sound is None:
+            return None
+        ch = self.channel(cls)
+        if ch is None:
+            return None
+        cid = id(ch)
+        self._user[cid] = cls
+        self._base[cid] = volume
+        self._started[cid] = time.monotonic()
+        try:
+            ch.set_volume(volume * (self._duck if cls == "music" else 1.0))
+            ch.play(sound, loops=loops, fade_ms=fade_ms)
+        except Exception:
+            return None
+        return ch
+
+    def set_volume(self, ch, volume):
+        """Change a playing channel's volume; ducking is applied on top."""
+        if ch is None:
+            return
+        cid = id(ch)
+        self._base[cid] = volume
+        try: ch.set_volume(volume * (self._duck if self._user.get(cid) == "music" else 1.0))
+        except Exception: pass
+
+    def stop(self, cls=None):
+        for c in ([cls] if cls else CLASSES):
+            for ch in self._ranges.get(c, ()):
+                try: ch.stop()
+                except Exception: pass
+
+    def _channels(self):
+        for c in CLASSES:
+            yield from self._ranges.get(c, ())
+
+    # --- per frame ---
+    def _voice_active(self):
+        try:
+            return bool(pygame.mixer.music.get_busy())
+        except Exception:
+            return False
+
+    def update(self, dt):
+        """Ducking ramp + health counters. Returns a message for a new problem, else None."""
+        if not self.ready:
+            return None
+        voice = self._voice_active()
+        target = AUDIO_DUCK if voice else 1.0
+        if self._duck != target:
+            step = dt / max(1e-3, AUDIO_DUCK_FADE) * (1.0 - AUDIO_DUCK)
+            self._duck = min(target, self._duck + step) if self._duck < target else max(target, self._duck - step)
+            for ch in self._channels():
+                if self._user.get(id(ch)) == "music" and ch.get_busy():
+                    try: ch.set_volume(self._base.get(id(ch), 1.0) * self._duck)
+                    except Exception: pass
+
+        msg = None
+        # a frame this long starves our own feeding (queue hand-off, A/V nudges, clock polls)
+        if voice and dt * 1000.0 > max(AUDIO_STALL_MS, 2 * self.buffer_ms):
+            self.stats["stalls"] += 1
+            msg = f"Audio: main loop stalled {dt * 1000:.0f} ms"
+        # the stream stopped by itself well before its end: decoder/device underrun
+        from .audio import music_clock
+        clock = music_clock()
+        streaming = clock.loaded and not clock.paused and not clock.stopped
+        if self._was_streaming and streaming and not voice and clock.duration \
+                and clock.elapsed < clock.duration - 1.0:
+            self.stats["dropouts"] += 1
+            msg = f"Audio: stream dropped out at {clock.elapsed:.1f}s"
+        self._was_streaming = streaming and voice
+        return msg
+
+    def report(self):
+        s = self.stats
+        return (f"audio[{self.profile}, {self.buffer_ms:.0f} ms buffer] starved {s['starved']} "
+                f"(borrowed {s['borrowed']}, stolen {s['stolen']}), stalls {s['stalls']}, "
+                f"dropouts {s['dropouts']}")
+
+_engine = None
+
+def audio_engine():
+    global _engine
+    if _engine is None:
+        _engine = AudioEngine()
+    return _engine
@@ -0,0 +1,45 @@
+import random
+
+class Playlist:
+    """Play order over a list of entries (videos, audio logs); loop and shuffle can change mid-play."""
+    def __init__(self, files, start=0, loop=True, shuffle=False):
+        self.files = list(files)
+        self.loop = loop
+        self.shuffle = shuffle
+        self.order = list(range(len(self.files)))
+        self.pos = start
+        if shuffle:
+            self._reorder()
+
+    def _reorder(self):
+        cur = self.order[self.pos]
+        if self.shuffle:
+            rest = [i for i in range(len(self.files)) if i != cur]
+            random.shuffle(rest)
+            self.order, self.pos = [cur] + rest, 0
+        else:
+            self.order, self.pos = list(range(len(self.files))), cur
+
+    def set_shuffle(self, on):
+        self.shuffle = on
+        self._reorder()
+
+    @property
+    def current(self):
+        return self.files[self.order[self.pos]]
+
+    def _next_pos(self):
+        if self.pos + 1 < len(self.order):
+            return self.pos + 1
+        return 0 if self.loop and self.order else None
+
+    def peek_next(self):
+        p = self._next_pos()
+        return self.files[self.order[p]] if p is not None else None
+
+    def advance(self):
+        p = self._next_pos()
+        if p is None:
+            return None
+        self.pos = p
+        return self.current
@@ -0,0 +1,128 @@
+import pygame
+from collections import OrderedDict
+from .gfx import scalable
+from .workers import submit
+
+class MipPyramid:
+    """
+    Halving levels of one image, level 0 = full resolution, built on a worker after
+    the viewer opens. A zoom scales from the nearest larger level, so a step never
+    touches more than ~4x the pixels it produces, whatever the source size.
+    Levels are made off the main thread and are never convert()ed (see workers.py).
+    """
+    MIN_SIDE = 256   # stop halving once the longer side is this small
+
+    def __init__(self, source):
+        """source: image path, or a Surface already at full resolution."""
+        self.levels = []
+        self.error = None
+        self._job = submit(self._build, source)
+
+    def _build(self, source):
+        try:
+            img = scalable(pygame.image.load(source) if isinstance(source, str) else source)
+            levels = [img]
+            while max(img.get_size()) >= 2 * self.MIN_SIDE:
+                w, h = img.get_size()
+                img = pygame.transform.smoothscale(img, (max(1, w // 2), max(1, h // 2)))
+                levels.append(img)
+            self.levels = levels  # published whole: readers see none or all
+        except Exception as e:
+            self.error = e
+
+    @property
+    def ready(self):
+        return bool(self.levels)
+
+    @property
+    def size(self):
+        return self.levels[0].get_size() if self.levels else None
+
+    def level_for(self, w, h):
+        """Smallest level at least w x h; level 0 when zoomed in past full resolution."""
+        for lv in reversed(self.levels):
+            if lv.get_width() >= w and lv.get_height() >= h:
+                return lv
+        return self.levels[0]
+
+class TileRenderer:
+    """
+    Draws a big image at any zoom by scaling only the tiles of one level that meet
+    the view. Tiles are subsurfaces of the level; scaled tiles are cached per zoom,
+    shown nearest-neighbour first and swapped for a smoothscaled one from a worker
+    (which scales a copy of the tile, never the shared level). Nothing ever allocates a surface the size of the zoomed image.
+    """
+    TILE  = 512   # tile edge in level pixels (smaller when magnifying, so scaled tiles stay ~TILE)
+    CACHE = 192   # scaled tiles kept (LRU)
+
+    def __init__(self):
+        self._tiles = OrderedDict()  # (level id, tile size, tx, ty, f) -> [Surface, exact]
+        self._jobs = {}              # same key -> Future
+        self._f = None
+
+    @staticmethod
+    def pick(levels, src_w, scale):
+        """(level, f): the nearest level at or above the zoom; f = screen px per level px."""
+        best = levels[0]
+        for lv in levels:
+            if scale * src_w / lv.get_width() <= 1.0:
+                best = lv
+        return best, scale * src_w / best.get_width()
+
+    def _poll(self):
+        for key, job in list(self._jobs.items()):
+            if job.done():
+                del self._jobs[key]
+                try: surf = job.result()
+                except Exception: surf = None
+                if surf is not None and key in self._tiles:
+                    self._tiles[key] = [surf, True]
+
+    def draw(self, s, levels, src_w, scale, origin, view=None):
+        """Blit the tiles visible in view (default: all of s); origin = image top-left on s."""
+        level, f = self.pick(levels, src_w, scale)
+        if f != self._f:  # new zoom: queued smoothscales for the old one are useless
+            for key in [k for k in self._jobs if k[4] != f]:
+                self._jobs.pop(key).cancel()
+            self._f = f
+        self._poll()
+        view = view or s.get_rect()
+        lw, lh = level.get_size()
+        ts = self.TILE if f <= 1.0 else max(8, int(self.TILE / f))
+        ox, oy = origin
+        tx0 = max(0, int((view.left - ox) / f) // ts)
+        ty0 = max(0, int((view.top - oy) / f) // ts)
+        tx1 = min((lw - 1) // ts, int((view.right - ox) / f) // ts)
+        ty1 = min((lh - 1) // ts, int((view.bottom - oy) / f) // ts)
+        lid = id(level)
+        for ty in range(ty0, ty1 + 1):
+            for tx in range(tx0, tx1 + 1):
+                r = pygame.Rect(tx * ts, ty * ts, min(ts, lw - tx * ts), min(ts, lh - ty * ts))
+                # edges rounded from level coordinates: tile sizes don't change while panning
+                x0, x1 = round(r.left * f), round(r.right * f)
+                y0, y1 = round(r.top * f), round(r.bottom * f)
+                if x1 <= x0 or y1 <= y0:
+                    continue
+                key = (lid, ts, tx, ty, f)
+                hit = self._tiles.get(key)
+                if hit is None:
+                    sub = level.subsurface(r)
+                    hit = self._tiles[key] = [pygame.transform.scale(sub, (x1 - x0, y1 - y0)), False]
+                    # the worker gets its own pixels: the main thread keeps locking and blitting
+                    # from this level, and surfaces are not safe to share across threads
+                    self._jobs[key] = submit(pygame.transform.smoothscale, sub.copy(), (x1 - x0, y1 - y0))
+                    if len(self._tiles) > self.CACHE:
+                        old, _ = self._tiles.popitem(last=False)
+                        job = self._jobs.pop(old, None)
+                        if job is not None:
+                            job.cancel()
+                else:
+                    self._tiles.move_to_end(key)
+                s.blit(hit[0], (ox + x0, oy + y0))
+
+    def clear(self):
+        for job in self._jobs.values():
+            job.cancel()
+        self._jobs.clear()
+        self._tiles.clear()
+        self._f = None
@@ -0,0 +1,189 @@
+import re, threading, unicodedata
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from .catalog import FileCatalog
+from .transcript import load_transcript
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def normalize(text):
+    """Lowercase, accents stripped: "Hédron" -> "hedron"."""
+    text = unicodedata.normalize("NFKD", text.lower())
+    return "".join(ch for ch in text if not unicodedata.combining(ch))
+
+def tokenize(text):
+    return _WORD.findall(normalize(text))
+
+def _folded(text):
+    """normalize(text) and, per folded char, its index in text (folding may change the length)."""
+    out, pos = [], []
+    for i, ch in enumerate(text):
+        f = normalize(ch)
+        out.append(f)
+        pos.extend([i] * len(f))
+    return "".join(out), pos
+
+def excerpt(text, query, width):
+    """About width chars of text around the first query term, with … where cut."""
+    low, pos = _folded(text)
+    hits = [k for k in (low.find(t) for t in tokenize(query)) if k >= 0]
+    at = pos[min(hits)] if hits else 0
+    start = max(0, at - width // 3)
+    snip = text[start:start + width]
+    return ("…" if start > 0 else "") + snip + ("…" if start + width < len(text) else "")
+
+class TermIndex(FileCatalog):
+    """
+    FileCatalog whose entries carry "terms": {term: [part, ...]} (a part is whatever the
+    subclass splits a file into). Merged in memory into term -> {path: [part, ...]} and
+    kept up to date incrementally as entries change.
+    """
+    SAME_PART = True  # all query terms in one part; False: anywhere in the file
+
+    def __init__(self):
+        super().__init__()
+        self.postings = {}
+        self._terms = None  # sorted term list for prefix lookups: built once, then kept in order
+        for path, e in self.entries.items():
+            self._changed(path, None, e)
+
+    def _changed(self, path, old, new):
+        if old and old.get("terms"):
+            for t in old["terms"]:
+                docs = self.postings.get(t)
+                if docs is not None:
+                    docs.pop(path, None)
+                    if not docs:
+                        del self.postings[t]
+                        if self._terms is not None:
+                            del self._terms[bisect_left(self._terms, t)]
+        if new and new.get("terms"):
+            for t, parts in new["terms"].items():
+                docs = self.postings.get(t)
+                if docs is None:
+                    docs = self.postings[t] = {}
+                    if self._terms is not None:
+                        insort(self._terms, t)
+                docs[path] = parts
+
+    def _lookup(self, term, prefix):
+        """{path: set(parts)} for one term; prefix=True also matches longer terms."""
+        if not prefix:
+            return {p: set(v) for p, v in self.postings.get(term, {}).items()}
+        if self._terms is None:
+            self._terms = sorted(self.postings)
+        out = {}
+        i = bisect_left(self._terms, term)
+        while i < len(self._terms) and self._terms[i].startswith(term):
+            for p, v in self.postings[self._terms[i]].items():
+                out.setdefault(p, set()).update(v)
+            i += 1
+        return out
+
+    def _match(self, query):
+        """
+        {path: set(parts)} containing every query term, the last one as a prefix
+        (type-ahead). With SAME_PART the parts are those holding all terms, else
+        every part that holds any of them. Call with the lock held.
+        """
+        terms = tokenize(query)
+        hits = None
+        for n, t in enumerate(terms):
+            docs = self._lookup(t, prefix=(n == len(terms) - 1))
+            if hits is None:
+                hits = docs
+            elif self.SAME_PART:
+                hits = {p: hits[p] & docs[p] for p in hits if p in docs}
+                hits = {p: v for p, v in hits.items() if v}
+            else:
+                hits = {p: hits[p] | docs[p] for p in hits if p in docs}
+            if not hits:
+                return {}
+        return hits or {}
+
+class TranscriptIndex(TermIndex):
+    """
+    Inverted index over every audio transcript: term -> {transcript path: [paragraph, ...]}.
+    Paragraphs are the transcript's layout paragraphs (one per cue for .srt/.vtt), so a
+    hit maps straight to a scroll position and, with timing, a seek time.
+    Each entry persists its own postings (not the text); the global map is merged in
+    memory and kept up to date incrementally as the background pass re-reads changed
+    transcripts. Snippets are read back from the transcript only for rows on screen.
+    """
+    KIND = "search"
+    FLUSH_SEC = 30.0
+    SNIPPET = 90
+
+    def __init__(self):
+        self._paras = OrderedDict()  # path -> paragraphs, for snippets (LRU)
+        self._paras_lock = threading.Lock()
+        super().__init__()
+
+    @staticmethod
+    def _split(path):
+        text, timed = load_transcript(path)
+        return text.replace("\r\n", "\n").split("\n\n"), timed
+
+    def probe(self, path):
+        paras, timed = self._split(path)
+        terms = {}
+        for i, para in enumerate(paras):
+            for t in set(tokenize(para)):
+                terms.setdefault(t, []).append(i)
+        return {
+            "times": [round(c["start"], 3) for c in timed.cues] if timed else None,
+            "terms": terms,
+        }
+
+    def _changed(self, path, old, new):
+        super()._changed(path, old, new)
+        with self._paras_lock:
+            self._paras.pop(path, None)
+
+    def search(self, query, limit=200):
+        """
+        Paragraphs containing every query term (the last one as a prefix, for
+        type-ahead). Returns [{"path", "para", "time"}] in path order; see snippet().
+        """
+        with self._lock:
+            hits = self._match(query)
+            out = []
+            for path in sorted(hits):
+                e = self.entries.get(path) or {}
+                for para in sorted(hits[path]):
+                    times = e.get("times")
+                    out.append({
+                        "path": path,
+                        "para": para,
+                        "time": times[para] if times and para < len(times) else None,
+                    })
+                    if len(out) >= limit:
+                        return out
+            return out
+
+    def snippet(self, hit, query):
+        """Excerpt of the hit's paragraph around the first query term (reads the transcript)."""
+        path, i = hit["path"], hit["para"]
+        with self._paras_lock:
+            paras = self._paras.get(path)
+            if paras is not None:
+                self._paras.move_to_end(path)
+        if paras is None:
+            try:
+                paras = self._split(path)[0]
+            except Exception:
+                paras = []
+            with self._paras_lock:
+                self._paras[path] = paras
+                if len(self._paras) > 32:
+                    self._paras.popitem(last=False)
+        text = " ".join(paras[i].split()) if i < len(paras) else ""
+        return excerpt(text, query, self.SNIPPET)
+
+_transcript_index = None
+
+def transcript_index():
+    global _transcript_index
+    if _transcript_index is None:
+        _transcript_index = TranscriptIndex()
+    return _transcript_index
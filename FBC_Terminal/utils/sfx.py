@@ -0,0 +1,135 @@
+import math
+import pygame
+from .mixer import audio_engine
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# Named UI sounds. A spec is a list of (freq_hz, ms, pause_ms) steps plus shared
+# options; freq 0 is silence. Sounds are synthesised once per mixer format.
+SFX = {
+    "ok":            {"steps": [(980, 100, 0)], "volume": 0.22},
+    "err":           {"steps": [(320, 50, 70)] * 2, "volume": 0.22},
+    "unlock":        {"steps": [(880, 90, 90)] * 2, "volume": 0.30},
+    "denied":        {"steps": [(320, 50, 70)] * 2, "volume": 0.22},
+    "decrypt_start": {"steps": [(820, 60, 60)] * 3, "volume": 0.20},
+    "decrypt_done":  {"steps": [(980, 100, 0)], "volume": 0.22},
+    "threshold":     {"steps": [(920, 70, 70)] * 3, "volume": 0.22},
+    "ring":          {"steps": [(620, 120, 200)] * 2, "volume": 0.22},
+    "hotline_msg":   {"steps": [(520, 180, 0)], "volume": 0.22},
+    "quarry_empty":  {"steps": [(180, 60, 0)], "volume": 0.25, "wave": "square"},
+    "quarry_click":  {"steps": [(1800, 8, 0)], "volume": 0.30, "decay": True},
+}
+
+FADE_MS = 3  # short ramps on every tone so beeps don't click
+
+def _tone(freq, n, rate, volume, wave="sine", decay=False):
+    """float32 mono samples in -1..1 for one step (vectorised)."""
+    if freq <= 0 or n <= 0:
+        return np.zeros(max(0, n), dtype=np.float32)
+    phase = (2.0 * math.pi * freq / rate) * np.arange(n, dtype=np.float32)
+    out = np.sin(phase)
+    if wave == "square":
+        out = np.sign(out)
+    if decay:
+        out *= np.exp(np.linspace(0.0, -5.0, n, dtype=np.float32))
+    f = min(n // 2, int(rate * FADE_MS / 1000))
+    if f > 0:
+        ramp = np.linspace(0.0, 1.0, f, dtype=np.float32)
+        out[:f] *= ramp
+        out[-f:] *= ramp[::-1]
+    return out * volume
+
+def synth(steps, volume=0.3, wave="sine", decay=False, rate=44100):
+    """Concatenate (freq, ms, pause_ms) steps into one float32 mono buffer."""
+    parts = []
+    for freq, ms, pause in steps:
+        parts.append(_tone(freq, int(rate * ms / 1000), rate, volume, wave, decay))
+        if pause:
+            parts.append(np.zeros(int(rate * pause / 1000), dtype=np.float32))
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+def to_sound(mono):
+    """float mono -> Sound in the mixer's actual sample format and channel count."""
+    _, size, channels = pygame.mixer.get_init()
+    bits = abs(size)
+    if bits == 8:
+        dtype, scale = (np.int8, 127) if size < 0 else (np.uint8, 127)
+    elif bits == 32:
+        dtype, scale = np.float32, 1.0
+    else:
+        dtype, scale = (np.int16, 32767) if size < 0 else (np.uint16, 32767)
+    data = np.clip(mono, -1.0, 1.0) * scale
+    if size > 0 and bits != 32:  # unsigned formats are offset by half the range
+        data = data + (scale + 1)
+    data = data.astype(dtype)
+    if channels > 1:
+        data = np.ascontiguousarray(np.repeat(data[:, None], channels, axis=1))
+    return pygame.sndarray.make_sound(data)
+
+def _synth_slow(steps, volume=0.3, rate=44100, channels=2, **_):
+    """Pure-Python fallback when NumPy is missing (int16 only)."""
+    from array import array
+    buf = array("h")
+    amp = int(32767 * volume)
+    for freq, ms, pause in steps:
+        for i in range(int(rate * ms / 1000)):
+            v = int(amp * math.sin(2 * math.pi * freq * i / rate)) if freq > 0 else 0
+            buf.extend([v] * channels)
+        buf.extend([0] * (int(rate * pause / 1000) * channels))
+    return pygame.mixer.Sound(buffer=buf.tobytes())
+
+class SfxBank:
+    """Sounds by name, built on first use and reused until the mixer format changes."""
+
+    def __init__(self, specs=SFX):
+        self.specs = dict(specs)
+        self._sounds = {}
+        self._fmt = None
+
+    def define(self, name, steps, **opts):
+        self.specs[name] = dict(opts, steps=list(steps))
+        self._sounds.pop(name, None)
+
+    def get(self, name):
+        fmt = pygame.mixer.get_init()
+        if not fmt:
+            return None
+        if fmt != self._fmt:  # mixer re-opened with another rate/format: rebuild lazily
+            self._sounds.clear()
+            self._fmt = fmt
+        snd = self._sounds.get(name)
+        if snd is None:
+            spec = self.specs.get(name)
+            if spec is None:
+                return None
+            opts = dict(spec)
+            steps = opts.pop("steps")
+            try:
+                if np is not None:
+                    snd = to_sound(synth(steps, rate=fmt[0], **opts))
+                else:
+                    snd = _synth_slow(steps, rate=fmt[0], channels=fmt[2], **opts)
+            except Exception:
+                return None
+            self._sounds[name] = snd
+        return snd
+
+    def play(self, name, volume=1.0):
+        """Play on a UI-class channel of the audio engine; returns the Channel (or None)."""
+        return audio_engine().play("ui", self.get(name), volume=volume)
+
+    def warm(self, names=None):
+        """Synthesise ahead of time (e.g. right after mixer init)."""
+        for name in names or list(self.specs):
+            self.get(name)
+
+_bank = None
+
+def sfx():
+    global _bank
+    if _bank is None:
+        _bank = SfxBank()
+    return _bank
@@ -1,3 +1,7 @@
+from bisect import bisect_right
+from collections import OrderedDict
+import pygame
+
 try:
     import pyfiglet
 except Exception:
@@ -15,17 +19,150 @@ def warning_ascii_lines(text="WARNING!"):
 def tokenize_words(text: str):
     return [t for t in text.replace("\t", " ").split(" ") if t != ""]
 
-def wrap_tokens_to_lines(tokens, font, max_width):
+def wrap_tokens_to_lines(tokens, font, max_width, widths=None):
+    """widths: optional dict memo of token -> pixel width, shared across calls."""
     lines, cur, cur_w = [], [], 0
     space_w = font.size(" ")[0]
+    # summed word widths drift from the rendered line (bearings); near the edge, measure the real line
+    slack = max_width // 50 + 4
     for tok in tokens:
-        tok_w = font.size(tok)[0]
+        if widths is None:
+            tok_w = font.size(tok)[0]
+        else:
+            tok_w = widths.get(tok)
+            if tok_w is None:
+                tok_w = widths[tok] = font.size(tok)[0]
         if not cur:
             cur, cur_w = [tok], tok_w
         else:
-            if cur_w + space_w + tok_w <= max_width:
-                cur.append(tok); cur_w += space_w + tok_w
+            new_w = cur_w + space_w + tok_w
+            if new_w <= max_width and (new_w <= max_width - slack
+                                       or font.size(" ".join(cur) + " " + tok)[0] <= max_width):
+                cur.append(tok); cur_w = new_w
             else:
                 lines.append(cur); cur, cur_w = [tok], tok_w
     if cur: lines.append(cur)
     return lines
+
+# ---------- cached paragraph layout ----------
+class TextLayout:
+    """
+    Paragraphs ("\\n\\n") word-wrapped once into lines[i] = (y, text, para, first_word).
+    draw() renders only the lines inside the scroll window; rendered lines are
+    kept in a small LRU so scrolling does not re-render what is already on screen.
+    hit() / word_rect() map between layout coordinates and (paragraph, word).
+    """
+    SURF_CACHE = 256
+
+    def __init__(self, text, font, width, line_gap=4, par_gap=8):
+        self.font = font
+        self.width = width
+        self.line_h = font.get_height()
+        self.lines = []
+        self.para_lines = []  # paragraph -> (first line, end line)
+        self._widths = {}
+        self._space_w = font.size(" ")[0]
+        y = 0
+        for p, para in enumerate(text.replace("\r\n", "\n").split("\n\n")):
+            rows = wrap_tokens_to_lines(para.split(), font, width, self._widths)
+            self.para_lines.append((len(self.lines), len(self.lines) + len(rows)))
+            if not rows:
+                y += self.line_h + par_gap
+                continue
+            w0 = 0
+            for i, row in enumerate(rows):
+                self.lines.append((y, " ".join(row), p, w0))
+                w0 += len(row)
+                y += self.line_h + (par_gap if i == len(rows) - 1 else line_gap)
+        self.height = y
+        self._tops = [ln[0] for ln in self.lines]
+        self._surfs = OrderedDict()  # (line index, color) -> Surface
+
+    def visible(self, scroll_y, view_h):
+        """Indexes of lines intersecting [scroll_y, scroll_y + view_h)."""
+        i = max(0, bisect_right(self._tops, scroll_y - self.line_h))
+        j = bisect_right(self._tops, scroll_y + view_h, lo=i)
+        return range(i, j)
+
+    def para_top(self, p):
+        """Layout y of paragraph p's first line (None if it has no lines)."""
+        if 0 <= p < len(self.para_lines):
+            first, end = self.para_lines[p]
+            if first < end:
+                return self.lines[first][0]
+        return None
+
+    def _word_spans(self, i):
+        x = 0
+        for w in self.lines[i][1].split(" "):
+            ww = self._widths.get(w)
+            if ww is None:
+                ww = self._widths[w] = self.font.size(w)[0]
+            yield x, ww
+            x += ww + self._space_w
+
+    def hit(self, x, y):
+        """(paragraph, word index) under layout point (x, y), or None."""
+        i = bisect_right(self._tops, y) - 1
+        if i < 0 or y >= self.lines[i][0] + self.line_h:
+            return None
+        for k, (wx, ww) in enumerate(self._word_spans(i)):
+            if wx <= x < wx + ww + self._space_w:
+                return self.lines[i][2], self.lines[i][3] + k
+        return None
+
+    def word_rect(self, p, word):
+        """Layout rect of word `word` in paragraph p, or None."""
+        if not (0 <= p < len(self.para_lines)):
+            return None
+        for i in range(*self.para_lines[p]):
+            k = word - self.lines[i][3]
+            if k >= 0:
+                for n, (wx, ww) in enumerate(self._word_spans(i)):
+                    if n == k:
+                        return pygame.Rect(wx, self.lines[i][0], ww, self.line_h)
+        return None
+
+    def line_surface(self, i, color):
+        key = (i, tuple(color))
+        surf = self._surfs.get(key)
+        if surf is None:
+            surf = self.font.render(self.lines[i][1], True, color)
+            self._surfs[key] = surf
+            if len(self._surfs) > self.SURF_CACHE:
+                self._surfs.popitem(last=False)
+        else:
+            self._surfs.move_to_end(key)
+        return surf
+
+    def draw(self, surface, rect, scroll_y, color, para_colors=None):
+        """Blit the visible part of the layout into rect (clipped); para_colors overrides per paragraph."""
+        rect = pygame.Rect(rect)
+        old_clip = surface.get_clip()
+        surface.set_clip(rect.clip(old_clip))
+        for i in self.visible(scroll_y, rect.height):
+            c = para_colors.get(self.lines[i][2], color) if para_colors else color
+            surface.blit(self.line_surface(i, c), (rect.x, rect.y + self.lines[i][0] - scroll_y))
+        surface.set_clip(old_clip)
+
+_layouts = OrderedDict()
+
+def text_layout(text, font, width, line_gap=4, par_gap=8):
+    """TextLayout for (text, font, width, gaps), reused across frames."""
+    key = (text, font, width, line_gap, par_gap)
+    lay = _layouts.get(key)
+    if lay is None:
+        lay = _layouts[key] = TextLayout(text, font, width, line_gap, par_gap)
+        if len(_layouts) > 8:
+            _layouts.popitem(last=False)
+    else:
+        _layouts.move_to_end(key)
+    return lay
+
+def cache_layout(lay, text, font, line_gap=4, par_gap=8):
+    """Adopt a layout built elsewhere (a worker thread with a twin font) for text_layout()."""
+    lay.font = font
+    lay._surfs.clear()
+    _layouts[(text, font, lay.width, line_gap, par_gap)] = lay
+    if len(_layouts) > 8:
+        _layouts.popitem(last=False)
@@ -0,0 +1,95 @@
+import os, re
+from bisect import bisect_right
+
+# Timed transcript sidecars: SRT or WebVTT next to the audio file.
+# Per-word timing uses WebVTT inline timestamps: "<00:00:01.200>word".
+TIMED_EXTS = (".srt", ".vtt")
+
+_TS = r"(?:(\d+):)?(\d{1,2}):(\d{2})[.,](\d{1,3})"
+_CUE_TIME = re.compile(_TS + r"\s*-->\s*" + _TS)
+_INLINE_TS = re.compile(r"<" + _TS + r">")
+_TAG = re.compile(r"<[^>]*>")
+
+def _secs(h, m, s, ms):
+    return int(h or 0) * 3600 + int(m) * 60 + int(s) + int(ms.ljust(3, "0")) / 1000.0
+
+def _parse_payload(lines, start):
+    """Cue payload -> (text, word_times or None). Inline timestamps time the words after them."""
+    raw = " ".join(ln.strip() for ln in lines if ln.strip())
+    if not _INLINE_TS.search(raw):
+        return " ".join(_TAG.sub("", raw).split()), None
+    words, times, t = [], [], start
+    pos = 0
+    for m in _INLINE_TS.finditer(raw + "<99:59:59.999>"):
+        for w in _TAG.sub("", raw[pos:m.start()]).split():
+            words.append(w); times.append(t)
+        t, pos = _secs(*m.groups()), m.end()
+    return " ".join(words), times
+
+def parse_timed(text):
+    """
+    SRT / WebVTT -> cues sorted by start:
+    [{"start", "end", "text", "words"}], words = per-token start times or None.
+    Cue numbers, WEBVTT header, NOTE/STYLE blocks and formatting tags are ignored.
+    """
+    cues = []
+    blocks = re.split(r"\n\s*\n", text.replace("\r\n", "\n").replace("\ufeff", ""))
+    for block in blocks:
+        lines = block.strip("\n").split("\n")
+        for i, ln in enumerate(lines):
+            m = _CUE_TIME.search(ln)
+            if m:
+                g = m.groups()
+                start, end = _secs(*g[:4]), _secs(*g[4:])
+                body, words = _parse_payload(lines[i + 1:], start)
+                cues.append({"start": start, "end": max(end, start), "text": body, "words": words})
+                break
+    cues.sort(key=lambda c: c["start"])
+    return cues
+
+class TimedTranscript:
+    """Cues in a sorted array; active(t) is a binary search, O(log n) per frame."""
+
+    def __init__(self, cues):
+        self.cues = cues
+        self.starts = [c["start"] for c in cues]
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            return cls(parse_timed(f.read()))
+
+    @property
+    def text(self):
+        # one paragraph per cue, so layout paragraph i == cue i
+        return "\n\n".join(c["text"] for c in self.cues)
+
+    def active(self, t):
+        """Index of the cue playing at t, or -1 between cues."""
+        i = bisect_right(self.starts, t) - 1
+        if i >= 0 and t < self.cues[i]["end"]:
+            return i
+        return -1
+
+    def active_word(self, i, t):
+        """Index of the word playing at t inside cue i (per-word timing only), else -1."""
+        words = self.cues[i]["words"] if 0 <= i < len(self.cues) else None
+        if not words:
+            return -1
+        return bisect_right(words, t) - 1
+
+    def time_of(self, i, word=-1):
+        c = self.cues[i]
+        if word >= 0 and c["words"] and word < len(c["words"]):
+            return c["words"][word]
+        return c["start"]
+
+def load_transcript(path):
+    """(text, TimedTranscript or None); .txt gives plain text. Raises on read errors; thread-safe."""
+    if os.path.splitext(path)[1].lower() in TIMED_EXTS:
+        timed = TimedTranscript.load(path)
+        if timed.cues:
+            return timed.text, timed
+        return "(empty transcript)", None
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        return f.read().strip() or "(empty transcript)", None
@@ -0,0 +1,636 @@
+import os, re, time, struct, bisect, threading, subprocess
+import pygame
+
+try:
+    import cv2  # OpenCV
+except Exception:
+    cv2 = None
+
+from .audio import get_ffmpeg_exe
+from .cache import cache_file, file_signature, load_json, save_json
+
+# --------- MP4 / MOV sample tables ---------
+def _iter_boxes(f, start, end):
+    """Yield (type, payload_start, box_end) for ISO-BMFF boxes in [start, end)."""
+    pos = start
+    while pos + 8 <= end:
+        f.seek(pos)
+        hdr = f.read(8)
+        if len(hdr) < 8:
+            return
+        size, kind = struct.unpack(">I4s", hdr)
+        hlen = 8
+        if size == 1:
+            size = struct.unpack(">Q", f.read(8))[0]; hlen = 16
+        elif size == 0:
+            size = end - pos
+        if size < hlen:
+            return
+        yield kind, pos + hlen, min(end, pos + size)
+        pos += size
+
+def _child(f, start, end, kind):
+    for k, a, b in _iter_boxes(f, start, end):
+        if k == kind:
+            return a, b
+    return None
+
+def _read_table(f, box, fmt, width):
+    """Full-box table: version/flags, entry count, then entries of `fmt`."""
+    f.seek(box[0])
+    vf, n = struct.unpack(">II", f.read(8))
+    data = f.read(n * width)
+    if len(data) < n * width:
+        n = len(data) // width
+    return vf >> 24, struct.unpack(">" + fmt * n, data[:n * width])
+
+def _video_track(f, moov):
+    for k, a, b in _iter_boxes(f, *moov):
+        if k != b"trak":
+            continue
+        mdia = _child(f, a, b, b"mdia")
+        if not mdia:
+            continue
+        hdlr = _child(f, *mdia, b"hdlr")
+        if hdlr:
+            f.seek(hdlr[0] + 8)
+            if f.read(4) == b"vide":
+                return (a, b), mdia
+    return None, None
+
+def _mp4_keyframes(path):
+    """
+    Keyframe (sync sample) presentation times and byte offsets from the moov
+    sample tables. Only reads the index boxes, never the media data.
+    """
+    with open(path, "rb") as f:
+        f.seek(0, 2); size = f.tell()
+        moov = _child(f, 0, size, b"moov")
+        if not moov:
+            return None
+        trak, mdia = _video_track(f, moov)
+        if not trak:
+            return None
+
+        mdhd = _child(f, *mdia, b"mdhd")
+        f.seek(mdhd[0])
+        ver = f.read(4)[0]
+        if ver == 1:
+            f.seek(16, 1); timescale, duration = struct.unpack(">IQ", f.read(12))
+        else:
+            f.seek(8, 1); timescale, duration = struct.unpack(">II", f.read(8))
+        if not timescale:
+            return None
+
+        # edit list: media time that maps to t=0 (B-frame reorder delay)
+        shift = 0
+        edts = _child(f, *trak, b"edts")
+        elst = _child(f, *edts, b"elst") if edts else None
+        if elst:
+            f.seek(elst[0])
+            vf, n = struct.unpack(">II", f.read(8))
+            for _ in range(n):
+                if vf >> 24 == 1:
+                    _, media_time = struct.unpack(">Qq", f.read(16)); f.seek(4, 1)
+                else:
+                    _, media_time = struct.unpack(">Ii", f.read(8)); f.seek(4, 1)
+                if media_time >= 0:
+                    shift = media_time; break
+
+        minf = _child(f, *mdia, b"minf")
+        stbl = _child(f, *minf, b"stbl") if minf else None
+        if not stbl:
+            return None
+        boxes = {k: (a, b) for k, a, b in _iter_boxes(f, *stbl)}
+        if b"stts" not in boxes or b"stsz" not in boxes or b"stsc" not in boxes:
+            return None
+
+        _, stts = _read_table(f, boxes[b"stts"], "II", 8)
+        f.seek(boxes[b"stsz"][0] + 4)
+        fixed, n_samples = struct.unpack(">II", f.read(8))
+        if fixed:
+            sizes = [fixed] * n_samples
+        else:
+            sizes = struct.unpack(f">{n_samples}I", f.read(4 * n_samples))
+        _, stsc = _read_table(f, boxes[b"stsc"], "III", 12)
+        if b"co64" in boxes:
+            _, chunks = _read_table(f, boxes[b"co64"], "Q", 8)
+        elif b"stco" in boxes:
+            _, chunks = _read_table(f, boxes[b"stco"], "I", 4)
+        else:
+            return None
+        ctts = None
+        if b"ctts" in boxes:
+            # v0 offsets are nominally unsigned but never exceed 2^31 in practice
+            _, ctts = _read_table(f, boxes[b"ctts"], "Ii", 8)
+        sync = None
+        if b"stss" in boxes:
+            _, sync = _read_table(f, boxes[b"stss"], "I", 4)
+
+    # decode timestamps
+    dts, t = [], 0
+    for i in range(0, len(stts), 2):
+        cnt, delta = stts[i], stts[i + 1]
+        for _ in range(cnt):
+            dts.append(t); t += delta
+    n_samples = min(n_samples, len(dts))
+
+    # composition offsets
+    cto = None
+    if ctts:
+        cto = []
+        for i in range(0, len(ctts), 2):
+            cto.extend([ctts[i + 1]] * ctts[i])
+
+    # byte offsets (chunk offset + sizes of earlier samples in the chunk)
+    offsets, si = [], 0
+    runs = [(stsc[i], stsc[i + 1]) for i in range(0, len(stsc), 3)]
+    for r, (first, per) in enumerate(runs):
+        last = runs[r + 1][0] - 1 if r + 1 < len(runs) else len(chunks)
+        for c in range(first, last + 1):
+            if c - 1 >= len(chunks):
+                break
+            off = chunks[c - 1]
+            for _ in range(per):
+                if si >= n_samples:
+                    break
+                offsets.append(off); off += sizes[si]; si += 1
+
+    def pts(i):
+        v = dts[i] + (cto[i] if cto and i < len(cto) else 0) - shift
+        return max(0.0, v / timescale)
+
+    if sync is not None:
+        idx = [s - 1 for s in sync if 0 < s <= n_samples]
+    else:
+        # all-intra: every sample is a keyframe; keep ~2 entry points per second
+        idx, last_t = [], -1.0
+        for i in range(n_samples):
+            if pts(i) - last_t >= 0.5:
+                idx.append(i); last_t = pts(i)
+
+    times = [round(pts(i), 4) for i in idx]
+    offs  = [offsets[i] if i < len(offsets) else None for i in idx]
+    order = sorted(range(len(times)), key=times.__getitem__)
+    return {"duration": duration / timescale,
+            "times": [times[i] for i in order],
+            "offsets": [offs[i] for i in order]}
+
+def _ffmpeg_keyframes(path):
+    """Fallback for non-MP4 layouts: stream-copy the video packets and read flags."""
+    exe = get_ffmpeg_exe()
+    if not exe:
+        return None
+    cmd = [exe, "-hide_banner", "-loglevel", "error", "-i", path,
+           "-map", "0:v:0", "-c", "copy", "-f", "framecrc", "-"]
+    try:
+        out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                             check=True).stdout.decode("utf-8", "replace")
+    except Exception:
+        return None
+    tb, times, end = None, [], 0.0
+    for ln in out.splitlines():
+        if ln.startswith("#tb 0:"):
+            num, den = ln.split(":", 1)[1].strip().split("/")
+            tb = int(num) / int(den)
+            continue
+        if ln.startswith("#") or tb is None:
+            continue
+        cols = [c.strip() for c in ln.split(",")]
+        if len(cols) < 6 or cols[0] != "0":
+            continue
+        pts_s = max(0.0, int(cols[2]) * tb)
+        end = max(end, pts_s + int(cols[3]) * tb)
+        flags = [c for c in cols[6:] if c.startswith("F=")]
+        if not flags or int(flags[0][2:], 16) & 1:
+            times.append(round(pts_s, 4))
+    if not times:
+        return None
+    times.sort()
+    return {"duration": end, "times": times, "offsets": [None] * len(times)}
+
+# --------- Keyframe index ---------
+class KeyframeIndex:
+    """Sorted keyframe timestamps (s) with their byte offsets, persisted per video."""
+    VERSION = 1
+
+    def __init__(self, times, offsets=None, duration=None):
+        self.times = times
+        self.offsets = offsets or [None] * len(times)
+        self.duration = duration
+
+    def floor(self, t):
+        """Latest keyframe time <= t (0.0 if t precedes the first keyframe)."""
+        i = bisect.bisect_right(self.times, t) - 1
+        return self.times[i] if i >= 0 else 0.0
+
+    def offset_at(self, t):
+        i = bisect.bisect_right(self.times, t) - 1
+        return self.offsets[i] if i >= 0 else None
+
+    def __len__(self):
+        return len(self.times)
+
+    @classmethod
+    def load_or_build(cls, path):
+        """Cached index if the video is unchanged, otherwise scan once and persist."""
+        sig = file_signature(path)
+        if sig is None:
+            return None
+        cpath = cache_file("keyframes", path, ".json")
+        data = load_json(cpath)
+        if not (data and data.get("v") == cls.VERSION and data.get("sig") == sig):
+            data = None
+            try:
+                data = _mp4_keyframes(path)
+            except Exception:
+                data = None
+            if not data or not data["times"]:
+                data = _ffmpeg_keyframes(path)
+            if not data:
+                return None
+            data.update(v=cls.VERSION, sig=sig)
+            save_json(cpath, data)
+        return cls(data["times"], data.get("offsets"), data.get("duration"))
+
+# --------- Probe ---------
+_RE_DURATION = re.compile(r"Duration:\s*(\d+):(\d+):([\d.]+)")
+_RE_VIDEO    = re.compile(r"Stream #\S+.*?Video:\s*([^\s,]+).*?,\s*(\d{2,5})x(\d{2,5})")
+_RE_FPS      = re.compile(r"([\d.]+)\s*(?:fps|tbr)")
+
+def probe_video(path):
+    """
+    {duration, width, height, fps, codec, has_audio} from the ffmpeg banner,
+    falling back to OpenCV (no audio/codec info there). None if unreadable.
+    """
+    exe = get_ffmpeg_exe()
+    if exe:
+        try:
+            p = subprocess.run([exe, "-hide_banner", "-nostdin", "-i", path],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, timeout=20)
+            txt = p.stderr.decode("utf-8", "replace")
+            mv = _RE_VIDEO.search(txt)
+            if mv:
+                info = {"codec": mv.group(1), "width": int(mv.group(2)), "height": int(mv.group(3)),
+                        "duration": None, "fps": 30.0, "has_audio": "Audio:" in txt}
+                md = _RE_DURATION.search(txt)
+                if md:
+                    h, m, sec = md.groups()
+                    info["duration"] = int(h) * 3600 + int(m) * 60 + float(sec)
+                line = txt[mv.start():txt.find("\n", mv.start())]
+                mf = _RE_FPS.search(line)
+                if mf and float(mf.group(1)) > 1:
+                    info["fps"] = float(mf.group(1))
+                return info
+        except Exception:
+            pass
+    if cv2 is not None:
+        cap = cv2.VideoCapture(path)
+        try:
+            if cap.isOpened():
+                fps = cap.get(cv2.CAP_PROP_FPS) or 0
+                fps = float(fps) if fps > 1 else 30.0
+                frames = cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0
+                return {"codec": None, "has_audio": None, "fps": fps,
+                        "width": int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                        "height": int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+                        "duration": frames / fps if frames else None}
+        finally:
+            cap.release()
+    return None
+
+# --------- Decode backends ---------
+class Cv2Decoder:
+    """OpenCV: decodes at source resolution, converts + downsizes per frame."""
+    name = "cv2"
+    exact_seek = False  # cap.set lands near the target; caller decodes forward
+
+    def __init__(self, path):
+        self.cap = cv2.VideoCapture(path)
+        fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self.fps = float(fps) if fps and fps > 1 else 30.0
+        self.frame_count = int(self.cap.get(cv2.CAP_PROP_FRAME_COUNT) or 0)
+        self.size = (int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+                     int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)))
+        self.out_size = self.size
+        self._primed = None  # first frame decoded ahead of time (RGB array)
+
+    def is_open(self):
+        return self.cap.isOpened()
+
+    def set_output_size(self, size):
+        if self._primed is not None and size != self.out_size:
+            self.seek_frame(0)
+        self.out_size = size
+
+    def _decode(self):
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return cv2.resize(frame, self.out_size, interpolation=cv2.INTER_AREA)
+
+    def prime(self):
+        """Decode the next frame now (safe off the main thread); read() returns it."""
+        self._primed = self._decode()
+        return self._primed is not None
+
+    def read(self):
+        frame, self._primed = (self._primed if self._primed is not None else self._decode()), None
+        if frame is None:
+            return None
+        # OpenCV array -> pygame surface
+        return pygame.surfarray.make_surface(frame.swapaxes(0, 1)).convert()
+
+    def grab(self):
+        if self._primed is not None:
+            self._primed = None
+            return True
+        return self.cap.grab()
+
+    def seek_frame(self, n):
+        self._primed = None
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, n)
+
+    def set_skip(self, mode):
+        pass  # OpenCV cannot drop frames in the decoder; callers grab() instead
+
+    def release(self):
+        try: self.cap.release()
+        except Exception: pass
+
+class FfmpegDecoder:
+    """
+    ffmpeg scales and converts to rgb24 inside the decoder; frames are read from
+    a pipe straight into one reused buffer that backs the returned Surface.
+    """
+    name = "ffmpeg"
+    exact_seek = True  # input -ss seeks to a keyframe and decodes forward itself
+
+    def __init__(self, path, info=None):
+        self.path = path
+        self.exe = get_ffmpeg_exe()
+        info = info or probe_video(path) or {}
+        self.fps = info.get("fps") or 30.0
+        self.frame_count = int((info.get("duration") or 0) * self.fps)
+        self.size = (info.get("width") or 0, info.get("height") or 0)
+        self.out_size = self.size
+        self.proc = None
+        self.buf = None
+        self.surf = None
+        self.pos = 0  # index of the next frame the pipe will deliver
+        self._primed = False  # buffer already holds the frame read() should return
+        self.skip = None  # decoder -skip_frame mode (trick-play), e.g. "noref"
+
+    def is_open(self):
+        return bool(self.exe) and self.size[0] > 0 and self.size[1] > 0
+
+    def set_output_size(self, size):
+        if size != self.out_size:
+            self.out_size = size
+            if self.proc:
+                self._start(self.pos - 1 if self._primed else self.pos)
+
+    def _start(self, frame):
+        self._stop()
+        self._primed = False
+        w, h = self.out_size
+        cmd = [self.exe, "-hide_banner", "-loglevel", "error", "-nostdin"]
+        if self.skip:
+            cmd += ["-skip_frame", self.skip]
+        if frame > 0:
+            cmd += ["-ss", f"{frame / self.fps:.3f}"]
+        cmd += ["-i", self.path, "-map", "0:v:0", "-an", "-sn",
+                "-vf", f"scale={w}:{h}:flags=area", "-pix_fmt", "rgb24", "-f", "rawvideo", "-"]
+        self.proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                     bufsize=w * h * 3)
+        if self.buf is None or len(self.buf) != w * h * 3:
+            self.buf = bytearray(w * h * 3)
+            self.surf = pygame.image.frombuffer(self.buf, (w, h), "RGB")
+        self.pos = frame
+
+    def _stop(self):
+        if self.proc:
+            try:
+                self.proc.stdout.close()
+                self.proc.kill(); self.proc.wait(timeout=2)
+            except Exception:
+                pass
+            self.proc = None
+
+    def _fill(self):
+        if self.proc is None:
+            self._start(self.pos)
+        view, n, total = memoryview(self.buf), 0, len(self.buf)
+        while n < total:
+            r = self.proc.stdout.readinto(view[n:])
+            if not r:
+                return False
+            n += r
+        self.pos += 1
+        return True
+
+    def prime(self):
+        """Start the pipe and read the next frame now (safe off the main thread)."""
+        self._primed = self._fill()
+        return self._primed
+
+    def read(self):
+        if self._primed:
+            self._primed = False
+            return self.surf
+        return self.surf if self._fill() else None
+
+    def grab(self):
+        if self._primed:
+            self._primed = False
+            return True
+        return self._fill()
+
+    def seek_frame(self, n):
+        self._start(max(0, n))
+
+    def set_skip(self, mode):
+        """Drop frames inside the decoder; CFR output keeps frame n at n/fps."""
+        if mode != self.skip:
+            self.skip = mode
+            if self.proc:
+                self._start(self.pos - 1 if self._primed else self.pos)
+
+    def release(self):
+        self._stop()
+
+class KeyframeReader:
+    """
+    Trick-play frames decoded on their own thread, so the UI never waits for them.
+    Forward: one persistent ffmpeg pipe with -skip_frame nokey streams keyframe after
+    keyframe and is restarted only when the target jumps away from it. Rewind (or no
+    ffmpeg): single keyframes at the target, decoded by a one-shot ffmpeg or by an
+    OpenCV capture of its own. The playback decoder is never touched.
+    want(t, direction) moves the target; latest() hands over the newest finished frame.
+    """
+    AHEAD = 4  # forward pipe: restart instead of reading through more keyframes than this
+
+    def __init__(self, path, index, fps, size):
+        self.path = path
+        self.index = index
+        self.fps = fps
+        self.size = size
+        self.exe = get_ffmpeg_exe()
+        self._cond = threading.Condition()
+        self._target = None
+        self._dir = 1
+        self._done = None      # (frame n, rgb bytes) not yet taken by latest()
+        self._closed = False
+        self._proc = None
+        self._next_i = None    # index (into index.times) of the keyframe the pipe delivers next
+        self._cap = None
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def want(self, t, direction):
+        with self._cond:
+            self._target, self._dir = t, direction
+            self._cond.notify()
+
+    def latest(self):
+        """(frame n, Surface) of the newest keyframe finished since the last call, else None."""
+        with self._cond:
+            done, self._done = self._done, None
+        if done is None:
+            return None
+        return done[0], pygame.image.frombuffer(done[1], self.size, "RGB")
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._stop_pipe()  # unblocks a pending read
+
+    def _slot(self, t):
+        return max(0, bisect.bisect_right(self.index.times, t) - 1)
+
+    def _run(self):
+        shown = None
+        while True:
+            with self._cond:
+                while not self._closed and (self._target is None or self._slot(self._target) == shown):
+                    self._cond.wait()
+                if self._closed:
+                    break
+                i, forward = self._slot(self._target), self._dir > 0
+            try:
+                data = self._forward(i) if forward and self.exe else self._single(i)
+            except Exception:
+                data = None
+            shown = i  # a failed keyframe is not retried until the target moves on
+            if data is not None:
+                with self._cond:
+                    self._done = (int(round(self.index.times[i] * self.fps)), data)
+        self._stop_pipe()
+        if self._cap is not None:
+            self._cap.release()
+
+    def _cmd(self, t):
+        w, h = self.size
+        # start half a frame early so rounding never skips past the keyframe
+        return [self.exe, "-hide_banner", "-loglevel", "error", "-nostdin", "-skip_frame", "nokey",
+                "-ss", f"{max(0.0, t - 0.5 / self.fps):.3f}", "-i", self.path, "-map", "0:v:0",
+                "-an", "-sn", "-fps_mode", "passthrough", "-vf", f"scale={w}:{h}:flags=area",
+                "-pix_fmt", "rgb24", "-f", "rawvideo", "-"]
+
+    def _forward(self, i):
+        if self._proc is None or not (self._next_i <= i <= self._next_i + self.AHEAD):
+            self._stop_pipe()
+            self._proc = subprocess.Popen(self._cmd(self.index.times[i]), stdout=subprocess.PIPE,
+                                          stderr=subprocess.DEVNULL)
+            self._next_i = i
+        data = None
+        while self._next_i <= i:  # keyframes the target already passed are read and dropped
+            data = self._proc.stdout.read(self.size[0] * self.size[1] * 3)
+            if len(data) != self.size[0] * self.size[1] * 3:
+                self._stop_pipe()
+                return None
+            self._next_i += 1
+        return data
+
+    def _single(self, i):
+        self._stop_pipe()  # rewinding: the forward pipe is useless now
+        t = self.index.times[i]
+        if self.exe:
+            data = subprocess.run(self._cmd(t)[:-1] + ["-frames:v", "1", "-"], stdout=subprocess.PIPE,
+                                  stderr=subprocess.DEVNULL, timeout=10).stdout
+            return data if len(data) == self.size[0] * self.size[1] * 3 else None
+        if cv2 is None:
+            return None
+        if self._cap is None:
+            self._cap = cv2.VideoCapture(self.path)
+        self._cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000.0)
+        ok, frame = self._cap.read()
+        if not ok:
+            return None
+        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        return cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA).tobytes()
+
+    def _stop_pipe(self):
+        proc, self._proc = self._proc, None
+        if proc:
+            try:
+                proc.kill(); proc.stdout.close(); proc.wait(timeout=2)
+            except Exception:
+                pass
+
+BACKENDS = ("cv2", "ffmpeg")
+
+def open_decoder(path, backend="auto"):
+    """
+    cv2 | ffmpeg | auto. Auto prefers ffmpeg for sources above 1080p (where
+    full-resolution decode + Python-side resize is the bottleneck), else cv2.
+    Falls back to whichever backend is available; None if neither opens.
+    """
+    info = None
+    if backend == "auto":
+        info = probe_video(path) if get_ffmpeg_exe() else None
+        big = info and info["width"] * info["height"] > 1920 * 1080
+        order = ("ffmpeg", "cv2") if (big or cv2 is None) else ("cv2", "ffmpeg")
+    else:
+        order = (backend,) + tuple(b for b in BACKENDS if b != backend)
+    for name in order:
+        try:
+            if name == "cv2" and cv2 is not None:
+                dec = Cv2Decoder(path)
+            elif name == "ffmpeg" and get_ffmpeg_exe():
+                dec = FfmpegDecoder(path, info)  # reuses the probe above (None: it probes)
+            else:
+                continue
+        except Exception:
+            continue
+        if dec.is_open():
+            return dec
+        dec.release()
+    return None
+
+def benchmark_decoders(path, out_size, frames=150):
+    """Average ms/frame per backend, decoding `frames` frames to out_size."""
+    res = {}
+    for name in BACKENDS:
+        dec = open_decoder(path, name)
+        if dec is None or dec.name != name:
+            if dec: dec.release()
+            continue
+        dec.set_output_size(out_size)
+        n, t0 = 0, time.perf_counter()
+        while n < frames and dec.read() is not None:
+            n += 1
+        if n:
+            res[name] = (time.perf_counter() - t0) * 1000.0 / n
+        dec.release()
+    return res
+
+if __name__ == "__main__":
+    # python -m FBC_Terminal.utils.video <file> [WxH]
+    import sys
+    os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    pygame.display.init(); pygame.display.set_mode((1, 1))
+    size = tuple(int(v) for v in (sys.argv[2] if len(sys.argv) > 2 else "1728x972").split("x"))
+    for name, ms in benchmark_decoders(sys.argv[1], size).items():
+        print(f"{name:7s} {ms:7.2f} ms/frame  ({1000.0 / ms:6.1f} fps)")
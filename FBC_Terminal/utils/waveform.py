@@ -0,0 +1,137 @@
+import os, struct, threading, subprocess
+import pygame
+from .cache import cache_file, file_signature
+from .audio import get_ffmpeg_exe
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+# Peaks file: header + (peak, rms) uint8 pairs, one per bucket.
+# Built once per audio file, then the UI only ever indexes into it.
+PEAKS_PER_SEC = 50
+DECODE_RATE   = 11025   # mono PCM rate used for analysis (display only)
+_MAGIC  = b"FBCPK1"
+_HEADER = struct.Struct("<6sHIQQ")  # magic, buckets/sec, count, size, mtime_ns
+
+class Peaks:
+    """peak[i], rms[i] in 0..1 for bucket i = [i / rate, (i + 1) / rate)."""
+
+    def __init__(self, peak, rms, rate=PEAKS_PER_SEC):
+        self.peak = peak
+        self.rms = rms
+        self.rate = rate
+        self._strips = {}  # (w, h, color) -> Surface
+
+    def __len__(self):
+        return len(self.peak)
+
+    @property
+    def duration(self):
+        return len(self.peak) / float(self.rate)
+
+    def at(self, t):
+        """(peak, rms) at media time t; (0, 0) outside the file."""
+        i = int(t * self.rate)
+        if 0 <= i < len(self.peak):
+            return float(self.peak[i]), float(self.rms[i])
+        return 0.0, 0.0
+
+    def strip(self, w, h, color):
+        """Whole-file waveform squeezed into w x h, rendered once per size."""
+        key = (w, h, tuple(color))
+        surf = self._strips.get(key)
+        if surf is None:
+            surf = pygame.Surface((w, h), pygame.SRCALPHA)
+            n = len(self.peak)
+            if n and w > 0:
+                # max peak per pixel column
+                edges = np.minimum((np.arange(w) * n) // w, n - 1)
+                col = np.maximum.reduceat(self.peak, edges)
+                col = col / max(0.05, float(self.peak.max()))  # normalised: quiet logs stay readable
+                mid = h // 2
+                for x, v in enumerate((col * (h // 2 - 1)).astype(np.int32)):
+                    pygame.draw.line(surf, color, (x, mid - v), (x, mid + v))
+            self._strips[key] = surf
+        return surf
+
+    # --- file io ---
+    def save(self, path, sig):
+        data = np.empty(len(self.peak) * 2, dtype=np.uint8)
+        data[0::2] = np.round(self.peak * 255)
+        data[1::2] = np.round(self.rms * 255)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(_HEADER.pack(_MAGIC, self.rate, len(self.peak), sig[0], sig[1]))
+                f.write(data.tobytes())
+            os.replace(tmp, path)
+        except Exception:
+            try: os.remove(tmp)
+            except Exception: pass
+
+    @classmethod
+    def load(cls, path, sig):
+        """Cached peaks if the file exists and matches sig, else None."""
+        try:
+            with open(path, "rb") as f:
+                magic, rate, count, size, mtime = _HEADER.unpack(f.read(_HEADER.size))
+                if magic != _MAGIC or [size, mtime] != sig:
+                    return None
+                data = np.frombuffer(f.read(count * 2), dtype=np.uint8)
+            if len(data) != count * 2:
+                return None
+            data = data.astype(np.float32) / 255.0
+            return cls(data[0::2], data[1::2], rate)
+        except Exception:
+            return None
+
+def _decode_pcm(path):
+    """Mono int16 samples at DECODE_RATE: ffmpeg pipe, pygame Sound fallback."""
+    exe = get_ffmpeg_exe()
+    if exe:
+        cmd = [exe, "-hide_banner", "-loglevel", "error", "-nostdin", "-i", path,
+               "-vn", "-ac", "1", "-ar", str(DECODE_RATE), "-f", "s16le", "-"]
+        try:
+            out = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+                                 timeout=300).stdout
+            if out:
+                return np.frombuffer(out, dtype=np.int16), DECODE_RATE
+        except Exception:
+            pass
+    try:
+        arr = pygame.sndarray.array(pygame.mixer.Sound(path))
+        if arr.ndim > 1:
+            arr = arr.mean(axis=1)
+        return arr, pygame.mixer.get_init()[0]
+    except Exception:
+        return None, 0
+
+def compute_peaks(path, rate=PEAKS_PER_SEC):
+    samples, sr = _decode_pcm(path)
+    if samples is None or not len(samples) or not sr:
+        return None
+    spb = max(1, sr // rate)
+    n = -(-len(samples) // spb)
+    buf = np.zeros(n * spb, dtype=np.float32)
+    buf[:len(samples)] = samples
+    buf = buf.reshape(n, spb) / 32768.0
+    peak = np.clip(np.abs(buf).max(axis=1), 0.0, 1.0)
+    rms = np.clip(np.sqrt((buf * buf).mean(axis=1)), 0.0, 1.0)
+    return Peaks(peak, rms, rate)
+
+def load_or_build_peaks(path):
+    """Peaks for an audio file, from cache/peaks/ when still valid. Safe off the main thread."""
+    if np is None:
+        return None
+    sig = file_signature(path)
+    if sig is None:
+        return None
+    out = cache_file("peaks", path, ".peaks")
+    peaks = Peaks.load(out, sig)
+    if peaks is None:
+        peaks = compute_peaks(path)
+        if peaks is not None:
+            peaks.save(out, sig)
+    return peaks
@@ -0,0 +1,44 @@
+import os, multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+
+# Shared pool for background indexing (probes, thumbnails, catalogs).
+# Work here must never touch the display: no convert(), no drawing.
+_pool = None
+
+def background_pool():
+    global _pool
+    if _pool is None:
+        n = max(2, min(4, os.cpu_count() or 2))
+        _pool = ThreadPoolExecutor(max_workers=n, thread_name_prefix="fbc-bg")
+    return _pool
+
+def submit(fn, *args, **kwargs):
+    return background_pool().submit(fn, *args, **kwargs)
+
+# Separate processes for CPU-heavy pure functions (image decode + scale): no GIL
+# contention with the main loop. Spawned, not forked: the parent holds SDL state.
+_procs = None
+
+def process_pool():
+    global _procs
+    if _procs is None:
+        n = max(1, min(4, (os.cpu_count() or 2) - 1))
+        _procs = ProcessPoolExecutor(max_workers=n, mp_context=multiprocessing.get_context("spawn"))
+    return _procs
+
+def submit_process(fn, *args):
+    """fn must be a module-level function; falls back to the thread pool if processes fail."""
+    try:
+        return process_pool().submit(fn, *args)
+    except Exception:
+        return submit(fn, *args)
+
+def shutdown_workers():
+    """Drop queued work so quitting does not wait for a full indexing pass."""
+    global _pool, _procs
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+    if _procs is not None:
+        _procs.shutdown(wait=False, cancel_futures=True)
+        _procs = None